@@ -7,31 +7,34 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Шаблоны сообщений об ошибках
+_COMMAND_ERROR_TEMPLATE = (
+    "❌ Ошибка при выполнении команды /%s\n"
+    "Попробуйте позже или обратитесь к администратору."
+)
+_CALLBACK_ERROR_TEMPLATE = "Ошибка: %.50s..."
+
 def error_handler(bot, update, error):
     """Глобальный обработчик ошибок для telebot"""
     try:
-        logger.error(f"Ошибка в боте: {error}")
-    except:
+        logger.error("Ошибка в боте: %s", error)
+    except Exception:
         logger.error("Ошибка в обработчике ошибок")
 
 def send_error_message(bot, message, command: str):
     """Отправка сообщения об ошибке пользователю"""
     try:
-        bot.reply_to(
-            message,
-            f"❌ Ошибка при выполнении команды /{command}\n"
-            "Попробуйте позже или обратитесь к администратору."
-        )
-    except:
-        logger.error(f"Не удалось отправить сообщение об ошибке для команды /{command}")
+        bot.reply_to(message, _COMMAND_ERROR_TEMPLATE % command)
+    except Exception:
+        logger.error("Не удалось отправить сообщение об ошибке для команды /%s", command)
 
 def send_callback_error(bot, call, error):
     """Обработка ошибок в callback-запросах"""
     try:
         bot.answer_callback_query(
             call.id,
-            f"Ошибка: {str(error)[:50]}...",
+            _CALLBACK_ERROR_TEMPLATE % (error,),
             show_alert=True
         )
-    except:
-        logger.error(f"Не удалось отправить ошибку callback: {error}")
\ No newline at end of file
+    except Exception:
+        logger.error("Не удалось отправить ошибку callback: %s", error)
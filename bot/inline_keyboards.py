@@ -2,11 +2,13 @@
 Inline-клавиатуры для Telegram-бота Паникёр 3000.
 """
 
+from functools import lru_cache
+
 from telebot import types
 
 
-def get_main_menu_keyboard():
-    """Клавиатура главного меню"""
+def _build_main_menu_keyboard():
+    """Сборка клавиатуры главного меню"""
     keyboard = types.InlineKeyboardMarkup(row_width=2)
 
     buttons = [
@@ -27,8 +29,33 @@ def get_main_menu_keyboard():
     return keyboard
 
 
+def _build_today_keyboard():
+    """Сборка клавиатуры для сегодняшних сигналов"""
+    keyboard = types.InlineKeyboardMarkup(row_width=2)
+
+    buttons = [
+        types.InlineKeyboardButton("📊 КАРТА ПАНИКИ", callback_data="panic_map"),
+        types.InlineKeyboardButton("📈 СТАТИСТИКА", callback_data="stats"),
+    ]
+
+    keyboard.row(buttons[0], buttons[1])
+
+    return keyboard
+
+
+# Статичные клавиатуры не зависят от пользователя - собираем один раз при импорте
+_MAIN_MENU_KEYBOARD = _build_main_menu_keyboard()
+_TODAY_KEYBOARD = _build_today_keyboard()
+
+
+def get_main_menu_keyboard():
+    """Клавиатура главного меню"""
+    return _MAIN_MENU_KEYBOARD
+
+
+@lru_cache(maxsize=256)
 def get_overheat_keyboard(ticker):
-    """Клавиатура для индекса перегрева акции"""
+    """Клавиатура для индекса перегрева акции (кешируется по тикеру)"""
     keyboard = types.InlineKeyboardMarkup(row_width=2)
 
     buttons = [
@@ -47,15 +74,19 @@ def get_overheat_keyboard(ticker):
     return keyboard
 
 
-def get_today_keyboard():
-    """Клавиатура для сегодняшних сигналов"""
-    keyboard = types.InlineKeyboardMarkup(row_width=2)
+@lru_cache(maxsize=16)
+def get_ticker_choice_keyboard(tickers):
+    """Клавиатура выбора тикера для индекса перегрева (tickers - кортеж)"""
+    keyboard = types.InlineKeyboardMarkup(row_width=3)
 
-    buttons = [
-        types.InlineKeyboardButton("📊 КАРТА ПАНИКИ", callback_data="panic_map"),
-        types.InlineKeyboardButton("📈 СТАТИСТИКА", callback_data="stats"),
-    ]
+    keyboard.add(*(
+        types.InlineKeyboardButton(ticker, callback_data=f"overheat_{ticker}")
+        for ticker in tickers
+    ))
+
+    return keyboard
 
-    keyboard.row(buttons[0], buttons[1])
 
-    return keyboard
\ No newline at end of file
+def get_today_keyboard():
+    """Клавиатура для сегодняшних сигналов"""
+    return _TODAY_KEYBOARD
@@ -2,6 +2,7 @@
 Шаблоны сообщений для Telegram-бота Паникёр 3000.
 """
 
+from bisect import bisect_right
 from datetime import datetime
 from typing import List, Optional
 
@@ -13,13 +14,10 @@ except ImportError:
     PYDANTIC_AVAILABLE = False
     PanicSignal = None
 
-def get_main_menu_template(user_name, bot_status, exchange_status,
-                           last_check, alerts_enabled, last_panic_time,
-                           last_panic_ticker, signals_today):
-    """Шаблон главного меню (полный)"""
-    alert_status = "🟢 ВКЛ" if alerts_enabled else "🔴 ВЫКЛ"
-
-    return f"""
+# ============================================================================
+# ШАБЛОНЫ (собираются один раз при импорте модуля)
+# ============================================================================
+_MAIN_MENU_TEMPLATE = """
 🤖 ПАНИКЁР 3000 | v1.0
 Отряд контроля рыночной паники
 
@@ -53,22 +51,188 @@ def get_main_menu_template(user_name, bot_status, exchange_status,
 📅 Сигналов сегодня: {signals_today}
 """
 
+_HELP_TEMPLATE = """
+📚 СПРАВКА ПО КОМАНДАМ ПАНИКЁР 3000
+
+━━━━━━━━━━━━━━━━━━━━━━━━━
+📋 ОСНОВНЫЕ КОМАНДЫ:
+
+/start - Главное меню
+/help - Эта справка
+/status - Статус системы
+
+📊 АНАЛИТИКА:
+
+/overheat [ТИКЕР] - Индекс перегрева акции
+/panicmap - Карта паники за сегодня (ASCII)
+/today - Все сигналы за сегодня
+/stats - Статистика за неделю
+/extreme - Самые сильные сигналы
+
+⚙️ НАСТРОЙКИ:
+
+/alerts on - Включить уведомления
+/alerts off - Выключить уведомления
+/settings - Настройки детектора
+
+🔄 УПРАВЛЕНИЕ:
+
+/startscan - Возобновить сканирование
+/ignore [ТИКЕР] [ЧАСЫ] - Игнорировать тикер
+
+━━━━━━━━━━━━━━━━━━━━━━━━━
+📱 ИНТЕРАКТИВНЫЕ КНОПКИ:
+
+После каждого сигнала доступны кнопки:
+[📊 ГРАФИК АКЦИИ] - Открыть график
+[📈 СРАВНИТЬ С IMOEX] - Сравнить с индексом
+[📋 ИСТОРИЯ СИГНАЛОВ] - История сигналов
+[🤔 ОБЪЯСНИТЬ СИГНАЛ] - Подробное объяснение
+[🚫 ИГНОРИРОВАТЬ 2 ЧАСА] - Временно игнорировать
+
+━━━━━━━━━━━━━━━━━━━━━━━━━
+ℹ️ ПРИМЕЧАНИЯ:
+
+• Бот работает только в часы работы биржи (10:00-18:30 МСК)
+• Сигналы приходят только при обнаружении аномалий
+• Настройки можно изменить в веб-дашборде
+• Для экстренной остановки: /stopscan
+
+💬 Поддержка: @panicker3000_support
+"""
+
+_TODAY_TEMPLATE = """
+📅 СИГНАЛЫ ЗА СЕГОДНЯ ({date}):
+
+{signal_lines}
+
+━━━━━━━━━━━━━━━━━━━━━━━━━
+ИТОГО: {total_count} сигналов
+🔴 Сильных: {strong_count}
+🟡 Умеренных: {moderate_count}
+⚪ Срочных: {urgent_count}
+"""
+_TODAY_ROW = "{time} {level} {ticker} - RSI={rsi}, Объём={volume}×"
+# Уровень сигнала -> индекс счётчика (0 - сильные, 1 - умеренные, 2 - срочные).
+# Словари приходят с текстовыми уровнями, PanicSignal - со значениями FinalLevel.
+_LEVEL_TO_BUCKET = {
+    "🔴 СИЛЬНЫЙ": 0, "red": 0,
+    "🟡 ХОРОШИЙ": 1, "yellow": 1,
+    "⚪ СРОЧНЫЙ": 2, "white": 2,
+}
+
+_STATS_TEMPLATE = """
+📊 СТАТИСТИКА ЗА ПОСЛЕДНИЕ 7 ДНЕЙ:
+
+Всего сигналов: {total_signals}
+🔴 Сильных: {strong_signals}
+🟡 Умеренных: {moderate_signals}
+⚪ Срочных: {urgent_signals}
+
+🏆 САМАЯ АКТИВНАЯ: {most_active_ticker} ({most_active_count})
+😌 САМЫЙ СПОКОЙНЫЙ: {most_calm_ticker} ({most_calm_count})
+
+📊 ОБЩАЯ НАПРЯЖЁННОСТЬ: {market_tension}
+
+(по шкале от 🟢 спокойно до 🔴 паника)
+"""
+
+_EXTREME_TEMPLATE = """
+📊 САМЫЕ СИЛЬНЫЕ СИГНАЛЫ СЕГОДНЯ (ТОП-{top_count})
+
+{signal_lines}
+
+━━━━━━━━━━━━━━━━━━━━━━━━━
+📋 Все сигналы: /today
+📈 Статистика: /stats
+"""
+_EXTREME_ROW = "{medal} {time} {level} {ticker}\n   RSI: {rsi} | Объём: {volume}×"
+
+_PANIC_MAP_HOURS = ("10", "12", "14", "16", "18")
+_PANIC_MAP_HEADER = "    " + "  ".join(_PANIC_MAP_HOURS)
+_PANIC_MAP_LEGEND = (
+    "",
+    "⚪ = нет сигналов | 🟡 = хорошо | 🔴 = сильно",
+    "Срочные сигналы не показываются на карте",
+)
+
+_STATUS_TEMPLATE = """
+📡 СТАТУС СИСТЕМЫ ПАНИКЁР 3000
+
+━━━━━━━━━━━━━━━━━━━━━━━━━
+🤖 БОТ: {bot_status}
+🏛️ БИРЖА: {exchange_status}
+🕐 ВРЕМЯ: {time} МСК
+📅 ДАТА: {date}
+
+📊 СКАНИРОВАНИЕ:
+• Активных тикеров: {active_tickers}
+• Последняя проверка: {last_scan}
+• Следующая проверка: {next_scan}
+
+💾 ПАМЯТЬ:
+• Использовано: {memory_used}
+• Сигналов в БД: {db_signals}
+
+🔧 СОСТОЯНИЕ СЕРВИСОВ:
+• gRPC сервер: {grpc_status}
+• Tinkoff API: {api_status}
+• База данных: {db_status}
+
+━━━━━━━━━━━━━━━━━━━━━━━━━
+ℹ️ Для обновления статуса используйте /start
+"""
+
+# Оформление автооповещений
+_FILTER_EMOJIS = {"time": "⏰", "volatility": "📊", "trend": "📈", "spread": "💰"}
+_FILTER_NAMES = {
+    "time": "Время (в активной зоне)",
+    "volatility": "Волатильность (ATR > порог)",
+    "trend": "Тренд (торгуется по тренду)",
+    "spread": "Ликвидность (спред < 0.1%)"
+}
+_LEVEL_META = {
+    "🔴 СИЛЬНЫЙ": ("🚨", "КРАСНЫЙ УРОВЕНЬ"),
+    "🟡 ХОРОШИЙ": ("⚠️", "ЖЁЛТЫЙ УРОВЕНЬ"),
+}
+_DEFAULT_LEVEL_META = ("ℹ️", "БЕЛЫЙ УРОВЕНЬ")
+_SYSTEM_UNAVAILABLE = "⚠️ Система временно недоступна"
+
+# Все 11 вариантов ASCII-шкалы индекса перегрева (0%, 10%, ..., 100%)
+_HEALTH_BARS = tuple("[" + "█" * i + "░" * (10 - i) + "]" for i in range(11))
+
+# Интерпретация индекса перегрева: границы диапазонов и тексты для них
+_HEALTH_THRESHOLDS = (30, 60, 80)
+_HEALTH_MESSAGES = (
+    "🟢 Акция в норме, RSI около 50, объём стандартный",
+    "🟡 Умеренное отклонение, требует наблюдения",
+    "🟠 Повышенный риск, возможен сигнал",
+    "🔴 Высокий риск, сильное отклонение от нормы",
+)
+
+
+def get_main_menu_template(user_name, bot_status, exchange_status,
+                           last_check, alerts_enabled, last_panic_time,
+                           last_panic_ticker, signals_today):
+    """Шаблон главного меню (полный)"""
+    return _MAIN_MENU_TEMPLATE.format(
+        bot_status=bot_status,
+        exchange_status=exchange_status,
+        last_check=last_check,
+        alert_status="🟢 ВКЛ" if alerts_enabled else "🔴 ВЫКЛ",
+        last_panic_time=last_panic_time,
+        last_panic_ticker=last_panic_ticker,
+        signals_today=signals_today
+    )
+
 
 def format_panic_signal_alert(signal: PanicSignal) -> str:
     """Форматирование сигнала паники с использованием PanicSignal модели"""
-    if not PYDANTIC_AVAILABLE or signal is None:
-        return "⚠️ Система временно недоступна"
+    if signal is None:
+        return _SYSTEM_UNAVAILABLE
 
     # Определяем эмодзи и уровни
-    if signal.final_level == "🔴 СИЛЬНЫЙ":
-        emoji = "🚨"
-        level_text = "КРАСНЫЙ УРОВЕНЬ"
-    elif signal.final_level == "🟡 ХОРОШИЙ":
-        emoji = "⚠️"
-        level_text = "ЖЁЛТЫЙ УРОВЕНЬ"
-    else:
-        emoji = "ℹ️"
-        level_text = "БЕЛЫЙ УРОВЕНЬ"
+    emoji, level_text = _LEVEL_META.get(signal.final_level, _DEFAULT_LEVEL_META)
 
     # Определяем тип паники
     panic_type = "ПАНИКА" if signal.signal_type == "panic" else "ЖАДНОСТЬ"
@@ -78,21 +242,11 @@ def format_panic_signal_alert(signal: PanicSignal) -> str:
     rsi_21 = signal.rsi_21 if signal.rsi_21 is not None else "N/A"
     rsi_periods = f"{signal.rsi_14} (7д={rsi_7}, 14д={signal.rsi_14}, 21д={rsi_21})"
 
-    # Форматируем фильтры - используем поля passed_filters и failed_filters
-    passed_filters = []
-    filter_emojis = {"time": "⏰", "volatility": "📊", "trend": "📈", "spread": "💰"}
-    filter_names = {
-        "time": "Время (в активной зоне)",
-        "volatility": "Волатильность (ATR > порог)",
-        "trend": "Тренд (торгуется по тренду)",
-        "spread": "Ликвидность (спред < 0.1%)"
-    }
-
-    # Проверяем пройденные фильтры
-    for filter_type in signal.passed_filters:
-        emoji = filter_emojis.get(filter_type, "✓")
-        name = filter_names.get(filter_type, filter_type)
-        passed_filters.append(f"{emoji} {name}")
+    # Форматируем пройденные фильтры
+    passed_filters = [
+        f"{_FILTER_EMOJIS.get(filter_type, '✓')} {_FILTER_NAMES.get(filter_type, filter_type)}"
+        for filter_type in signal.passed_filters
+    ]
 
     filters_text = "\n".join(passed_filters) if passed_filters else "✗ Нет пройденных фильтров"
 
@@ -101,7 +255,7 @@ def format_panic_signal_alert(signal: PanicSignal) -> str:
         health_bar = _get_health_bar(signal.risk_metric * 100)
         health_percent = int(signal.risk_metric * 100)
     else:
-        health_bar = "[░░░░░░░░░░]"
+        health_bar = _HEALTH_BARS[0]
         health_percent = 0
 
     return f"""
@@ -128,57 +282,15 @@ def format_panic_signal_alert(signal: PanicSignal) -> str:
 [🚫 ИГНОРИРОВАТЬ {signal.ticker} НА 2 ЧАСА]
 """
 
+if not PYDANTIC_AVAILABLE:
+    # Без Pydantic схем сигнал не сформировать - вариант выбирается один раз при импорте
+    def format_panic_signal_alert(signal) -> str:
+        """Заглушка форматирования сигнала при недоступных Pydantic схемах"""
+        return _SYSTEM_UNAVAILABLE
+
 def get_help_template():
     """Шаблон справки по командам"""
-    return """
-📚 СПРАВКА ПО КОМАНДАМ ПАНИКЁР 3000
-
-━━━━━━━━━━━━━━━━━━━━━━━━━
-📋 ОСНОВНЫЕ КОМАНДЫ:
-
-/start - Главное меню
-/help - Эта справка
-/status - Статус системы
-
-📊 АНАЛИТИКА:
-
-/overheat [ТИКЕР] - Индекс перегрева акции
-/panicmap - Карта паники за сегодня (ASCII)
-/today - Все сигналы за сегодня
-/stats - Статистика за неделю
-/extreme - Самые сильные сигналы
-
-⚙️ НАСТРОЙКИ:
-
-/alerts on - Включить уведомления
-/alerts off - Выключить уведомления
-/settings - Настройки детектора
-
-🔄 УПРАВЛЕНИЕ:
-
-/startscan - Возобновить сканирование
-/ignore [ТИКЕР] [ЧАСЫ] - Игнорировать тикер
-
-━━━━━━━━━━━━━━━━━━━━━━━━━
-📱 ИНТЕРАКТИВНЫЕ КНОПКИ:
-
-После каждого сигнала доступны кнопки:
-[📊 ГРАФИК АКЦИИ] - Открыть график
-[📈 СРАВНИТЬ С IMOEX] - Сравнить с индексом
-[📋 ИСТОРИЯ СИГНАЛОВ] - История сигналов
-[🤔 ОБЪЯСНИТЬ СИГНАЛ] - Подробное объяснение
-[🚫 ИГНОРИРОВАТЬ 2 ЧАСА] - Временно игнорировать
-
-━━━━━━━━━━━━━━━━━━━━━━━━━
-ℹ️ ПРИМЕЧАНИЯ:
-
-• Бот работает только в часы работы биржи (10:00-18:30 МСК)
-• Сигналы приходят только при обнаружении аномалий
-• Настройки можно изменить в веб-дашборде
-• Для экстренной остановки: /stopscan
-
-💬 Поддержка: @panicker3000_support
-"""
+    return _HELP_TEMPLATE
 
 
 def get_health_template(ticker, health_percentage, health_bar,
@@ -206,35 +318,32 @@ def get_health_template(ticker, health_percentage, health_bar,
 
 def _get_health_interpretation(percentage):
     """Вспомогательная функция для интерпретации индекса перегрева"""
-    if percentage < 30:
-        return "🟢 Акция в норме, RSI около 50, объём стандартный"
-    elif percentage < 60:
-        return "🟡 Умеренное отклонение, требует наблюдения"
-    elif percentage < 80:
-        return "🟠 Повышенный риск, возможен сигнал"
-    else:
-        return "🔴 Высокий риск, сильное отклонение от нормы"
+    return _HEALTH_MESSAGES[bisect_right(_HEALTH_THRESHOLDS, percentage)]
 
 
 def _get_health_bar(percentage: float) -> str:
     """Создание ASCII-шкалы индекса перегрева"""
     if not isinstance(percentage, (int, float)):
-        return "[░░░░░░░░░░]"
+        return _HEALTH_BARS[0]
 
     percentage = max(0, min(100, percentage))
-    filled = int(percentage / 10)
-    return "[" + "█" * filled + "░" * (10 - filled) + "]"
+    return _HEALTH_BARS[int(percentage) // 10]
 
 def get_today_template(today_signals):
     """Шаблон сегодняшних сигналов"""
     if not today_signals:
         return "📅 СЕГОДНЯШНИХ СИГНАЛОВ ПОКА НЕТ\n\nСледующая проверка в 10:00."
 
+    # Список однородный (либо PanicSignal, либо словари) - проверяем тип один раз
+    use_pydantic = PYDANTIC_AVAILABLE and isinstance(today_signals[0], PanicSignal)
+
     signal_lines = []
+    counts = [0, 0, 0]  # сильные, умеренные, срочные
+
+    # Один проход: строки сообщения и счётчики уровней
     for signal in today_signals:
-        # Поддержка как PanicSignal объектов, так и словарей
-        if PYDANTIC_AVAILABLE and isinstance(signal, PanicSignal):
-            time_str = signal.signal_time.strftime('%H:%M')
+        if use_pydantic:
+            time_str = signal.timestamp.strftime('%H:%M')
             ticker = signal.ticker
             level = signal.final_level
             rsi = signal.rsi_14
@@ -247,45 +356,39 @@ def get_today_template(today_signals):
             rsi = signal.get('rsi', 'N/A')
             volume = signal.get('volume_ratio', 'N/A')
 
-        signal_lines.append(f"{time_str} {level} {ticker} - RSI={rsi}, Объём={volume}×")
-
-    total_count = len(today_signals)
-    strong_count = sum(1 for s in today_signals if '🔴' in s.get('level', ''))
-    moderate_count = sum(1 for s in today_signals if '🟡' in s.get('level', ''))
-    urgent_count = sum(1 for s in today_signals if '⚪' in s.get('level', ''))
-
-    return f"""
-📅 СИГНАЛЫ ЗА СЕГОДНЯ ({datetime.now().strftime('%d.%m.%Y')}):
+        signal_lines.append(_TODAY_ROW.format(
+            time=time_str, level=level, ticker=ticker, rsi=rsi, volume=volume
+        ))
 
-{"\n".join(signal_lines)}
+        bucket = _LEVEL_TO_BUCKET.get(level)
+        if bucket is not None:
+            counts[bucket] += 1
 
-━━━━━━━━━━━━━━━━━━━━━━━━━
-ИТОГО: {total_count} сигналов
-🔴 Сильных: {strong_count}
-🟡 Умеренных: {moderate_count}
-⚪ Срочных: {urgent_count}
-"""
+    return _TODAY_TEMPLATE.format(
+        date=datetime.now().strftime('%d.%m.%Y'),
+        signal_lines="\n".join(signal_lines),
+        total_count=len(today_signals),
+        strong_count=counts[0],
+        moderate_count=counts[1],
+        urgent_count=counts[2]
+    )
 
 def get_stats_template(stats_data):
     """Шаблон статистики"""
     if not stats_data:
         return "📊 НЕТ ДАННЫХ ДЛЯ СТАТИСТИКИ\n\nСоберите данные за несколько дней."
 
-    return f"""
-📊 СТАТИСТИКА ЗА ПОСЛЕДНИЕ 7 ДНЕЙ:
-
-Всего сигналов: {stats_data.get('total_signals', 0)}
-🔴 Сильных: {stats_data.get('strong_signals', 0)}
-🟡 Умеренных: {stats_data.get('moderate_signals', 0)}
-⚪ Срочных: {stats_data.get('urgent_signals', 0)}
-
-🏆 САМАЯ АКТИВНАЯ: {stats_data.get('most_active_ticker', 'НЕТ')} ({stats_data.get('most_active_count', 0)})
-😌 САМЫЙ СПОКОЙНЫЙ: {stats_data.get('most_calm_ticker', 'НЕТ')} ({stats_data.get('most_calm_count', 0)})
-
-📊 ОБЩАЯ НАПРЯЖЁННОСТЬ: {stats_data.get('market_tension', 'НЕТ ДАННЫХ')}
-
-(по шкале от 🟢 спокойно до 🔴 паника)
-"""
+    return _STATS_TEMPLATE.format(
+        total_signals=stats_data.get('total_signals', 0),
+        strong_signals=stats_data.get('strong_signals', 0),
+        moderate_signals=stats_data.get('moderate_signals', 0),
+        urgent_signals=stats_data.get('urgent_signals', 0),
+        most_active_ticker=stats_data.get('most_active_ticker', 'НЕТ'),
+        most_active_count=stats_data.get('most_active_count', 0),
+        most_calm_ticker=stats_data.get('most_calm_ticker', 'НЕТ'),
+        most_calm_count=stats_data.get('most_calm_count', 0),
+        market_tension=stats_data.get('market_tension', 'НЕТ ДАННЫХ')
+    )
 
 
 def get_extreme_template(extreme_signals):
@@ -305,7 +408,7 @@ def get_extreme_template(extreme_signals):
             level = signal.final_level
             rsi = signal.rsi_14
             volume = f"{signal.volume_ratio:.1f}"
-            time_str = signal.signal_time.strftime('%H:%M')
+            time_str = signal.timestamp.strftime('%H:%M')
         else:
             # Обратная совместимость со словарями
             ticker = signal.get('ticker', 'N/A')
@@ -314,18 +417,14 @@ def get_extreme_template(extreme_signals):
             volume = signal.get('volume_ratio', 'N/A')
             time_str = signal.get('time', 'N/A')
 
-        signal_lines.append(f"{medal} {time_str} {level} {ticker}")
-        signal_lines.append(f"   RSI: {rsi} | Объём: {volume}×")
-
-    return f"""
-📊 САМЫЕ СИЛЬНЫЕ СИГНАЛЫ СЕГОДНЯ (ТОП-{min(3, len(extreme_signals))})
-
-{"\n".join(signal_lines)}
+        signal_lines.append(_EXTREME_ROW.format(
+            medal=medal, time=time_str, level=level, ticker=ticker, rsi=rsi, volume=volume
+        ))
 
-━━━━━━━━━━━━━━━━━━━━━━━━━
-📋 Все сигналы: /today
-📈 Статистика: /stats
-"""
+    return _EXTREME_TEMPLATE.format(
+        top_count=min(3, len(extreme_signals)),
+        signal_lines="\n".join(signal_lines)
+    )
 
 
 def get_panic_map_template(panic_map_data):
@@ -339,49 +438,30 @@ def get_panic_map_template(panic_map_data):
     map_lines = [f"📊 КАРТА ПАНИКИ ЗА {date_str}", ""]
 
     # Заголовок с часами
-    hours = ["10", "12", "14", "16", "18"]
-    map_lines.append("    " + "  ".join(hours))
+    map_lines.append(_PANIC_MAP_HEADER)
 
     # Данные по тикерам
     for ticker, signals in panic_map_data.items():
-        hour_signals = []
-        for hour in ["10", "12", "14", "16", "18"]:
-            signal = signals.get(hour, '⚪')
-            hour_signals.append(signal)
-
-        map_lines.append(f"{ticker:4} " + "  ".join(hour_signals))
+        map_lines.append(f"{ticker:4} " + "  ".join(signals.get(hour, '⚪') for hour in _PANIC_MAP_HOURS))
 
-    map_lines.append("")
-    map_lines.append("⚪ = нет сигналов | 🟡 = хорошо | 🔴 = сильно")
-    map_lines.append("Срочные сигналы не показываются на карте")
+    map_lines.extend(_PANIC_MAP_LEGEND)
 
     return "\n".join(map_lines)
 
 def get_status_template(status_data):
     """Шаблон статуса системы"""
-    return f"""
-📡 СТАТУС СИСТЕМЫ ПАНИКЁР 3000
-
-━━━━━━━━━━━━━━━━━━━━━━━━━
-🤖 БОТ: {status_data.get('bot_status', 'НЕТ ДАННЫХ')}
-🏛️ БИРЖА: {status_data.get('exchange_status', 'НЕТ ДАННЫХ')}
-🕐 ВРЕМЯ: {datetime.now().strftime('%H:%M')} МСК
-📅 ДАТА: {datetime.now().strftime('%d.%m.%Y')}
-
-📊 СКАНИРОВАНИЕ:
-• Активных тикеров: {status_data.get('active_tickers', 0)}
-• Последняя проверка: {status_data.get('last_scan', 'НЕТ')}
-• Следующая проверка: {status_data.get('next_scan', 'НЕТ')}
-
-💾 ПАМЯТЬ:
-• Использовано: {status_data.get('memory_used', 'НЕТ')}
-• Сигналов в БД: {status_data.get('db_signals', 0)}
-
-🔧 СОСТОЯНИЕ СЕРВИСОВ:
-• gRPC сервер: {status_data.get('grpc_status', 'НЕТ')}
-• Tinkoff API: {status_data.get('api_status', 'НЕТ')}
-• База данных: {status_data.get('db_status', 'НЕТ')}
-
-━━━━━━━━━━━━━━━━━━━━━━━━━
-ℹ️ Для обновления статуса используйте /start
-"""
\ No newline at end of file
+    now = datetime.now()
+    return _STATUS_TEMPLATE.format(
+        bot_status=status_data.get('bot_status', 'НЕТ ДАННЫХ'),
+        exchange_status=status_data.get('exchange_status', 'НЕТ ДАННЫХ'),
+        time=now.strftime('%H:%M'),
+        date=now.strftime('%d.%m.%Y'),
+        active_tickers=status_data.get('active_tickers', 0),
+        last_scan=status_data.get('last_scan', 'НЕТ'),
+        next_scan=status_data.get('next_scan', 'НЕТ'),
+        memory_used=status_data.get('memory_used', 'НЕТ'),
+        db_signals=status_data.get('db_signals', 0),
+        grpc_status=status_data.get('grpc_status', 'НЕТ'),
+        api_status=status_data.get('api_status', 'НЕТ'),
+        db_status=status_data.get('db_status', 'НЕТ')
+    )
@@ -6,47 +6,57 @@
 # ============================================================================
 # ИМПОРТЫ
 # ============================================================================
+import heapq
 import logging
 import os
+import re
 import sys
+import threading
+from bisect import bisect_right
+from collections import Counter, OrderedDict, deque, namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import datetime, time, timedelta
-from typing import Dict, Any, List, Optional, Tuple
+from enum import IntEnum
+from functools import lru_cache, partial
+from operator import attrgetter, itemgetter
+from time import monotonic
+from typing import Dict, Any, Callable, List, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
 import telebot
 from telebot import types
 import codecs
 
-# Исправляем кодировку для Windows
+# Исправляем кодировку для Windows (один раз, даже при повторном импорте модуля)
 if sys.platform == "win32":
-    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
-    sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+    for _stream_name in ("stdout", "stderr"):
+        _stream = getattr(sys, _stream_name)
+        if getattr(_stream, "_panicker_wrapped", False):
+            continue
+        if (getattr(_stream, "encoding", None) or "").lower() in ("utf-8", "utf8"):
+            continue
+        _wrapped = codecs.getwriter('utf-8')(_stream.buffer, 'strict')
+        _wrapped._panicker_wrapped = True
+        setattr(sys, _stream_name, _wrapped)
 
 # Добавляем корень проекта в путь
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Теперь все импорты будут работать
-from utils.schemas import PanicSignal, TickerData, validate_panic_signal
+from utils.schemas import PanicSignal, TickerData
 from bot.message_templates import format_panic_signal_alert
 from data.market_calendar import get_market_calendar
-from core.config_loader import ConfigLoader
+from core.config_loader import get_config
 from data.data_cache import DataCache
+from data.alert_settings import AlertSettingsStore
 
-# gRPC клиент
+# Numba (опционально): ядро свёртки карты паники компилируется в машинный код
 try:
-    # Абсолютный импорт из grpc папки
-    from grpc_service.grpc_client import get_grpc_client
-    GRPC_AVAILABLE = True
-except ImportError as e:
-    print(f"⚠️  Ошибка импорта gRPC: {e}")
-    # Попробуем через sys.path
-    import sys
-    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    try:
-        from grpc_service.grpc_client import get_grpc_client
-        GRPC_AVAILABLE = True
-    except ImportError as e2:
-        print(f"❌ Не удалось импортировать gRPC: {e2}")
-        get_grpc_client = None
-        GRPC_AVAILABLE = False
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 # Локальные импорты
 import bot.message_templates as message_templates
 import bot.inline_keyboards as inline_keyboards
@@ -62,11 +72,25 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# gRPC клиент (импортируем после настройки логгирования, чтобы предупреждение попало в лог)
+try:
+    from grpc_service.grpc_client import get_grpc_client
+    from grpc_service.grpc_client import PYDANTIC_AVAILABLE as GRPC_VALIDATES_SIGNALS
+    GRPC_AVAILABLE = True
+except ImportError as e:
+    logger.warning("⚠️  gRPC недоступен: %s", e)
+    get_grpc_client = None
+    GRPC_VALIDATES_SIGNALS = False
+    GRPC_AVAILABLE = False
+
+# Строгий режим (отладка): повторно валидировать словари, отклонённые клиентом gRPC
+STRICT_SIGNAL_VALIDATION = os.getenv('PANICKER_STRICT_VALIDATION') == '1'
+
 
 # ============================================================================
 # КОНСТАНТЫ
 # ============================================================================
-class BotStates:
+class BotStates(IntEnum):
     """Состояния бота для ConversationHandler"""
     MAIN_MENU = 0
     HEALTH_CHECK = 1
@@ -74,6 +98,717 @@ class BotStates:
     SETTINGS = 3
 
 
+# Команды бота: команда -> (метод-обработчик, принимает ли аргументы)
+BOT_COMMANDS = {
+    'overheat': ('command_overheat', True),
+    'start': ('command_start', False),
+    'help': ('command_help', False),
+    'today': ('command_today', False),
+    'stats': ('command_stats', False),
+    'extreme': ('command_extreme', False),
+    'panicmap': ('command_panicmap', False),
+    'alerts': ('command_alerts', True),
+    'startscan': ('command_startscan', False),
+    'status': ('command_status', False),
+    'report': ('command_report', False),
+    'settings': ('command_settings', True),
+}
+
+# Кнопки главного меню: callback_data -> метод-обработчик(call)
+CALLBACK_MENU_HANDLERS = {
+    'overheat_menu': '_handle_overheat_menu',
+    'panic_map': '_handle_panic_map_callback',
+    'today': '_handle_today_callback',
+    'stats': '_handle_stats_callback',
+}
+
+# Кнопки анализа акции: префикс до "_" -> метод-обработчик(call, ticker)
+CALLBACK_TICKER_HANDLERS = {
+    'graph': '_handle_graph_callback',
+    'compare': '_handle_compare_callback',
+    'history': '_handle_history_callback',
+    'explain': '_handle_explain_callback',
+    'ignore': '_handle_ignore_callback',
+    'overheat': '_handle_overheat_callback',
+}
+
+# Лимит Telegram на длину одного сообщения
+TELEGRAM_MAX_MESSAGE_LENGTH = 4096
+
+# Разделители разделов в сообщениях (одна строка на весь модуль)
+_SEPARATOR = "━" * 25 + "\n"
+_REPORT_SEPARATOR = "━" * 39 + "\n"
+
+# Шкала индекса перегрева: 5 сегментов, индекс = число заполненных
+_OVERHEAT_BARS = tuple(f"[{'🟩' * i}{'⬜' * (5 - i)}]" for i in range(6))
+
+# Легенда шкалы и навигация в конце ответа /overheat
+_OVERHEAT_LEGEND = _SEPARATOR + (
+    "📈 **ЛОГИКА ШКАЛЫ:**\n"
+    "• [⬜⬜⬜⬜⬜] 0% = Холодно, сигналов нет\n"
+    "• [🟩🟩⬜⬜⬜] 40% = Умеренная активность\n"
+    "• [🟩🟩🟩🟩🟩] 100% = ЖАРКО! Сильный сигнал!\n\n"
+    "📋 Все сигналы: /today\n"
+    "🔥 Самые сильные: /extreme"
+)
+
+# Приветствие /start: меняются только статус биржи и следующее событие
+_WELCOME_TEMPLATE = (
+    "🤖 **ПАНИКЁР 3000** | v1.0\n"
+    "Отряд контроля рыночной паники\n"
+    + _SEPARATOR +
+    "Статус: 🟢 АКТИВЕН\n"
+    "Биржа: {exchange_status} ({reason})\n"
+    "Следующее событие: {next_event}\n"
+    "Последняя проверка: только что\n\n"
+    "📋 **БЫСТРЫЙ ДОСТУП:**\n"
+    "[📊 КАРТА ПАНИКИ] - тепловая карта\n"
+    "[📊 ИНДЕКС ПЕРЕГРЕВА] - HP-бар акции\n"
+    "[📈 СЕГОДНЯШНИЕ ИСТЕРИКИ] - список\n"
+    "[📊 СТАТИСТИКА ЗА НЕДЕЛЮ] - точность\n"
+    "[⚙️ НАСТРОЙКИ ПАНИКИ] - пороги\n"
+    "[❓ КАК РАБОТАЕТ] - инструкция\n\n"
+    "🔧 **СЛУЖЕБНЫЕ КОМАНДЫ:**\n"
+    "/overheat [ТИКЕР] -- индекс перегрева\n"
+    "/panicmap - карта активности\n"
+    "/today - все сигналы сегодня\n"
+    "/stats - статистика\n"
+    "/extreme - самые сильные сигналы\n"
+    "/alerts on/off - вкл/выкл уведомления\n"
+    "/startscan - возобновить сканирование\n"
+    + _SEPARATOR +
+    "🔔 Автооповещения: ВКЛ\n"
+    "📅 Сигналов сегодня: проверьте /today"
+)
+
+# Справка /help (постоянный текст, собирается при компиляции)
+_HELP_TEXT = (
+    "📖 **СПРАВКА ПО КОМАНДАМ**\n\n"
+    "• /overheat [тикер] - индекс перегрева акции\n"
+    "• /today - все сигналы за сегодня\n"
+    "• /extreme - самые сильные сигналы\n"
+    "• /startscan - запустить сканирование\n"
+    "• /stats - статистика за неделю\n"
+    "• /panicmap - карта паники\n"
+    "• /alerts on/off - управление уведомлениями\n"
+    "• /status - статус системы\n"
+    "• /settings verbose on/off - подробный /overheat в этом чате\n"
+    "• /help - эта справка"
+)
+
+# Спецсимволы legacy Markdown (parse_mode='Markdown'): только их и экранируем,
+# экранирование MarkdownV2 (., -, ( и т.д.) здесь видно как обратные слэши
+_LEGACY_MARKDOWN_SPECIAL_RE = re.compile(r'([_*`\[])')
+
+
+def _escape_legacy_markdown(text: str) -> str:
+    """Экранирование произвольного текста для parse_mode='Markdown'"""
+    return _LEGACY_MARKDOWN_SPECIAL_RE.sub(r'\\\1', text)
+
+
+# /startscan при закрытой бирже: меняется только причина
+_SCAN_CLOSED_TEMPLATE = (
+    "⏰ **СКАНИРОВАНИЕ НЕВОЗМОЖНО**\n\n"
+    "{scan_reason}\n\n"
+    "Сканирование запускается только в рабочие часы биржи.\n"
+    "Текущий статус биржи: /status\n"
+    "Биржа работает: пн-пт, 10:00-18:30 МСК"
+)
+
+# Ответы /alerts (постоянные тексты; статус - по одному на каждое состояние)
+_ALERTS_STATUS_TEMPLATE = (
+    "🔔 **СТАТУС УВЕДОМЛЕНИЙ**\n\n"
+    "Текущий статус: {status}\n\n"
+    + _SEPARATOR +
+    "• `/alerts on` - включить уведомления\n"
+    "• `/alerts off` - выключить уведомления\n"
+    "• `/status` - общий статус системы"
+)
+_ALERTS_STATUS_TEXTS = {
+    True: _ALERTS_STATUS_TEMPLATE.format(status="🟢 **ВКЛЮЧЕНЫ**"),
+    False: _ALERTS_STATUS_TEMPLATE.format(status="🔴 **ВЫКЛЮЧЕНЫ**"),
+}
+_ALERTS_ENABLED_TEXT = (
+    "✅ **УВЕДОМЛЕНИЯ ВКЛЮЧЕНЫ**\n\n"
+    "Теперь вы будете получать автоматические оповещения "
+    "об обнаруженных сигналах паники/жадности.\n\n"
+    "ℹ️ *Для отключения используйте* `/alerts off`"
+)
+_ALERTS_DISABLED_TEXT = (
+    "🔕 **УВЕДОМЛЕНИЯ ВЫКЛЮЧЕНЫ**\n\n"
+    "Автоматические оповещения отключены.\n"
+    "Вы больше не будете получать уведомления об обнаруженных сигналах.\n\n"
+    "ℹ️ *Для включения используйте* `/alerts on`"
+)
+_ALERTS_USAGE_TEXT = (
+    "❌ **НЕВЕРНАЯ КОМАНДА**\n\n"
+    "Используйте:\n"
+    "• `/alerts on` - включить уведомления\n"
+    "• `/alerts off` - выключить уведомления\n"
+    "• `/alerts` - показать статус"
+)
+_ALERTS_ERROR_TEXT = (
+    "❌ **ОШИБКА УПРАВЛЕНИЯ УВЕДОМЛЕНИЯМИ**\n\n"
+    "Не удалось выполнить команду. Попробуйте позже."
+)
+
+# /panicmap без сигналов и постоянный хвост карты (легенда и навигация)
+_PANICMAP_EMPTY_TEXT = (
+    "🗺️ **КАРТА ПАНИКИ**\n\n"
+    "Сегодня сигналов не обнаружено.\n\n"
+    + _SEPARATOR +
+    "📊 Статистика: /stats\n"
+    "📅 Сегодняшние: /today"
+)
+_PANICMAP_LEGEND = (
+    "\n"
+    "`⚪ = спокойно  |  🟡 = хорошо  |  🔴 = сильно`\n\n"
+    + _SEPARATOR +
+    "📊 Статистика: /stats\n"
+    "📅 Сегодняшние сигналы: /today\n"
+    "🔥 Самые сильные: /extreme"
+)
+
+# Запасной шаблон автооповещения (если format_panic_signal_alert не сработал)
+_ALERT_FALLBACK_TEMPLATE = (
+    "{level_emoji} **{level} В {ticker} ОБНАРУЖЕНА {signal_type}!**\n\n"
+    "📊 **ПАРАМЕТРЫ {signal_type}:**\n"
+    "• RSI: {rsi:.1f}\n"
+    "• Объём: {volume_ratio:.1f}× от нормы\n"
+    "• Время: {timestamp:%H:%M:%S}\n"
+)
+
+# Ключ доли объёма кластера
+_CLUSTER_SHARE_ITEM = itemgetter('volume_percentage')
+
+# Поля кластера (цена, доля, роль) одним вызовом
+_CLUSTER_FIELDS = itemgetter('price_level', 'volume_percentage', 'role')
+
+# Ключ сортировки топа сигналов по времени обнаружения
+_SIGNAL_DETECTED_AT = itemgetter('detected_at')
+
+# Карта паники: часы столбцов, час во времени сигнала и эмодзи по приоритету
+HEATMAP_HOURS = (10, 12, 14, 16, 18)
+HEATMAP_HOUR_STEP = 2  # часы идут равномерной сеткой
+_HEATMAP_HOUR_PATTERN = r'(?:^|[T ])(\d{2}):\d{2}'
+_HEATMAP_PRIORITY_EMOJI = ('⚪', '⚪', '🟡', '🟠', '🔴')
+
+# Иконки ролей кластеров объёма
+_ROLE_ICONS = {'support': "🟢", 'resistance': "🔴"}
+_DEFAULT_ROLE_ICON = "⚪"
+
+# Тикер MOEX из аргумента команды: иначе пользовательский ввод со знаками
+# Markdown ("_", "*") ломает разбор ответа на стороне Telegram
+_TICKER_RE = re.compile('[A-Z0-9]{1,12}')
+
+# Маркеры уровней сигнала -> группа (одно регулярное выражение вместо цепочки `in`)
+_LEVEL_MARKER_RE = re.compile('🔴|STRONG|🟡|MODERATE|⚪|URGENT')
+_LEVEL_MARKER_GROUPS = {
+    '🔴': 'strong', 'STRONG': 'strong',
+    '🟡': 'moderate', 'MODERATE': 'moderate',
+    '⚪': 'urgent', 'URGENT': 'urgent',
+}
+
+# Группа уровня -> (эмодзи, подпись) в истории сигналов
+_HISTORY_LEVEL_LABELS = {
+    'strong': ('🔴', 'Сильная'),
+    'moderate': ('🟡', 'Умеренная'),
+    'urgent': ('⚪', 'Срочная'),
+    None: ('⚪', 'Сигнал'),
+}
+
+# Тип сигнала в истории: маркер (в любом регистре) -> подпись
+_SIGNAL_TYPE_MARKER_RE = re.compile('ПАНИКА|PANIC|ЖАДНОСТЬ|GREED', re.IGNORECASE)
+_HISTORY_TYPE_LABELS = {
+    'ПАНИКА': 'паника', 'PANIC': 'паника',
+    'ЖАДНОСТЬ': 'жадность', 'GREED': 'жадность',
+}
+
+# Дни недели для ежедневного отчёта (индекс - datetime.weekday())
+_WEEKDAY_RUS = ('Понедельник', 'Вторник', 'Среда', 'Четверг', 'Пятница', 'Суббота', 'Воскресенье')
+
+# Пороги риск-метрики: [0, 40) низкий, [40, 70) средний, [70, 100] высокий
+_RISK_THRESHOLDS = (40, 70)
+_RISK_ICONS = ('🟢', '🟡', '🔴')
+_RISK_LABELS = ('НИЗКИЙ', 'СРЕДНИЙ', 'ВЫСОКИЙ')
+
+# Уровни, которые отдаёт сервер, -> группа для статистики
+# (неизвестные уровни разбираются по маркерам выше)
+LEVEL_BUCKETS = {
+    '🔴 СИЛЬНЫЙ': 'strong',
+    '🟡 ХОРОШИЙ': 'moderate',
+    '⚪ СРОЧНЫЙ': 'urgent',
+    '❌ ИГНОРИРОВАТЬ': None,
+    'НЕИЗВЕСТНО': None,
+    'red': 'strong',
+    'yellow': 'moderate',
+    'white': 'urgent',
+    'ignore': None,
+}
+
+# Лимиты Bot API на исходящие сообщения
+TELEGRAM_MAX_MESSAGES_PER_SECOND = 30  # всего по всем чатам
+TELEGRAM_CHAT_MESSAGE_INTERVAL = 1.0  # секунд между сообщениями в один чат
+OUTBOX_MAX_SIZE = 1000
+
+# Приоритеты исходящих сообщений (при переполнении первыми вытесняются LOW)
+PRIORITY_LOW = 0  # рассылки и автооповещения
+PRIORITY_HIGH = 1  # ответы на команды пользователя
+
+# Кеш ответов gRPC по тикеру (рыночные данные меняются поминутно)
+GRPC_CACHE_TTL = 20  # секунд
+GRPC_CACHE_MAX_SIZE = 256
+
+# Ожидание ответа на запрос, объединённый RequestBatcher клиента
+GRPC_REQUEST_TIMEOUT = 15  # секунд
+
+# Кнопки анализа акции ждут ответ gRPC не дольше этого: медленный сервер
+# не должен надолго занимать поток обработки апдейтов
+BUTTON_GRPC_TIMEOUT = 5  # секунд
+_BUTTON_TIMEOUT_TEXT = "⏳ Сервер не ответил вовремя. Попробуйте ещё раз через минуту."
+
+# Общий кеш сигналов за сегодня и статистики для /today, /extreme, /panicmap, /report
+# (сканирование идёт раз в минуту, несколько секунд устаревания незаметны)
+SIGNALS_CACHE_TTL = 3  # секунд
+SIGNALS_CACHE_MAX_SIZE = 64
+TODAY_SIGNALS_LIMIT = 50  # команды берут нужное число первых сигналов
+
+# Кеш часовых свечей для кнопок графика и сравнения: ряд IMOEX одинаков
+# для всех пользователей, новая часовая свеча появляется раз в час
+CANDLES_CACHE_TTL = 60  # секунд
+CANDLES_CACHE_MAX_SIZE = 64
+
+# Автооповещения /startscan и подтверждения нажатий кнопок отправляются
+# фоновыми потоками, чтобы обработчик не ждал каждого запроса к Telegram API
+TELEGRAM_POOL_WORKERS = 4
+
+# Статус биржи меняется на границах минут: праздники и расписание
+# MarketCalendar пересчитываются не чаще раза в MARKET_STATUS_CACHE_TTL
+MARKET_STATUS_CACHE_TTL = 30  # секунд
+
+# Long polling: Telegram держит getUpdates открытым до 50 секунд;
+# таймаут HTTP-запроса должен быть больше, чтобы не обрывать ожидание
+LONG_POLLING_TIMEOUT = 50
+POLLING_REQUEST_TIMEOUT = 60
+ALLOWED_UPDATES = ["message", "callback_query"]
+
+# Окно объединения ответов на кнопки в один запрос к Telegram (секунды)
+REPLY_BATCH_FLUSH_INTERVAL = 0.3
+
+# Размер пула потоков telebot для обработки апдейтов: медленный gRPC-запрос
+# по одному тикеру не должен задерживать ответы другим пользователям
+BOT_WORKER_THREADS = 16
+
+
+# ============================================================================
+# ЯДРО КАРТЫ ПАНИКИ
+# ============================================================================
+def _reduce_heatmap_loop(ticker_ids, bucket_ids, priorities, n_tickers, n_hours):
+    """Максимальный приоритет сигнала в каждой клетке (тикер × час)"""
+    out = np.zeros((n_tickers, n_hours), dtype=np.int8)
+    for i in range(ticker_ids.shape[0]):
+        if priorities[i] > out[ticker_ids[i], bucket_ids[i]]:
+            out[ticker_ids[i], bucket_ids[i]] = priorities[i]
+    return out
+
+
+if NUMBA_AVAILABLE:
+    _reduce_heatmap = njit(cache=True, boundscheck=False)(_reduce_heatmap_loop)
+else:
+    def _reduce_heatmap(ticker_ids, bucket_ids, priorities, n_tickers, n_hours):
+        """Та же свёртка без Numba: небуферизованный максимум NumPy"""
+        out = np.zeros((n_tickers, n_hours), dtype=np.int8)
+        np.maximum.at(out, (ticker_ids, bucket_ids), priorities)
+        return out
+
+
+# ============================================================================
+# ВРЕМЯ СИГНАЛА
+# ============================================================================
+def _signal_time(detected_at: Union[str, datetime, None]) -> str:
+    """
+    Время сигнала 'HH:MM' для списков.
+
+    gRPC отдаёт ISO 8601 ('2024-12-18T14:30:00', иногда с 'Z') или
+    'YYYY-MM-DD HH:MM:SS' - оба разбирает fromisoformat без проверок формата.
+    Уже короткое 'HH:MM' не является датой и берётся как есть.
+    Готовый datetime (timestamp модели PanicSignal) не разбирается вовсе.
+    """
+    if not detected_at:
+        return '--:--'
+    if isinstance(detected_at, datetime):
+        return f"{detected_at.hour:02d}:{detected_at.minute:02d}"
+    try:
+        moment = datetime.fromisoformat(detected_at[:-1] if detected_at[-1] == 'Z' else detected_at)
+    except ValueError:
+        return detected_at[:5]
+    return f"{moment.hour:02d}:{moment.minute:02d}"
+
+
+def _close_prices(candles: List[Dict[str, Any]]) -> np.ndarray:
+    """Цены закрытия свечей клиента gRPC одним массивом (минимум/максимум - в NumPy)"""
+    return np.fromiter((candle['close'] for candle in candles), dtype=np.float64, count=len(candles))
+
+
+# ============================================================================
+# КЛАСС MessageBatcher - ОБЪЕДИНЕНИЕ ИСХОДЯЩИХ СООБЩЕНИЙ
+# ============================================================================
+class MessageBatcher:
+    """
+    Объединяет всплески исходящих сообщений в один чат.
+
+    Сообщения, поставленные в очередь в течение flush_interval, склеиваются
+    через разделитель и отправляются одним запросом (с разбиением по лимиту
+    Telegram). Одиночное короткое сообщение отправляется сразу.
+    Сообщение с клавиатурой не склеивается: кнопки относятся к нему,
+    поэтому оно уходит отдельно, в своём порядке внутри пачки.
+    """
+
+    SEPARATOR = "\n\n━━━\n\n"
+
+    def __init__(self, send_func, flush_interval: float = 0.5,
+                 max_buffer_size: int = TELEGRAM_MAX_MESSAGE_LENGTH,
+                 fast_path_size: int = 320, parse_mode: Optional[str] = 'Markdown'):
+        """
+        Args:
+            send_func: Функция отправки (обычно bot.send_message)
+            flush_interval: Окно накопления сообщений (секунды)
+            max_buffer_size: Максимальная длина одного отправляемого сообщения
+            fast_path_size: Порог длины для немедленной отправки одиночного сообщения
+            parse_mode: Режим разметки для отправки
+        """
+        self.send_func = send_func
+        self.flush_interval = flush_interval
+        self.max_buffer_size = max_buffer_size
+        self.fast_path_size = fast_path_size
+        self.parse_mode = parse_mode
+
+        self.pending: Dict[Any, List[Tuple[str, Any]]] = {}
+        self._timers: Dict[Any, threading.Timer] = {}
+        self._lock = threading.Lock()
+
+    def enqueue(self, chat_id, text: str, reply_markup=None):
+        """Поставить сообщение в очередь на отправку"""
+        with self._lock:
+            queue = self.pending.get(chat_id)
+
+            # Быстрый путь: очередь пуста и сообщение короткое
+            if not queue and len(text) < self.fast_path_size:
+                send_now = True
+            else:
+                send_now = False
+                if queue is None:
+                    queue = self.pending[chat_id] = []
+                queue.append((text, reply_markup))
+
+                if chat_id not in self._timers:
+                    timer = threading.Timer(self.flush_interval, self.flush, args=(chat_id,))
+                    timer.daemon = True
+                    self._timers[chat_id] = timer
+                    timer.start()
+
+        if send_now:
+            self._send_text(chat_id, text, reply_markup)
+
+    def send_now(self, chat_id, text: str, reply_markup=None):
+        """Отправить сообщение без ожидания (накопленное для чата уходит перед ним)"""
+        self.flush(chat_id)
+        self._send_text(chat_id, text, reply_markup)
+
+    def flush(self, chat_id=None):
+        """Отправить накопленные сообщения (для одного чата или для всех)"""
+        with self._lock:
+            chat_ids = [chat_id] if chat_id is not None else list(self.pending)
+            batches = []
+            for cid in chat_ids:
+                timer = self._timers.pop(cid, None)
+                if timer is not None:
+                    timer.cancel()
+                queue = self.pending.pop(cid, None)
+                if queue:
+                    batches.append((cid, queue))
+
+        for cid, queue in batches:
+            # Подряд идущие сообщения без клавиатуры склеиваем,
+            # сообщение с клавиатурой отправляем отдельно
+            texts = []
+            for text, reply_markup in queue:
+                if reply_markup is None:
+                    texts.append(text)
+                    continue
+                if texts:
+                    self._send_text(cid, self.SEPARATOR.join(texts))
+                    texts = []
+                self._send_text(cid, text, reply_markup)
+
+            if texts:
+                self._send_text(cid, self.SEPARATOR.join(texts))
+
+    def _send_text(self, chat_id, text: str, reply_markup=None):
+        """Отправка текста с разбиением по лимиту; клавиатура - у последней части"""
+        chunks = self._split_text(text)
+        for chunk in chunks[:-1]:
+            self._send(chat_id, chunk)
+        self._send(chat_id, chunks[-1], reply_markup)
+
+    @staticmethod
+    def _is_balanced(text: str) -> bool:
+        """Все сущности Markdown (*, _, `) в тексте закрыты"""
+        return all(text.count(mark) % 2 == 0 for mark in ('*', '_', '`'))
+
+    def _cut_position(self, paragraph: str) -> Tuple[int, int]:
+        """
+        Место разреза длинного абзаца: последний перевод строки, иначе пробел
+        до лимита, после которого не остаётся незакрытой разметки.
+
+        Returns:
+            (позиция разреза, длина разделителя, который выбрасывается)
+        """
+        limit = self.max_buffer_size
+        for separator in ("\n", " "):
+            cut = paragraph.rfind(separator, 0, limit)
+            while cut > 0:
+                if self._is_balanced(paragraph[:cut]):
+                    return cut, 1
+                cut = paragraph.rfind(separator, 0, cut)
+
+        # Безопасной границы нет - режем по лимиту
+        return limit, 0
+
+    def _split_text(self, text: str) -> List[str]:
+        """Разбиение текста по границам абзацев с учётом лимита длины"""
+        limit = self.max_buffer_size
+        if len(text) <= limit:
+            return [text]
+
+        chunks = []
+        current = ""
+        for paragraph in text.split("\n\n"):
+            # Абзац длиннее лимита режем по строкам/словам, не внутри разметки
+            while len(paragraph) > limit:
+                if current:
+                    chunks.append(current)
+                    current = ""
+                cut, skip = self._cut_position(paragraph)
+                chunks.append(paragraph[:cut])
+                paragraph = paragraph[cut + skip:]
+
+            candidate = f"{current}\n\n{paragraph}" if current else paragraph
+            if len(candidate) > limit:
+                chunks.append(current)
+                current = paragraph
+            else:
+                current = candidate
+
+        if current:
+            chunks.append(current)
+
+        return chunks
+
+    def _send(self, chat_id, text: str, reply_markup=None):
+        """Отправка одного сообщения"""
+        try:
+            self.send_func(
+                chat_id=chat_id,
+                text=text,
+                reply_markup=reply_markup,
+                parse_mode=self.parse_mode
+            )
+        except Exception as e:
+            logger.error("❌ Ошибка отправки сообщения в чат %s: %s", chat_id, e)
+
+
+# ============================================================================
+# КЛАСС MessageOutbox - ОЧЕРЕДЬ ОТПРАВКИ С ОГРАНИЧЕНИЕМ СКОРОСТИ
+# ============================================================================
+class MessageOutbox:
+    """
+    Очередь исходящих сообщений с отдельным потоком-отправителем.
+
+    Соблюдает лимиты Telegram: не больше max_per_second сообщений в секунду
+    суммарно и не чаще одного сообщения в chat_interval секунд в один чат.
+    Порядок сообщений внутри чата сохраняется. При переполнении очереди
+    вытесняется самое старое сообщение с низким приоритетом.
+    """
+
+    def __init__(self, send_func,
+                 max_per_second: int = TELEGRAM_MAX_MESSAGES_PER_SECOND,
+                 chat_interval: float = TELEGRAM_CHAT_MESSAGE_INTERVAL,
+                 max_size: int = OUTBOX_MAX_SIZE):
+        """
+        Args:
+            send_func: Функция отправки (обычно bot.send_message)
+            max_per_second: Глобальный лимит сообщений в секунду
+            chat_interval: Минимальный интервал между сообщениями в один чат
+            max_size: Максимальный размер очереди
+        """
+        self.send_func = send_func
+        self.send_interval = 1.0 / max_per_second
+        self.chat_interval = chat_interval
+        self.max_size = max_size
+
+        self.queue: deque = deque()  # (chat_id, text, priority, kwargs)
+        self.dropped = 0
+        self._last_sent: Dict[Any, float] = {}
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Запустить поток-отправитель"""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="telegram-outbox", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Остановить отправитель, дождавшись опустошения очереди (не дольше timeout)"""
+        deadline = monotonic() + timeout
+        with self._cond:
+            while self.queue and monotonic() < deadline:
+                self._cond.wait(0.05)
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=max(deadline - monotonic(), 0.1))
+
+    def put(self, chat_id, text: str, priority: int = PRIORITY_HIGH, **kwargs):
+        """Поставить сообщение в очередь; kwargs передаются в send_func"""
+        with self._cond:
+            if len(self.queue) >= self.max_size:
+                self._drop_one()
+            self.queue.append((chat_id, text, priority, kwargs))
+            self._cond.notify()
+
+    def _drop_one(self):
+        """Вытеснить самое старое сообщение с низким приоритетом (или просто самое старое)"""
+        for index, item in enumerate(self.queue):
+            if item[2] == PRIORITY_LOW:
+                del self.queue[index]
+                break
+        else:
+            self.queue.popleft()
+        self.dropped += 1
+        logger.warning("⚠️  Очередь отправки переполнена, сообщение отброшено (всего: %s)", self.dropped)
+
+    def _next_ready(self, now: float):
+        """
+        Найти первое сообщение, чат которого готов к отправке.
+
+        Returns:
+            (сообщение, None) или (None, время ожидания)
+        """
+        wait = None
+        blocked = set()
+        for index, item in enumerate(self.queue):
+            chat_id = item[0]
+            if chat_id in blocked:
+                continue
+            ready_at = self._last_sent.get(chat_id, 0.0) + self.chat_interval
+            if ready_at <= now:
+                del self.queue[index]
+                return item, None
+            # Более поздние сообщения этого чата ждут своей очереди
+            blocked.add(chat_id)
+            wait = ready_at - now if wait is None else min(wait, ready_at - now)
+        return None, wait
+
+    def _run(self):
+        """Цикл потока-отправителя"""
+        while True:
+            with self._cond:
+                while True:
+                    if not self._running and not self.queue:
+                        return
+                    item, wait = self._next_ready(monotonic())
+                    if item is not None:
+                        break
+                    self._cond.wait(wait)
+                self._last_sent[item[0]] = monotonic()
+                self._cond.notify_all()
+
+            chat_id, text, _, kwargs = item
+            try:
+                self.send_func(chat_id=chat_id, text=text, **kwargs)
+            except Exception as e:
+                logger.error("❌ Ошибка отправки сообщения в чат %s: %s", chat_id, e)
+
+            # Глобальный лимит: равномерно распределяем отправки по времени
+            sleep_until = monotonic() + self.send_interval
+            with self._cond:
+                while self._running and monotonic() < sleep_until:
+                    self._cond.wait(sleep_until - monotonic())
+
+
+# ============================================================================
+# FakeMessage - СООБЩЕНИЕ-ЗАМЕНА ДЛЯ ВЫЗОВА КОМАНД ИЗ КНОПОК
+# ============================================================================
+# Кнопки главного меню вызывают обработчики команд напрямую;
+# командам достаточно чата и id исходного сообщения
+FakeMessage = namedtuple('FakeMessage', ['chat', 'message_id'])
+
+
+# ============================================================================
+# КЛАСС TTLCache - КОРОТКОЖИВУЩИЙ КЕШ ОТВЕТОВ gRPC
+# ============================================================================
+class TTLCache:
+    """
+    Потокобезопасный LRU-кеш с ограниченным временем жизни записей.
+
+    Используется для ответов gRPC по тикеру: несколько пользователей,
+    запросивших один и тот же тикер в течение TTL, получают один ответ сервера.
+    """
+
+    def __init__(self, ttl: float = GRPC_CACHE_TTL, max_size: int = GRPC_CACHE_MAX_SIZE):
+        """
+        Args:
+            ttl: Время жизни записи (секунды)
+            max_size: Максимальное количество записей
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self._data: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_call(self, key, loader: Callable[[], Any]) -> Any:
+        """Вернуть значение из кеша или вызвать loader и сохранить результат"""
+        now = monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                if item[0] > now:
+                    self._data.move_to_end(key)
+                    return item[1]
+                del self._data[key]
+
+        # Сетевой вызов выполняем вне блокировки
+        value = loader()
+        self.set(key, value)
+        return value
+
+    def set(self, key, value):
+        """Сохранить значение в кеш"""
+        with self._lock:
+            self._data[key] = (monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def discard(self, key, value):
+        """Удалить запись, если в ней всё ещё хранится value"""
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and item[1] is value:
+                del self._data[key]
+
+    def clear(self):
+        """Очистить кеш"""
+        with self._lock:
+            self._data.clear()
+
+
 # ============================================================================
 # КЛАСС TelegramPanickerBot (gRPC ВЕРСИЯ)
 # ============================================================================
@@ -89,22 +824,43 @@ class TelegramPanickerBot:
         self.config_loader = None
         self.grpc_client = None  # gRPC клиент вместо PanicDetector
         self.data_cache = None
+        self.alert_settings = None  # /alerts on/off по пользователям и /settings по чатам
+        self.alert_batcher = None  # Объединение всплесков автооповещений
+        self.reply_batcher = None  # Объединение ответов на кнопки
+        self.outbox = None  # Очередь исходящих сообщений с лимитом скорости
+        self.grpc_cache = TTLCache()  # Кеш ответов gRPC по тикеру
+        self.signals_cache = TTLCache(SIGNALS_CACHE_TTL, SIGNALS_CACHE_MAX_SIZE)  # Топ и статистика
+        self.market_status_cache = TTLCache(MARKET_STATUS_CACHE_TTL, 2)  # Статус биржи и следующий торговый день
+        self.candles_cache = TTLCache(CANDLES_CACHE_TTL, CANDLES_CACHE_MAX_SIZE)  # Свечи для кнопок
+        self._verbose_overheat = True  # Риск-анализ и кластеры в /overheat (по умолчанию для чатов)
+        self._telegram_pool = ThreadPoolExecutor(
+            max_workers=TELEGRAM_POOL_WORKERS, thread_name_prefix='tg-api'
+        )  # Фоновые вызовы Telegram API без ответа
         self.is_active = False
         self.default_tickers = ['SBER', 'GAZP', 'LKOH', 'GMKN', 'YNDX']
 
+        # Таблицы разбора callback-кнопок (методы связываются один раз)
+        self._callback_menu_handlers = {
+            data: getattr(self, name) for data, name in CALLBACK_MENU_HANDLERS.items()
+        }
+        self._callback_ticker_handlers = {
+            prefix: getattr(self, name) for prefix, name in CALLBACK_TICKER_HANDLERS.items()
+        }
+
         # Инициализируем MarketCalendar
         self.market_calendar = get_market_calendar()
 
         logger.info("TelegramPanickerBot инициализирован (gRPC + MarketCalendar)")
-        import logging
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
 
     # ------------------------------------------------------------------------
     # ЗАГРУЗКА ТОКЕНОВ И КОНФИГУРАЦИИ
     # ------------------------------------------------------------------------
-    def _load_token(self) -> str:
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _load_token() -> str:
+        """Загрузка токена из .env (читается с диска один раз за процесс)"""
         from dotenv import load_dotenv
-        import os
 
         # Загружаем .env из panicker3000/.env
         current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -126,27 +882,40 @@ class TelegramPanickerBot:
         """Инициализация всех компонентов системы"""
         try:
             # Загрузка конфигурации
-            self.config_loader = ConfigLoader()
+            self.config_loader = get_config()
+            self._verbose_overheat = self.config_loader.get_setting('telegram.verbose_overheat', True)
             logger.info("✅ ConfigLoader инициализирован")
 
             # Инициализация gRPC клиента
             try:
+                if not GRPC_AVAILABLE:
+                    raise ImportError("модуль grpc_service.grpc_client недоступен")
                 self.grpc_client = get_grpc_client()
                 if self.grpc_client is None:
                     raise ValueError("get_grpc_client вернул None")
                 self.logger.info("[OK] gRPC клиент инициализирован")
+
+                # Один долгоживущий поток для всех сканирований (unary остаётся запасным)
+                self.grpc_client.open_scan_stream()
             except Exception as e:
-                self.logger.error(f"❌ Не удалось инициализировать gRPC клиент: {e}")
+                self.logger.error("❌ Не удалось инициализировать gRPC клиент: %s", e)
                 self.grpc_client = None
 
             # Инициализация кеша данных
             self.data_cache = DataCache()
             logger.info("✅ DataCache инициализирован")
 
+            # Настройки уведомлений: без БД /alerts работает как раньше (всегда включено)
+            try:
+                self.alert_settings = AlertSettingsStore()
+            except Exception as e:
+                logger.error("❌ Не удалось открыть настройки уведомлений: %s", e)
+                self.alert_settings = None
+
             logger.info("✅ Все компоненты инициализированы")
 
         except Exception as e:
-            logger.error(f"❌ Ошибка инициализации компонентов: {e}")
+            logger.error("❌ Ошибка инициализации компонентов: %s", e)
             raise
 
     # ------------------------------------------------------------------------
@@ -154,60 +923,23 @@ class TelegramPanickerBot:
     # ------------------------------------------------------------------------
     def _register_handlers(self):
         """Регистрация всех обработчиков команд для telebot"""
-
-        @self.bot.message_handler(commands=['overheat'])
-        def handle_overheat(message):
-            args = message.text.split()[1:] if len(message.text.split()) > 1 else []
-            self.command_overheat(message, args)
-
-        @self.bot.message_handler(commands=['start'])
-        def handle_start(message):
-            self.command_start(message)
-
-        @self.bot.message_handler(commands=['help'])
-        def handle_help(message):
-            self.command_help(message)
-
-        @self.bot.message_handler(commands=['today'])
-        def handle_today(message):
-            self.command_today(message)
-
-        @self.bot.message_handler(commands=['stats'])
-        def handle_stats(message):
-            self.command_stats(message)
-
-        @self.bot.message_handler(commands=['extreme'])
-        def handle_extreme(message):
-            self.command_extreme(message)
-
-        @self.bot.message_handler(commands=['panicmap'])
-        def handle_panicmap(message):
-            self.command_panicmap(message)
-
-        @self.bot.message_handler(commands=['alerts'])
-        def handle_alerts(message):
-            args = message.text.split()[1:] if len(message.text.split()) > 1 else []
-            self.command_alerts(message, args)
-
-        @self.bot.message_handler(commands=['startscan'])
-        def handle_startscan(message):
-            self.command_startscan(message)
-
-        @self.bot.message_handler(commands=['status'])
-        def handle_status(message):
-            self.command_status(message)
-
-        @self.bot.message_handler(commands=['report'])
-        def handle_report(message):
-            self.command_report(message)
+        # Команды регистрируются по таблице BOT_COMMANDS
+        for command, (method_name, takes_args) in BOT_COMMANDS.items():
+            handler = getattr(self, method_name)
+            if takes_args:
+                handler = partial(self._dispatch_with_args, handler)
+            self.bot.message_handler(commands=[command])(handler)
 
         # Обработка callback-кнопок
-        @self.bot.callback_query_handler(func=lambda call: True)
-        def handle_callback(call):
-            self.handle_callback_query(call)
+        self.bot.callback_query_handler(func=lambda call: True)(self.handle_callback_query)
 
         logger.info("✅ Обработчики команд зарегистрированы")
 
+    @staticmethod
+    def _dispatch_with_args(handler, message):
+        """Вызов обработчика команды с аргументами из текста сообщения"""
+        handler(message, message.text.split()[1:])
+
     # ------------------------------------------------------------------------
     # ОСНОВНОЙ МЕТОД: ЗАПУСК БОТА
     # ------------------------------------------------------------------------
@@ -224,7 +956,11 @@ class TelegramPanickerBot:
                 logger.info("✅ Pydantic модели загружены успешно")
 
             # Создание экземпляра бота
-            self.bot = telebot.TeleBot(self.token)
+            self.bot = telebot.TeleBot(self.token, threaded=True, num_threads=BOT_WORKER_THREADS)
+            self.outbox = MessageOutbox(self.bot.send_message)
+            self.outbox.start()
+            self.alert_batcher = MessageBatcher(self._enqueue_alert)
+            self.reply_batcher = MessageBatcher(self._enqueue_reply, flush_interval=REPLY_BATCH_FLUSH_INTERVAL)
 
             # Регистрация обработчиков команд
             self._register_handlers()
@@ -238,13 +974,17 @@ class TelegramPanickerBot:
             # Запуск бота в режиме polling
             logger.info("📡 Запускаем polling...")
             try:
-                self.bot.infinity_polling(timeout=20, long_polling_timeout=5)
+                self.bot.infinity_polling(
+                    timeout=POLLING_REQUEST_TIMEOUT,
+                    long_polling_timeout=LONG_POLLING_TIMEOUT,
+                    allowed_updates=ALLOWED_UPDATES
+                )
             except Exception as e:
-                logger.error(f"❌ Ошибка в polling: {e}")
+                logger.error("❌ Ошибка в polling: %s", e)
                 raise
 
         except Exception as e:
-            logger.error(f"❌ Критическая ошибка при запуске бота: {e}")
+            logger.error("❌ Критическая ошибка при запуске бота: %s", e)
             raise
 
     # ------------------------------------------------------------------------
@@ -262,40 +1002,96 @@ class TelegramPanickerBot:
         try:
             # Получаем тикер из аргументов
             ticker = args[0].upper() if args and len(args) > 0 else "SBER"
+            if not _TICKER_RE.fullmatch(ticker):
+                # Ответ без parse_mode: ввод пользователя не разбирается как Markdown
+                self._reply(message, f"❌ Неверный тикер: {ticker[:20]}\nПример: /overheat SBER")
+                return
 
-            # Получаем данные через gRPC как PanicSignal
-            panic_signal = self._get_panic_signal_via_grpc(ticker)
+            # Получаем данные через gRPC как PanicSignal (и исходный сигнал сканера)
+            panic_signal, raw_signal = self._get_panic_signal_via_grpc(ticker)
+            verbose = self._verbose_for(message.chat.id)
 
             if not panic_signal:
                 # Получаем упрощённые данные если нет полноценного сигнала
                 overheat_data = self._get_overheat_data_via_grpc(ticker)
-                overheat_text = self._format_overheat_message(ticker, overheat_data)
+                overheat_text = self._format_overheat_message(ticker, overheat_data, raw_signal, verbose)
             else:
                 # Используем PanicSignal для форматирования
-                overheat_text = self._format_overheat_from_signal(ticker, panic_signal)
+                overheat_text = self._format_overheat_from_signal(ticker, panic_signal, verbose)
 
             # Получаем клавиатуру
             reply_markup = self._get_overheat_keyboard(ticker)
 
-            self.bot.reply_to(
+            self._reply(
                 message,
-                text=overheat_text,
+                overheat_text,
                 reply_markup=reply_markup,
                 parse_mode='Markdown',
                 disable_notification=True
             )
 
-            logger.info(f"🌡️  Команда /overheat выполнена для {ticker}")
+            logger.info("🌡️  Команда /overheat выполнена для %s", ticker)
 
         except Exception as e:
-            logger.error(f"❌ Ошибка в команде /overheat: {e}")
-            self.bot.reply_to(message, f"❌ Ошибка: {str(e)[:100]}")
+            logger.error("❌ Ошибка в команде /overheat: %s", e)
+            self._reply(message, f"❌ Ошибка: {str(e)[:100]}")
+
+    # ------------------------------------------------------------------------
+    # ОТПРАВКА ЧЕРЕЗ ОЧЕРЕДЬ
+    # ------------------------------------------------------------------------
+    def _reply(self, message, text: str, **kwargs):
+        """
+        Ответ на сообщение пользователя через очередь отправки.
+
+        HTTPS-запрос к Telegram выполняет поток очереди, поэтому поток
+        обработчика освобождается сразу после постановки ответа.
+        """
+        if self.outbox is None:
+            self.bot.reply_to(message, text, **kwargs)
+            return
+
+        self.outbox.put(
+            message.chat.id,
+            text,
+            priority=PRIORITY_HIGH,
+            reply_parameters=types.ReplyParameters(message.message_id),
+            **kwargs
+        )
+
+    def _send(self, chat_id, text: str, reply_markup=None):
+        """
+        Ответ на нажатие кнопки (Markdown).
+
+        Ответы, пришедшие в один чат за REPLY_BATCH_FLUSH_INTERVAL,
+        склеиваются батчером в одно сообщение и уходят через очередь.
+        Ответ с клавиатурой не склеивается и не ждёт окна накопления.
+        """
+        if self.reply_batcher is None:
+            self.bot.send_message(chat_id, text, reply_markup=reply_markup, parse_mode='Markdown')
+            return
+
+        if reply_markup is not None:
+            self.reply_batcher.send_now(chat_id, text, reply_markup=reply_markup)
+            return
+
+        self.reply_batcher.enqueue(chat_id, text)
+
+    def _enqueue_alert(self, chat_id, text: str, **kwargs):
+        """Отправка пачки автооповещений через очередь (низкий приоритет)"""
+        self.outbox.put(chat_id, text, priority=PRIORITY_LOW, **kwargs)
+
+    def _enqueue_reply(self, chat_id, text: str, **kwargs):
+        """Отправка пачки ответов на кнопки через очередь (высокий приоритет)"""
+        self.outbox.put(chat_id, text, priority=PRIORITY_HIGH, **kwargs)
 
     def _get_overheat_data_via_grpc(self, ticker: str) -> Dict[str, Any]:
         """Получение индекса перегрева через gRPC"""
         try:
             # Вызываем gRPC метод
-            overheat_data = self.grpc_client.get_overheat_index(ticker)
+            overheat_data = self.grpc_cache.get_or_call(
+                ('get_overheat_index', ticker),
+                lambda: self.grpc_client.get_overheat_index(ticker)
+            )
 
             # Обрабатываем ответ
             overheat_percent = overheat_data.get('overheat_percentage', 50.0)
@@ -313,7 +1109,7 @@ class TelegramPanickerBot:
             }
 
         except Exception as e:
-            logger.error(f"❌ Ошибка gRPC для {ticker}: {e}")
+            logger.error("❌ Ошибка gRPC для %s: %s", ticker, e)
             # Заглушка при ошибке
             return {
                 'overheat_percent': 50.0,
@@ -324,108 +1120,200 @@ class TelegramPanickerBot:
                 'last_signal_level': 'НЕТ'
             }
 
-    def _get_panic_signal_via_grpc(self, ticker: str) -> Optional[PanicSignal]:
-        """Получение полноценного PanicSignal через gRPC"""
-        try:
-            if not PanicSignal:
-                logger.warning("Pydantic модели не загружены, используем старый формат")
-                return None
+    def _today_signals_future(self) -> Future:
+        """
+        Сигналы за сегодня (первые TODAY_SIGNALS_LIMIT по силе).
 
-            # Вызываем gRPC метод для сканирования тикера
-            signals = self.grpc_client.scan_tickers([ticker])
+        Один запрос на несколько секунд для всех команд: в кеше хранится
+        Future, поэтому одновременные команды ждут один и тот же ответ.
+        """
+        return self.signals_cache.get_or_call(
+            ('get_top_signals', 'today'),
+            partial(self.grpc_client.get_top_signals_async, period='today', limit=TODAY_SIGNALS_LIMIT)
+        )
 
-            if not signals or len(signals) == 0:
-                return None
+    def _stats_future(self, days: int) -> Future:
+        """Статистика за days дней через общий кеш (см. _today_signals_future)"""
+        return self.signals_cache.get_or_call(
+            ('get_stats', days),
+            partial(self.grpc_client.get_stats_async, days=days)
+        )
+
+    def _candles_future(self, ticker: str, interval: str, count: int) -> Future:
+        """
+        Свечи через общий кеш (см. _today_signals_future).
+
+        Пустой или неудачный ответ из кеша убирается, чтобы следующее
+        нажатие повторило запрос, а не ждало истечения CANDLES_CACHE_TTL.
+        Проверка вешается только на новый запрос, не на попадание в кеш.
+        """
+        key = ('get_candles', ticker, interval, count)
+        loaded = []
+
+        def load():
+            future = self.grpc_client.get_candles_async(ticker=ticker, interval=interval, count=count)
+            loaded.append(future)
+            return future
 
-            # Преобразуем словарь в PanicSignal
-            signal_data = signals[0]
+        def discard_if_failed(done: Future):
+            if done.cancelled() or done.exception() is not None or not done.result():
+                self.candles_cache.discard(key, done)
 
-            # Проверяем, что это словарь (а не уже PanicSignal)
-            if isinstance(signal_data, dict):
-                # Создаём PanicSignal из словаря
-                panic_signal = PanicSignal(**signal_data)
+        future = self.candles_cache.get_or_call(key, load)
+        if loaded:
+            # Уже после сохранения в кеш: готовый Future вызовет проверку сразу
+            future.add_done_callback(discard_if_failed)
+        return future
 
-                # Валидируем
-                if validate_panic_signal:
-                    validate_panic_signal(panic_signal)
+    def _get_panic_signal_via_grpc(self, ticker: str) -> Tuple[Optional[PanicSignal], Any]:
+        """
+        Получение полноценного PanicSignal через gRPC.
+
+        Возвращает пару (panic_signal, raw_signal): raw_signal — исходный
+        сигнал сканера, чтобы форматирование не повторяло запрос scan_tickers.
+        """
+        try:
+            # Вызываем gRPC метод для сканирования тикера; при сбое исключение,
+            # и в кеш не попадает пустой список под видом "сигнала нет"
+            signals = self.grpc_cache.get_or_call(
+                ('scan_tickers', ticker),
+                lambda: self.grpc_client.scan_tickers([ticker], raise_on_error=True)
+            )
+        except Exception as e:
+            logger.error("❌ Ошибка получения PanicSignal для %s: %s", ticker, e)
+            return None, None
 
-                return panic_signal
-            elif isinstance(signal_data, PanicSignal):
-                # Уже готовый PanicSignal
-                return signal_data
+        if not signals:
+            return None, None
+
+        signal_data = signals[0]
+
+        try:
+            if not PanicSignal:
+                logger.warning("Pydantic модели не загружены, используем старый формат")
+                return None, signal_data
+
+            if isinstance(signal_data, PanicSignal):
+                # Уже готовый PanicSignal (провалидирован клиентом gRPC)
+                return signal_data, signal_data
+            elif isinstance(signal_data, dict):
+                # Словарь клиент возвращает, только если сам не смог построить
+                # PanicSignal: повторная валидация тех же данных снова упадёт
+                if GRPC_VALIDATES_SIGNALS and not STRICT_SIGNAL_VALIDATION:
+                    return None, signal_data
+
+                return PanicSignal(**signal_data), signal_data
             else:
-                logger.warning(f"Неизвестный формат сигнала для {ticker}: {type(signal_data)}")
-                return None
+                logger.warning("Неизвестный формат сигнала для %s: %s", ticker, type(signal_data))
+                return None, signal_data
 
         except Exception as e:
-            logger.error(f"❌ Ошибка получения PanicSignal для {ticker}: {e}")
-            return None
+            logger.error("❌ Ошибка получения PanicSignal для %s: %s", ticker, e)
+            return None, signal_data
+
+    @staticmethod
+    def _as_panic_signal(signal_data):
+        """
+        PanicSignal для сигнала от gRPC, если его можно построить.
+
+        Клиент gRPC сам валидирует сигналы и возвращает словарь, только если
+        данные не прошли схему: повторная валидация лишь тратит время на
+        заведомо падающий PanicSignal(**data) и исключение. Повторно
+        проверяем только в строгом режиме или без валидации на клиенте.
+        """
+        if not isinstance(signal_data, dict) or not PanicSignal:
+            return signal_data
+        if GRPC_VALIDATES_SIGNALS and not STRICT_SIGNAL_VALIDATION:
+            return signal_data
 
-    def _format_overheat_message(self, ticker: str, data: Dict[str, Any]) -> str:
-        """Форматирование сообщения об индексе перегрева с деталями"""
         try:
-            # Получаем детальный сигнал для кластеров
-            signals = self.grpc_client.scan_tickers([ticker])
-            has_detailed_data = signals and len(signals) > 0
+            return PanicSignal(**signal_data)
+        except Exception as e:
+            logger.warning("Не удалось создать PanicSignal: %s", e)
+            return signal_data
+
+    def _scan_tickers_batch(self, tickers: List[str]) -> List:
+        """
+        Сканирование нескольких тикеров одним запросом gRPC.
+
+        Результаты раскладываются по тикерам в кеш, поэтому следующий
+        /overheat по любому из них не делает отдельного запроса.
+        Ошибка gRPC пробрасывается вызывающему, кеш при этом не заполняется.
+        """
+        signals = self.grpc_client.scan_tickers(tickers, raise_on_error=True)
+
+        by_ticker = {ticker: [] for ticker in tickers}
+        for signal in signals:
+            ticker = signal.get('ticker') if isinstance(signal, dict) else getattr(signal, 'ticker', None)
+            if ticker in by_ticker:
+                by_ticker[ticker].append(signal)
+
+        for ticker, ticker_signals in by_ticker.items():
+            self.grpc_cache.set(('scan_tickers', ticker), ticker_signals)
 
-            # Базовый текст
-            text = f"🌡️ **ИНДЕКС ПЕРЕГРЕВА {ticker}**\n\n"
-            text += f"Текущее состояние: {data['overheat_bar']} {data['overheat_percent']:.0f}%\n\n"
+        return signals
 
-            # Основные метрики
-            text += f"📊 **ОСНОВНЫЕ ПОКАЗАТЕЛИ:**\n"
-            text += f"• RSI: {data['current_rsi']:.1f}\n"
-            text += f"• Объём: {data['volume_ratio']:.1f}× от нормы\n"
-            text += f"• Последний сигнал: {data['last_signal_time']} ({data['last_signal_level']})\n\n"
+    def _format_overheat_message(self, ticker: str, data: Dict[str, Any], signal=None,
+                                 verbose: Optional[bool] = None) -> str:
+        """
+        Форматирование сообщения об индексе перегрева с деталями.
+
+        signal — уже полученный сигнал сканера (словарь) для риска и кластеров;
+        повторный запрос к gRPC не выполняется.
+        verbose — подробный режим чата (None - значение по умолчанию).
+        """
+        if verbose is None:
+            verbose = self._verbose_overheat
 
-            # Если есть детальные данные, добавляем риск и кластеры
-            if has_detailed_data:
-                signal = signals[0]
+        try:
+            has_detailed_data = isinstance(signal, dict)
 
+            # Базовый текст и основные метрики
+            parts = [
+                f"🌡️ **ИНДЕКС ПЕРЕГРЕВА {ticker}**\n\n"
+                f"Текущее состояние: {data['overheat_bar']} {data['overheat_percent']:.0f}%\n\n"
+                f"📊 **ОСНОВНЫЕ ПОКАЗАТЕЛИ:**\n"
+                f"• RSI: {data['current_rsi']:.1f}\n"
+                f"• Объём: {data['volume_ratio']:.1f}× от нормы\n"
+                f"• Последний сигнал: {data['last_signal_time']} ({data['last_signal_level']})\n\n"
+            ]
+
+            # Если есть детальные данные и включён подробный режим, добавляем риск и кластеры
+            if has_detailed_data and verbose:
                 # Риск-метрика
                 risk = signal.get('risk_metric')
                 if risk is not None:
-                    if risk >= 70:
-                        risk_status = "🔴 ВЫСОКИЙ"
-                    elif risk >= 40:
-                        risk_status = "🟡 СРЕДНИЙ"
-                    else:
-                        risk_status = "🟢 НИЗКИЙ"
+                    bucket = self._risk_bucket(risk)
+                    risk_status = f"{_RISK_ICONS[bucket]} {_RISK_LABELS[bucket]}"
 
-                    text += f"📈 **РИСК-АНАЛИЗ:**\n"
-                    text += f"• Оценка риска: {risk:.1f}/100\n"
-                    text += f"• Уровень: {risk_status}\n\n"
+                    parts.append(
+                        f"📈 **РИСК-АНАЛИЗ:**\n"
+                        f"• Оценка риска: {risk:.1f}/100\n"
+                        f"• Уровень: {risk_status}\n\n"
+                    )
 
                 # Кластеры объёма
                 clusters = signal.get('volume_clusters', [])
                 if clusters:
-                    text += f"📊 **КЛЮЧЕВЫЕ УРОВНИ ОБЪЁМА:**\n"
+                    parts.append("📊 **КЛЮЧЕВЫЕ УРОВНИ ОБЪЁМА:**\n")
 
                     for i, cluster in enumerate(clusters[:3], 1):  # первые 3 кластера
                         price = cluster.get('price_level', 0)
                         percentage = cluster.get('volume_percentage', 0)
                         role = cluster.get('role', 'N/A')
 
-                        role_icon = "🟢" if role == 'support' else "🔴" if role == 'resistance' else "⚪"
-                        text += f"{i}. {role_icon} {price:.2f}₽ ({percentage:.1f}% объёма)\n"
-
-                    text += "\n"
+                        role_icon = _ROLE_ICONS.get(role, _DEFAULT_ROLE_ICON)
+                        parts.append(f"{i}. {role_icon} {price:.2f}₽ ({percentage:.1f}% объёма)\n")
 
-            # ПРАВИЛЬНАЯ ЛЕГЕНДА С ИНВЕРТИРОВАННОЙ ЛОГИКОЙ
-            text += "━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-            text += "📈 **ЛОГИКА ШКАЛЫ:**\n"
-            text += "• [⬜⬜⬜⬜⬜] 0% = Холодно, сигналов нет\n"
-            text += "• [🟩🟩⬜⬜⬜] 40% = Умеренная активность\n"
-            text += "• [🟩🟩🟩🟩🟩] 100% = ЖАРКО! Сильный сигнал!\n\n"
+                    parts.append("\n")
 
-            # Навигация
-            text += "📋 Все сигналы: /today\n"
-            text += "🔥 Самые сильные: /extreme"
+            # Легенда шкалы и навигация
+            parts.append(_OVERHEAT_LEGEND)
 
-            return text
+            return "".join(parts)
 
         except Exception as e:
-            logger.error(f"❌ Ошибка форматирования для {ticker}: {e}")
+            logger.error("❌ Ошибка форматирования для %s: %s", ticker, e)
             # Возвращаем упрощённую версию при ошибке
             return (
                 f"🌡️ **ИНДЕКС ПЕРЕГРЕВА {ticker}**\n\n"
@@ -438,130 +1326,112 @@ class TelegramPanickerBot:
 
     def _create_overheat_bar(self, percentage: float) -> str:
         """Создать шкалу индекса перегрева с цветными квадратами"""
-        # 5 сегментов [🟩🟩🟩⬜⬜]
-        filled = int(percentage / 20)  # 0-20% = 0, 20-40% = 1, и т.д.
-        filled = min(filled, 5)
-        empty = 5 - filled
+        # 5 сегментов [🟩🟩🟩⬜⬜]: 0-20% = 0, 20-40% = 1, и т.д.
+        return _OVERHEAT_BARS[min(max(int(percentage / 20), 0), 5)]
 
-        # Используем зелёные квадраты для заполненных, белые для пустых
-        return f"[{'🟩' * filled}{'⬜' * empty}]"
-
-    def _format_overheat_from_signal(self, ticker: str, panic_signal: PanicSignal) -> str:
+    def _format_overheat_from_signal(self, ticker: str, panic_signal: PanicSignal,
+                                     verbose: Optional[bool] = None) -> str:
         """Форматирование сообщения об индексе перегрева из PanicSignal"""
-        try:
-            # Базовый текст
-            text = f"🌡️ **ИНДЕКС ПЕРЕГРЕВА {ticker}**\n\n"
+        if verbose is None:
+            verbose = self._verbose_overheat
 
+        try:
             # Создаём шкалу перегрева на основе RSI
             overheat_percent = self._calculate_overheat_percentage(panic_signal)
             overheat_bar = self._create_overheat_bar(overheat_percent)
-            text += f"Текущее состояние: {overheat_bar} {overheat_percent:.0f}%\n\n"
 
-            # Основные метрики из PanicSignal
-            text += f"📊 **ОСНОВНЫЕ ПОКАЗАТЕЛИ:**\n"
-            text += f"• RSI(14): {panic_signal.rsi_14:.1f}\n"
+            # Базовый текст и основные метрики из PanicSignal
+            parts = [
+                f"🌡️ **ИНДЕКС ПЕРЕГРЕВА {ticker}**\n\n"
+                f"Текущее состояние: {overheat_bar} {overheat_percent:.0f}%\n\n"
+                f"📊 **ОСНОВНЫЕ ПОКАЗАТЕЛИ:**\n"
+                f"• RSI(14): {panic_signal.rsi_14:.1f}\n"
+            ]
             if panic_signal.rsi_7 and panic_signal.rsi_21:
-                text += f"• RSI(7/21): {panic_signal.rsi_7:.1f}/{panic_signal.rsi_21:.1f}\n"
-            text += f"• Объём: {panic_signal.volume_ratio:.1f}× от нормы\n"
-            text += f"• Тип сигнала: {panic_signal.signal_type}\n"
-            text += f"• Уровень: {panic_signal.level}\n"
-            text += f"• Время обнаружения: {panic_signal.detected_at}\n\n"
-
-            # Риск-метрика (шаг 10 алгоритма)
-            if panic_signal.risk_metric is not None:
+                parts.append(f"• RSI(7/21): {panic_signal.rsi_7:.1f}/{panic_signal.rsi_21:.1f}\n")
+            parts.append(
+                f"• Объём: {panic_signal.volume_ratio:.1f}× от нормы\n"
+                f"• Тип сигнала: {panic_signal.signal_type}\n"
+                f"• Уровень: {panic_signal.final_level}\n"
+                f"• Время обнаружения: {panic_signal.timestamp:%d.%m.%Y %H:%M}\n\n"
+            )
+
+            # Риск-метрика (шаг 10 алгоритма), только в подробном режиме
+            if verbose and panic_signal.risk_metric is not None:
                 risk = panic_signal.risk_metric
-                if risk >= 70:
-                    risk_status = "🔴 ВЫСОКИЙ"
-                elif risk >= 40:
-                    risk_status = "🟡 СРЕДНИЙ"
-                else:
-                    risk_status = "🟢 НИЗКИЙ"
+                bucket = self._risk_bucket(risk)
+                risk_status = f"{_RISK_ICONS[bucket]} {_RISK_LABELS[bucket]}"
 
-                text += f"📈 **РИСК-АНАЛИЗ:**\n"
-                text += f"• Оценка риска: {risk:.1f}/100\n"
-                text += f"• Уровень: {risk_status}\n\n"
+                parts.append(
+                    f"📈 **РИСК-АНАЛИЗ:**\n"
+                    f"• Оценка риска: {risk:.1f}/100\n"
+                    f"• Уровень: {risk_status}\n\n"
+                )
 
-            # Кластеры объёма (шаг 9 алгоритма)
-            if panic_signal.volume_clusters and len(panic_signal.volume_clusters) > 0:
-                text += f"📊 **КЛЮЧЕВЫЕ УРОВНИ ОБЪЁМА:**\n"
+            # Кластеры объёма (шаг 9 алгоритма), только в подробном режиме
+            if verbose and panic_signal.volume_clusters:
+                parts.append("📊 **КЛЮЧЕВЫЕ УРОВНИ ОБЪЁМА:**\n")
 
-                # Сортируем кластеры по доле объёма
-                sorted_clusters = sorted(
-                    panic_signal.volume_clusters,
-                    key=lambda x: x.get('volume_percentage', 0) if isinstance(x, dict) else x.volume_percentage,
-                    reverse=True
-                )
+                # Приводим кластеры к кортежам (цена, доля, роль) за один проход
+                clusters = [
+                    (c.get('price_level', 0), c.get('volume_percentage', 0), c.get('role', 'N/A'))
+                    if isinstance(c, dict) else
+                    (c.price_level, c.volume_percentage, c.role)
+                    for c in panic_signal.volume_clusters
+                ]
 
-                for i, cluster in enumerate(sorted_clusters[:3], 1):  # первые 3 кластера
-                    if isinstance(cluster, dict):
-                        price = cluster.get('price_level', 0)
-                        percentage = cluster.get('volume_percentage', 0)
-                        role = cluster.get('role', 'N/A')
-                    else:
-                        price = cluster.price_level
-                        percentage = cluster.volume_percentage
-                        role = cluster.role
+                # Три кластера с наибольшей долей объёма
+                top_clusters = heapq.nlargest(3, clusters, key=itemgetter(1))
 
-                    role_icon = "🟢" if role == 'support' else "🔴" if role == 'resistance' else "⚪"
-                    text += f"{i}. {role_icon} {price:.2f}₽ ({percentage:.1f}% объёма)\n"
+                for i, (price, percentage, role) in enumerate(top_clusters, 1):
+                    role_icon = _ROLE_ICONS.get(role, _DEFAULT_ROLE_ICON)
+                    parts.append(f"{i}. {role_icon} {price:.2f}₽ ({percentage:.1f}% объёма)\n")
 
-                text += "\n"
+                parts.append("\n")
 
             # Рекомендация на основе базового уровня
             if panic_signal.base_level:
-                text += f"🎯 **ОЦЕНКА СИГНАЛА:**\n"
-                text += f"• Базовый уровень: {panic_signal.base_level}\n"
+                parts.append(
+                    f"🎯 **ОЦЕНКА СИГНАЛА:**\n"
+                    f"• Базовый уровень: {panic_signal.base_level}\n"
+                )
                 if panic_signal.final_level and panic_signal.final_level != panic_signal.base_level:
-                    text += f"• С учётом фильтров: {panic_signal.final_level}\n"
-                text += "\n"
+                    parts.append(f"• С учётом фильтров: {panic_signal.final_level}\n")
+                parts.append("\n")
 
-            # ПРАВИЛЬНАЯ ЛЕГЕНДА С ИНВЕРТИРОВАННОЙ ЛОГИКОЙ
-            text += "━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-            text += "📈 **ЛОГИКА ШКАЛЫ:**\n"
-            text += "• [⬜⬜⬜⬜⬜] 0% = Холодно, сигналов нет\n"
-            text += "• [🟩🟩⬜⬜⬜] 40% = Умеренная активность\n"
-            text += "• [🟩🟩🟩🟩🟩] 100% = ЖАРКО! Сильный сигнал!\n\n"
+            # Легенда шкалы и навигация
+            parts.append(_OVERHEAT_LEGEND)
 
-            # Навигация
-            text += "📋 Все сигналы: /today\n"
-            text += "🔥 Самые сильные: /extreme"
-
-            return text
+            return "".join(parts)
 
         except Exception as e:
-            logger.error(f"❌ Ошибка форматирования PanicSignal для {ticker}: {e}")
+            logger.error("❌ Ошибка форматирования PanicSignal для %s: %s", ticker, e)
             # Возвращаем упрощённую версию при ошибке
             return self._format_overheat_message(ticker, {
                 'overheat_percent': 50.0,
                 'overheat_bar': '[🟩🟩⬜⬜⬜]',
                 'current_rsi': panic_signal.rsi_14 if hasattr(panic_signal, 'rsi_14') else 50.0,
                 'volume_ratio': panic_signal.volume_ratio if hasattr(panic_signal, 'volume_ratio') else 1.0,
-                'last_signal_time': panic_signal.detected_at if hasattr(panic_signal, 'detected_at') else '',
-                'last_signal_level': panic_signal.level if hasattr(panic_signal, 'level') else 'НЕТ'
-            })
+                'last_signal_time': f"{panic_signal.timestamp:%H:%M}" if hasattr(panic_signal, 'timestamp') else '',
+                'last_signal_level': panic_signal.final_level if hasattr(panic_signal, 'final_level') else 'НЕТ'
+            }, verbose=verbose)
 
     def _calculate_overheat_percentage(self, panic_signal: PanicSignal) -> float:
         """Расчёт процента перегрева на основе PanicSignal"""
         try:
             # Базовая логика: 0% = RSI=50, 100% = RSI=0 или RSI=100
-            rsi = panic_signal.rsi_14
-
-            if rsi <= 50:
-                # Паника: RSI от 50 до 0 = 0% до 100%
-                percentage = ((50 - rsi) / 50) * 100
-            else:
-                # Жадность: RSI от 50 до 100 = 0% до 100%
-                percentage = ((rsi - 50) / 50) * 100
+            # (паника и жадность симметричны относительно 50)
+            percentage = abs(panic_signal.rsi_14 - 50.0) * 2.0
 
             # Учитываем объём (коэффициент увеличения)
             volume_factor = min(panic_signal.volume_ratio, 3.0)  # Ограничиваем влияние объёма
-            adjusted_percentage = percentage * (volume_factor / 2.0)  # Нормализуем
+            adjusted_percentage = percentage * volume_factor * 0.5  # Нормализуем
 
             # Ограничиваем 0-100%
             return min(max(adjusted_percentage, 0.0), 100.0)
 
         except Exception as e:
-            logger.error(f"❌ Ошибка расчёта перегрева: {e}")
+            logger.error("❌ Ошибка расчёта перегрева: %s", e)
             return 50.0  # Значение по умолчанию
 
     # ------------------------------------------------------------------------
@@ -587,19 +1457,22 @@ class TelegramPanickerBot:
             # Получаем клавиатуру
             reply_markup = self._get_alert_keyboard(panic_signal.ticker)
 
-            # Отправляем сообщение
-            self.bot.send_message(
-                chat_id=chat_id,
-                text=alert_text,
-                reply_markup=reply_markup,
-                parse_mode='Markdown',
-                disable_notification=False
-            )
+            # Отправляем сообщение (всплески сигналов объединяются батчером)
+            if self.alert_batcher:
+                self.alert_batcher.enqueue(chat_id, alert_text, reply_markup=reply_markup)
+            else:
+                self.bot.send_message(
+                    chat_id=chat_id,
+                    text=alert_text,
+                    reply_markup=reply_markup,
+                    parse_mode='Markdown',
+                    disable_notification=False
+                )
 
-            logger.info(f"🚨 Автооповещение отправлено для {panic_signal.ticker}")
+            logger.info("🚨 Автооповещение отправлено для %s", panic_signal.ticker)
 
         except Exception as e:
-            logger.error(f"❌ Ошибка отправки автооповещения: {e}")
+            logger.error("❌ Ошибка отправки автооповещения: %s", e)
 
     def _format_alert_message(self, panic_signal: PanicSignal) -> str:
         """Форматирование сообщения автооповещения по шаблону из плана проекта"""
@@ -609,45 +1482,46 @@ class TelegramPanickerBot:
                 try:
                     return format_panic_signal_alert(panic_signal)
                 except Exception as e:
-                    logger.warning(f"Ошибка в format_panic_signal_alert: {e}, используем fallback")
+                    logger.warning("Ошибка в format_panic_signal_alert: %s, используем fallback", e)
                     return self._format_alert_message_fallback(panic_signal)
             else:
                 # Fallback на старую логику
                 return self._format_alert_message_fallback(panic_signal)
 
         except Exception as e:
-            logger.error(f"❌ Ошибка форматирования автооповещения: {e}")
-            return f"🚨 **СИГНАЛ {panic_signal.ticker}**\n\nОбнаружен сигнал уровня {panic_signal.level}"
+            logger.error("❌ Ошибка форматирования автооповещения: %s", e)
+            return f"🚨 **СИГНАЛ {panic_signal.ticker}**\n\nОбнаружен сигнал уровня {panic_signal.final_level}"
 
     def _format_alert_message_fallback(self, panic_signal: PanicSignal) -> str:
         """Fallback форматирование если format_panic_signal_alert не доступен"""
         try:
             # Эмодзи уровня
-            level_emoji = "🚨" if "🔴" in panic_signal.level else "⚠️" if "🟡" in panic_signal.level else "ℹ️"
+            level = panic_signal.final_level
+            level_emoji = "🚨" if level == "red" else "⚠️" if level == "yellow" else "ℹ️"
 
             # Тип паники/жадности
-            signal_type_rus = "ПАНИКА" if "ПАНИКА" in panic_signal.signal_type.upper() else "ЖАДНОСТЬ"
-
-            text = f"{level_emoji} **{panic_signal.level} В {panic_signal.ticker} ОБНАРУЖЕНА {signal_type_rus}!**\n\n"
-
-            # Базовые данные
-            text += f"📊 **ПАРАМЕТРЫ {signal_type_rus}:**\n"
-            text += f"• RSI: {panic_signal.rsi_14:.1f}\n"
-            text += f"• Объём: {panic_signal.volume_ratio:.1f}× от нормы\n"
-            text += f"• Время: {panic_signal.detected_at}\n"
-
-            return text
+            signal_type_rus = "ПАНИКА" if panic_signal.signal_type == "panic" else "ЖАДНОСТЬ"
+
+            return _ALERT_FALLBACK_TEMPLATE.format(
+                level_emoji=level_emoji,
+                level=level,
+                ticker=panic_signal.ticker,
+                signal_type=signal_type_rus,
+                rsi=panic_signal.rsi_14,
+                volume_ratio=panic_signal.volume_ratio,
+                timestamp=panic_signal.timestamp
+            )
 
         except Exception as e:
-            logger.error(f"❌ Ошибка fallback форматирования: {e}")
-            return f"🚨 Сигнал {panic_signal.ticker}: {panic_signal.level}"
+            logger.error("❌ Ошибка fallback форматирования: %s", e)
+            return f"🚨 Сигнал {panic_signal.ticker}: {panic_signal.final_level}"
 
     def _get_alert_keyboard(self, ticker: str):
         """Получить клавиатуру для автооповещения"""
         try:
             return inline_keyboards.get_alert_keyboard(ticker)
         except Exception as e:
-            logger.error(f"❌ Ошибка получения клавиатуры для оповещения {ticker}: {e}")
+            logger.error("❌ Ошибка получения клавиатуры для оповещения %s: %s", ticker, e)
             return types.InlineKeyboardMarkup()
 
     def _get_overheat_keyboard(self, ticker: str):
@@ -655,9 +1529,20 @@ class TelegramPanickerBot:
         try:
             return inline_keyboards.get_overheat_keyboard(ticker)
         except Exception as e:
-            logger.error(f"❌ Ошибка получения клавиатуры для {ticker}: {e}")
+            logger.error("❌ Ошибка получения клавиатуры для %s: %s", ticker, e)
             return types.InlineKeyboardMarkup()
 
+    @staticmethod
+    def _classify_level(level: str) -> Optional[str]:
+        """Группа уровня по маркерам (для уровней вне LEVEL_BUCKETS)"""
+        match = _LEVEL_MARKER_RE.search(level.upper())
+        return _LEVEL_MARKER_GROUPS[match.group()] if match else None
+
+    @staticmethod
+    def _risk_bucket(risk: float) -> int:
+        """Индекс уровня риска в _RISK_ICONS / _RISK_LABELS"""
+        return bisect_right(_RISK_THRESHOLDS, risk)
+
     def _calculate_stats_from_signals(self, signals: List) -> Dict[str, Any]:
         """Расчёт статистики из списка сигналов (PanicSignal или dict)"""
         try:
@@ -674,55 +1559,45 @@ class TelegramPanickerBot:
                     'market_tension': '🟢 СПОКОЙНО'
                 }
 
-            # Счётчики
-            total = 0
-            strong = 0
-            moderate = 0
-            urgent = 0
-
-            # Счётчик по тикерам
-            ticker_counts = {}
-
-            for signal in signals:
-                # Извлекаем данные в зависимости от типа
-                if hasattr(signal, 'level'):
-                    level = signal.level
-                    ticker = signal.ticker
-                elif isinstance(signal, dict):
-                    level = signal.get('level', '')
-                    ticker = signal.get('ticker', '')
-                else:
-                    continue
+            # Тип сигналов определяем один раз по первому элементу,
+            # дальше каждый список разбирается своим специализированным проходом
+            first = signals[0]
+            if isinstance(first, dict):
+                rows = [
+                    (signal.get('level', ''), signal.get('ticker', ''))
+                    for signal in signals if isinstance(signal, dict)
+                ]
+            else:
+                # У PanicSignal уровень хранится в final_level
+                get_fields = attrgetter('level' if hasattr(first, 'level') else 'final_level', 'ticker')
+                rows = [get_fields(signal) for signal in signals if not isinstance(signal, dict)]
 
-                total += 1
+            total = len(rows)
 
-                # Считаем по уровням
-                level_upper = level.upper()
-                if '🔴' in level_upper or 'STRONG' in level_upper:
-                    strong += 1
-                elif '🟡' in level_upper or 'MODERATE' in level_upper:
-                    moderate += 1
-                elif '⚪' in level_upper or 'URGENT' in level_upper:
-                    urgent += 1
+            # Считаем по уровням: классифицируем только уникальные уровни
+            level_counts = Counter()
+            for level, count in Counter(level for level, _ in rows).items():
+                if level in LEVEL_BUCKETS:
+                    bucket = LEVEL_BUCKETS[level]
+                else:
+                    bucket = self._classify_level(level)
+                level_counts[bucket] += count
 
-                # Считаем по тикерам
-                if ticker:
-                    ticker_counts[ticker] = ticker_counts.get(ticker, 0) + 1
+            # Считаем по тикерам
+            ticker_counts = Counter(ticker for _, ticker in rows if ticker)
 
             # Находим самый активный и самый спокойный тикер
-            most_active = 'НЕТ'
-            most_active_count = 0
-            most_calm = 'НЕТ'
-            most_calm_count = float('inf')
-
-            for ticker, count in ticker_counts.items():
-                if count > most_active_count:
-                    most_active = ticker
-                    most_active_count = count
+            # (проход по уникальным тикерам, при равенстве - первый встреченный)
+            if ticker_counts:
+                most_active, most_active_count = max(ticker_counts.items(), key=itemgetter(1))
+                most_calm, most_calm_count = min(ticker_counts.items(), key=itemgetter(1))
+            else:
+                most_active, most_active_count = 'НЕТ', 0
+                most_calm, most_calm_count = 'НЕТ', float('inf')
 
-                if count < most_calm_count:
-                    most_calm = ticker
-                    most_calm_count = count
+            strong = level_counts['strong']
+            moderate = level_counts['moderate']
+            urgent = level_counts['urgent']
 
             # Определяем общую напряжённость
             if total == 0:
@@ -747,7 +1622,7 @@ class TelegramPanickerBot:
             }
 
         except Exception as e:
-            logger.error(f"❌ Ошибка расчёта статистики: {e}")
+            logger.error("❌ Ошибка расчёта статистики: %s", e)
             return {
                 'total_signals': 0,
                 'strong_signals': 0,
@@ -776,241 +1651,144 @@ class TelegramPanickerBot:
             next_trading_day = self.market_calendar.get_next_trading_day()
             next_event = f"Следующий торговый день: {next_trading_day.strftime('%d.%m.%Y')}"
 
-            welcome_text = (
-                f"🤖 **ПАНИКЁР 3000** | v1.0\n"
-                f"Отряд контроля рыночной паники\n"
-                f"━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-                f"Статус: 🟢 АКТИВЕН\n"
-                f"Биржа: {exchange_status} ({reason})\n"
-                f"Следующее событие: {next_event}\n"
-                f"Последняя проверка: только что\n\n"
-                f"📋 **БЫСТРЫЙ ДОСТУП:**\n"
-                f"[📊 КАРТА ПАНИКИ] - тепловая карта\n"
-                f"[📊 ИНДЕКС ПЕРЕГРЕВА] - HP-бар акции\n"
-                f"[📈 СЕГОДНЯШНИЕ ИСТЕРИКИ] - список\n"
-                f"[📊 СТАТИСТИКА ЗА НЕДЕЛЮ] - точность\n"
-                f"[⚙️ НАСТРОЙКИ ПАНИКИ] - пороги\n"
-                f"[❓ КАК РАБОТАЕТ] - инструкция\n\n"
-                f"🔧 **СЛУЖЕБНЫЕ КОМАНДЫ:**\n"
-                f"/overheat [ТИКЕР] -- индекс перегрева\n"
-                f"/panicmap - карта активности\n"
-                f"/today - все сигналы сегодня\n"
-                f"/stats - статистика\n"
-                f"/extreme - самые сильные сигналы\n"
-                f"/alerts on/off - вкл/выкл уведомления\n"
-                f"/startscan - возобновить сканирование\n"
-                f"━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-                f"🔔 Автооповещения: ВКЛ\n"
-                f"📅 Сигналов сегодня: проверьте /today"
+            welcome_text = _WELCOME_TEMPLATE.format(
+                exchange_status=exchange_status,
+                reason=reason,
+                next_event=next_event
             )
 
-            self.bot.reply_to(message, welcome_text, parse_mode='Markdown')
+            self._reply(message, welcome_text, parse_mode='Markdown')
 
         except Exception as e:
-            logger.error(f"❌ Ошибка в /start: {e}")
-            self.bot.reply_to(message, f"❌ Ошибка: {str(e)[:100]}")
+            logger.error("❌ Ошибка в /start: %s", e)
+            self._reply(message, f"❌ Ошибка: {str(e)[:100]}")
 
     def command_today(self, message):
         """Обработчик команды /today - сигналы за сегодня с риск-метриками"""
         try:
-            # Получаем сигналы через gRPC
-            signals_data = self.grpc_client.get_top_signals(period='today', limit=10)
+            # Получаем сигналы через gRPC (одновременные запросы объединяются клиентом)
+            # Топ сигналов клиент отдаёт плоскими словарями с одним набором ключей
+            signals = self._today_signals_future().result(timeout=GRPC_REQUEST_TIMEOUT)[:10]
 
-            if signals_data:
-                # Конвертируем в PanicSignal если нужно
-                signals = []
-                for signal_data in signals_data:
-                    if isinstance(signal_data, dict) and PanicSignal:
-                        try:
-                            signal = PanicSignal(**signal_data)
-                            signals.append(signal)
-                        except Exception as e:
-                            logger.warning(f"Не удалось создать PanicSignal: {e}")
-                            signals.append(signal_data)
-                    else:
-                        signals.append(signal_data)
-
-                text = "📅 **СИГНАЛЫ ЗА СЕГОДНЯ**\n\n"
-
-                # Сортируем по времени (новые сверху)
-                def get_detected_at(signal):
-                    if hasattr(signal, 'detected_at'):
-                        return signal.detected_at
-                    elif isinstance(signal, dict):
-                        return signal.get('detected_at', '')
-                    return ''
-
-                signals_sorted = sorted(
-                    signals,
-                    key=get_detected_at,
-                    reverse=True
-                )
+            if signals:
+                parts = ["📅 **СИГНАЛЫ ЗА СЕГОДНЯ**\n\n"]
 
-                for i, signal in enumerate(signals_sorted[:5], 1):
-                    # Извлекаем данные в зависимости от типа
-                    if hasattr(signal, 'detected_at'):
-                        time_str = signal.detected_at[:5] if signal.detected_at else '--:--'
-                        ticker = signal.ticker
-                        level = signal.level
-                        rsi = signal.rsi_14
-                        volume = signal.volume_ratio
-                        risk = signal.risk_metric
-                        signal_type = signal.signal_type
-                    elif isinstance(signal, dict):
-                        time_str = signal.get('detected_at', '--:--')[:5]
-                        ticker = signal.get('ticker', '---')
-                        level = signal.get('level', '⚪')
-                        rsi = signal.get('rsi_14', 0)
-                        volume = signal.get('volume_ratio', 0)
-                        risk = signal.get('risk_metric')
-                        signal_type = signal.get('signal_type', '')
-                    else:
-                        continue
+                # Сортируем по времени (новые сверху); результат общий для
+                # объединённых запросов, поэтому сортируем копию
+                signals_sorted = sorted(signals, key=_SIGNAL_DETECTED_AT, reverse=True)
 
-                    text += f"{i}. {time_str} {level} **{ticker}**"
+                for i, signal in enumerate(signals_sorted[:5], 1):
+                    time_str = _signal_time(signal['detected_at'])
+                    ticker = signal['ticker']
+                    level = signal['level']
+                    rsi = signal['rsi_14']
+                    volume = signal['volume_ratio']
+                    risk = signal['risk_metric']
+                    signal_type = signal['signal_type']
 
-                    if signal_type:
-                        text += f" ({signal_type})\n"
-                    else:
-                        text += "\n"
+                    parts.append(f"{i}. {time_str} {level} **{ticker}**")
+                    parts.append(f" ({signal_type})\n" if signal_type else "\n")
 
                     # Добавляем риск-метрику кратко
                     if risk is not None:
-                        if risk >= 70:
-                            risk_icon = "🔴"
-                        elif risk >= 40:
-                            risk_icon = "🟡"
-                        else:
-                            risk_icon = "🟢"
-
-                        text += f"   {risk_icon} Риск: {risk:.1f} | RSI: {rsi:.1f} | Объём: {volume:.1f}×\n"
+                        risk_icon = _RISK_ICONS[self._risk_bucket(risk)]
+
+                        parts.append(f"   {risk_icon} Риск: {risk:.1f} | RSI: {rsi:.1f} | Объём: {volume:.1f}×\n")
                     else:
-                        text += f"   RSI: {rsi:.1f} | Объём: {volume:.1f}×\n"
+                        parts.append(f"   RSI: {rsi:.1f} | Объём: {volume:.1f}×\n")
 
-                    text += "\n"  # Разделитель
+                    parts.append("\n")  # Разделитель
 
-                text += f"📊 **Всего сигналов:** {len(signals)}\n"
-                text += "━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-                text += "🔥 Самые сильные: /extreme\n"
-                text += "📈 Статистика: /stats\n"
-                text += "🌡️ Проверить акцию: /overheat [тикер]"
+                parts.append(f"📊 **Всего сигналов:** {len(signals)}\n")
+                parts.append(_SEPARATOR)
+                parts.append(
+                    "🔥 Самые сильные: /extreme\n"
+                    "📈 Статистика: /stats\n"
+                    "🌡️ Проверить акцию: /overheat [тикер]"
+                )
+                text = "".join(parts)
 
             else:
-                text = "📅 **СИГНАЛЫ ЗА СЕГОДНЯ**\n\nНет сигналов за сегодня\n\n"
-                text += "Следующая проверка в 10:00"
+                text = (
+                    "📅 **СИГНАЛЫ ЗА СЕГОДНЯ**\n\nНет сигналов за сегодня\n\n"
+                    "Следующая проверка в 10:00"
+                )
 
-            self.bot.reply_to(message, text, parse_mode='Markdown')
+            self._reply(message, text, parse_mode='Markdown')
 
         except Exception as e:
-            logger.error(f"❌ Ошибка в /today: {e}")
-            self.bot.reply_to(message, "❌ Ошибка получения данных")
+            logger.error("❌ Ошибка в /today: %s", e)
+            self._reply(message, "❌ Ошибка получения данных")
 
     def command_extreme(self, message):
         """Обработчик команды /extreme - самые сильные сигналы"""
         try:
-            # Получаем топ сигналы через gRPC
-            signals_data = self.grpc_client.get_top_signals(period='today', limit=3)
+            # Получаем топ сигналы через gRPC (одновременные запросы объединяются клиентом)
+            signals_data = self._today_signals_future().result(timeout=GRPC_REQUEST_TIMEOUT)[:3]
 
             if signals_data:
-                text = "🔥 **САМЫЕ СИЛЬНЫЕ СИГНАЛЫ**\n\n"
+                parts = ["🔥 **САМЫЕ СИЛЬНЫЕ СИГНАЛЫ**\n\n"]
                 medals = ['🥇', '🥈', '🥉']
 
-                for i, signal_data in enumerate(signals_data):
+                for i, signal in enumerate(signals_data):
                     medal = medals[i] if i < len(medals) else f"{i + 1}."
 
-                    # Конвертируем в PanicSignal если нужно
-                    if isinstance(signal_data, dict) and PanicSignal:
-                        try:
-                            signal = PanicSignal(**signal_data)
-                        except Exception as e:
-                            logger.warning(f"Не удалось создать PanicSignal: {e}")
-                            signal = signal_data
-                    else:
-                        signal = signal_data
-
-                    # Извлекаем данные в зависимости от типа
-                    if hasattr(signal, 'ticker'):
-                        ticker = signal.ticker
-                        level = signal.level
-                        rsi = signal.rsi_14
-                        volume = signal.volume_ratio
-                        risk = signal.risk_metric
-                        clusters = signal.volume_clusters
-                        signal_type = signal.signal_type
-                        base_level = signal.base_level
-                        final_level = signal.final_level
-                    elif isinstance(signal, dict):
-                        ticker = signal.get('ticker', '---')
-                        level = signal.get('level', '⚪')
-                        rsi = signal.get('rsi_14', 0)
-                        volume = signal.get('volume_ratio', 0)
-                        risk = signal.get('risk_metric')
-                        clusters = signal.get('volume_clusters', [])
-                        signal_type = signal.get('signal_type', '')
-                        base_level = signal.get('base_level', '')
-                        final_level = signal.get('final_level', '')
-                    else:
-                        continue
+                    # Топ сигналов клиент отдаёт плоскими словарями
+                    ticker = signal['ticker']
+                    level = signal['level']
+                    rsi = signal['rsi_14']
+                    volume = signal['volume_ratio']
+                    risk = signal['risk_metric']
+                    clusters = signal['volume_clusters']
+                    signal_type = signal['signal_type']
+                    base_level = signal.get('base_level', '')
+                    final_level = signal.get('final_level', '')
 
                     # Базовая информация
                     type_emoji = "📉" if "ПАНИКА" in signal_type.upper() else "📈" if "ЖАДНОСТЬ" in signal_type.upper() else "📊"
-                    text += f"{medal} {type_emoji} {level} **{ticker}**\n"
-                    text += f"   📊 RSI: {rsi:.1f} | 📈 Объём: {volume:.1f}×\n"
+                    parts.append(f"{medal} {type_emoji} {level} **{ticker}**\n")
+                    parts.append(f"   📊 RSI: {rsi:.1f} | 📈 Объём: {volume:.1f}×\n")
 
                     # Информация об уровнях
                     if base_level:
                         level_info = f"Уровень: {base_level}"
                         if final_level and final_level != base_level:
                             level_info += f" → {final_level}"
-                        text += f"   🎯 {level_info}\n"
+                        parts.append(f"   🎯 {level_info}\n")
 
                     # РИСК-МЕТРИКА
                     if risk is not None:
-                        if risk >= 70:
-                            risk_emoji = "🔴"
-                            risk_text = "ВЫСОКИЙ"
-                        elif risk >= 40:
-                            risk_emoji = "🟡"
-                            risk_text = "СРЕДНИЙ"
-                        else:
-                            risk_emoji = "🟢"
-                            risk_text = "НИЗКИЙ"
-
-                        text += f"   {risk_emoji} Риск: {risk:.1f}/100 ({risk_text})\n"
+                        bucket = self._risk_bucket(risk)
+                        risk_emoji = _RISK_ICONS[bucket]
+                        risk_text = _RISK_LABELS[bucket]
+
+                        parts.append(f"   {risk_emoji} Риск: {risk:.1f}/100 ({risk_text})\n")
 
                     # КЛАСТЕРЫ ОБЪЁМА (шаг 9 алгоритма)
-                    if clusters and len(clusters) > 0:
+                    if clusters:
                         # Находим самый значимый кластер
-                        if isinstance(clusters[0], dict):
-                            main_cluster = max(clusters, key=lambda x: x.get('volume_percentage', 0))
-                            price = main_cluster.get('price_level', 0)
-                            percentage = main_cluster.get('volume_percentage', 0)
-                            role = main_cluster.get('role', '')
-                        else:
-                            # Предполагаем, что это Pydantic модели кластеров
-                            main_cluster = max(clusters, key=lambda x: x.volume_percentage)
-                            price = main_cluster.price_level
-                            percentage = main_cluster.volume_percentage
-                            role = main_cluster.role
-
-                        role_icon = "🟢" if role == 'support' else "🔴" if role == 'resistance' else "📍"
-                        text += f"   {role_icon} Ключевой уровень: {price:.2f}₽ ({percentage:.1f}% объёма)\n"
-
-                    text += "\n"  # Разделитель между сигналами
+                        main_cluster = max(clusters, key=_CLUSTER_SHARE_ITEM)
+                        price, percentage, role = _CLUSTER_FIELDS(main_cluster)
+
+                        role_icon = _ROLE_ICONS.get(role, "📍")
+                        parts.append(f"   {role_icon} Ключевой уровень: {price:.2f}₽ ({percentage:.1f}% объёма)\n")
+
+                    parts.append("\n")  # Разделитель между сигналами
 
                 # Добавляем подпись
-                text += "━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-                text += "📋 Все сигналы: /today\n"
-                text += "📈 Статистика: /stats"
+                parts.append(_SEPARATOR)
+                parts.append("📋 Все сигналы: /today\n")
+                parts.append("📈 Статистика: /stats")
+                text = "".join(parts)
 
             else:
                 text = "🔥 **САМЫЕ СИЛЬНЫЕ СИГНАЛЫ**\n\nНет сигналов за сегодня"
 
-            self.bot.reply_to(message, text, parse_mode='Markdown')
+            self._reply(message, text, parse_mode='Markdown')
 
         except Exception as e:
-            logger.error(f"❌ Ошибка в /extreme: {e}")
-            self.bot.reply_to(message, "❌ Ошибка получения данных")
+            logger.error("❌ Ошибка в /extreme: %s", e)
+            self._reply(message, "❌ Ошибка получения данных")
 
     # ------------------------------------------------------------------------
     # ВСПОМОГАТЕЛЬНЫЕ МЕТОДЫ
@@ -1025,8 +1803,10 @@ class TelegramPanickerBot:
             reason_message: Текстовое объяснение статуса
         """
         try:
-            # Используем MarketCalendar для проверки
-            is_open, reason = self.market_calendar.is_market_open_now()
+            # Используем MarketCalendar для проверки (ошибки не кешируются)
+            is_open, reason = self.market_status_cache.get_or_call(
+                'market_open', self.market_calendar.is_market_open_now
+            )
 
             if not is_open:
                 return False, f"Биржа закрыта: {reason}"
@@ -1035,8 +1815,8 @@ class TelegramPanickerBot:
             return True, "Биржа открыта, сканирование разрешено"
 
         except Exception as e:
-            logger.error(f"❌ Ошибка проверки времени биржи: {e}")
-            return False, f"Ошибка проверки статуса биржи: {str(e)[:50]}"
+            logger.error("❌ Ошибка проверки времени биржи: %s", e)
+            return False, f"Ошибка проверки статуса биржи: {_escape_legacy_markdown(str(e)[:50])}"
 
     def command_startscan(self, message):
         """Обработчик команды /startscan - запустить сканирование"""
@@ -1046,39 +1826,28 @@ class TelegramPanickerBot:
 
             if not can_scan:
                 # Если биржа закрыта, сообщаем пользователю
-                self.bot.reply_to(
+                self._reply(
                     message,
-                    f"⏰ **СКАНИРОВАНИЕ НЕВОЗМОЖНО**\n\n"
-                    f"{scan_reason}\n\n"
-                    f"Сканирование запускается только в рабочие часы биржи.\n"
-                    f"Текущий статус биржи: /status\n"
-                    f"Биржа работает: пн-пт, 10:00-18:30 МСК",
+                    _SCAN_CLOSED_TEMPLATE.format(scan_reason=scan_reason),
                     parse_mode='Markdown'
                 )
                 return  # Прекращаем выполнение
 
-            # Если биржа открыта, запускаем сканирование через gRPC
-            signals_data = self.grpc_client.scan_tickers(self.default_tickers)
+            # Если биржа открыта, сканируем все тикеры одним запросом gRPC
+            signals_data = self._scan_tickers_batch(self.default_tickers)
+
+            # После сканирования /today и остальные должны видеть свежие данные
+            self.signals_cache.clear()
 
             # Конвертируем сигналы в PanicSignal если нужно
-            panic_signals = []
-            if signals_data:
-                for signal_data in signals_data:
-                    if isinstance(signal_data, dict) and PanicSignal:
-                        try:
-                            signal = PanicSignal(**signal_data)
-                            panic_signals.append(signal)
-
-                            # Отправляем автооповещение для сильных сигналов
-                            if '🔴' in signal.level:
-                                self.send_panic_alert(signal)
-                        except Exception as e:
-                            logger.warning(f"Не удалось создать PanicSignal: {e}")
-                            panic_signals.append(signal_data)
-                    else:
-                        panic_signals.append(signal_data)
+            panic_signals = [self._as_panic_signal(signal_data) for signal_data in signals_data or ()]
 
-            self.bot.reply_to(
+            # Отправляем автооповещение для сильных сигналов
+            for signal in panic_signals:
+                if PanicSignal and isinstance(signal, PanicSignal) and signal.final_level == 'red':
+                    self._telegram_pool.submit(self.send_panic_alert, signal)
+
+            self._reply(
                 message,
                 f"🔍 **СКАНИРОВАНИЕ ЗАПУЩЕНО**\n\n"
                 f"Проверено: {len(self.default_tickers)} тикеров\n"
@@ -1090,32 +1859,20 @@ class TelegramPanickerBot:
             )
 
         except Exception as e:
-            logger.error(f"❌ Ошибка в /startscan: {e}")
-            self.bot.reply_to(message, "❌ Ошибка запуска сканирования")
+            logger.error("❌ Ошибка в /startscan: %s", e)
+            self._reply(message, "❌ Ошибка запуска сканирования")
 
     # ------------------------------------------------------------------------
     # ПРОСТЫЕ КОМАНДЫ
     # ------------------------------------------------------------------------
     def command_help(self, message):
-        help_text = (
-            "📖 **СПРАВКА ПО КОМАНДАМ**\n\n"
-            "• /overheat [тикер] - индекс перегрева акции\n"
-            "• /today - все сигналы за сегодня\n"
-            "• /extreme - самые сильные сигналы\n"
-            "• /startscan - запустить сканирование\n"
-            "• /stats - статистика за неделю\n"
-            "• /panicmap - карта паники\n"
-            "• /alerts on/off - управление уведомлениями\n"
-            "• /status - статус системы\n"
-            "• /help - эта справка"
-        )
-        self.bot.reply_to(message, help_text, parse_mode='Markdown')
+        self._reply(message, _HELP_TEXT, parse_mode='Markdown')
 
     def command_stats(self, message):
         """Обработчик команды /stats - статистика за неделю"""
         try:
-            # Получаем статистику через gRPC
-            stats_data = self.grpc_client.get_stats(days=7)
+            # Получаем статистику через gRPC (одновременные запросы объединяются клиентом)
+            stats_data = self._stats_future(7).result(timeout=GRPC_REQUEST_TIMEOUT)
 
             # Если stats_data - это список сигналов, конвертируем в статистику
             if isinstance(stats_data, list) and PanicSignal:
@@ -1139,40 +1896,41 @@ class TelegramPanickerBot:
                 }
 
             # Формируем сообщение согласно плану проекта
-            text = "📊 **СТАТИСТИКА ЗА ПОСЛЕДНИЕ 7 ДНЕЙ**\n\n"
+            parts = ["📊 **СТАТИСТИКА ЗА ПОСЛЕДНИЕ 7 ДНЕЙ**\n\n"]
 
             # Основная статистика
-            text += f"Всего сигналов: {stats.get('total_signals', 0)}\n"
-            text += f"🔴 Сильных: {stats.get('strong_signals', 0)}\n"
-            text += f"🟡 Умеренных: {stats.get('moderate_signals', 0)}\n"
-            text += f"⚪ Срочных: {stats.get('urgent_signals', 0)}\n\n"
+            parts.append(f"Всего сигналов: {stats.get('total_signals', 0)}\n")
+            parts.append(f"🔴 Сильных: {stats.get('strong_signals', 0)}\n")
+            parts.append(f"🟡 Умеренных: {stats.get('moderate_signals', 0)}\n")
+            parts.append(f"⚪ Срочных: {stats.get('urgent_signals', 0)}\n\n")
 
             # Активные акции
-            text += f"🏆 **САМАЯ АКТИВНАЯ:** {stats.get('most_active_ticker', 'НЕТ')} ({stats.get('most_active_count', 0)} сигналов)\n"
-            text += f"😌 **САМЫЙ СПОКОЙНЫЙ:** {stats.get('most_calm_ticker', 'НЕТ')} ({stats.get('most_calm_count', 0)} сигналов)\n\n"
+            parts.append(f"🏆 **САМАЯ АКТИВНАЯ:** {stats.get('most_active_ticker', 'НЕТ')} ({stats.get('most_active_count', 0)} сигналов)\n")
+            parts.append(f"😌 **САМЫЙ СПОКОЙНЫЙ:** {stats.get('most_calm_ticker', 'НЕТ')} ({stats.get('most_calm_count', 0)} сигналов)\n\n")
 
             # Напряжённость рынка
-            text += f"📊 **ОБЩАЯ НАПРЯЖЁННОСТЬ:** {stats.get('market_tension', '⚪ НЕИЗВЕСТНО')}\n"
-            text += f"(по шкале от 🟢 спокойно до 🔴 паника)\n\n"
+            parts.append(f"📊 **ОБЩАЯ НАПРЯЖЁННОСТЬ:** {stats.get('market_tension', '⚪ НЕИЗВЕСТНО')}\n")
+            parts.append(f"(по шкале от 🟢 спокойно до 🔴 паника)\n\n")
 
             # Информация о данных
             if stats.get('total_signals', 0) == 0:
-                text += "ℹ️ *В базе данных пока нет сигналов.*\n"
-                text += "*Статистика появится после обнаружения первых сигналов.*\n\n"
+                parts.append("ℹ️ *В базе данных пока нет сигналов.*\n")
+                parts.append("*Статистика появится после обнаружения первых сигналов.*\n\n")
 
             # Навигация
-            text += "━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-            text += "📅 Сегодняшние сигналы: /today\n"
-            text += "🔥 Самые сильные: /extreme\n"
-            text += "🗺️ Карта паники: /panicmap"
+            parts.append(_SEPARATOR)
+            parts.append("📅 Сегодняшние сигналы: /today\n")
+            parts.append("🔥 Самые сильные: /extreme\n")
+            parts.append("🗺️ Карта паники: /panicmap")
+            text = "".join(parts)
 
-            self.bot.reply_to(message, text, parse_mode='Markdown')
+            self._reply(message, text, parse_mode='Markdown')
 
-            logger.info(f"📊 Команда /stats выполнена: {stats.get('total_signals', 0)} сигналов")
+            logger.info("📊 Команда /stats выполнена: %s сигналов", stats.get('total_signals', 0))
 
         except Exception as e:
-            logger.error(f"❌ Ошибка в команде /stats: {e}")
-            self.bot.reply_to(
+            logger.error("❌ Ошибка в команде /stats: %s", e)
+            self._reply(
                 message,
                 "❌ **ОШИБКА ПОЛУЧЕНИЯ СТАТИСТИКИ**\n\n"
                 "Не удалось получить данные. Попробуйте позже.",
@@ -1182,49 +1940,33 @@ class TelegramPanickerBot:
     def command_panicmap(self, message):
         """Обработчик команды /panicmap - тепловая карта паники за сегодня"""
         try:
-            # Получаем сегодняшние сигналы
-            signals_data = self.grpc_client.get_top_signals(period='today', limit=50)
+            # Сигналы и статистика за сегодня: оба запроса уходят одним пакетом
+            signals_future, stats_future = self._today_signals_future(), self._stats_future(1)
+            signals_data = signals_future.result(timeout=GRPC_REQUEST_TIMEOUT)
+            day_stats = stats_future.result(timeout=GRPC_REQUEST_TIMEOUT)
 
             # Если нет сигналов
             if not signals_data:
-                self.bot.reply_to(
-                    message,
-                    "🗺️ **КАРТА ПАНИКИ**\n\n"
-                    "Сегодня сигналов не обнаружено.\n\n"
-                    "━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-                    "📊 Статистика: /stats\n"
-                    "📅 Сегодняшние: /today",
-                    parse_mode='Markdown'
-                )
+                self._reply(message, _PANICMAP_EMPTY_TEXT, parse_mode='Markdown')
                 return
 
-            # Конвертируем в PanicSignal если нужно
-            signals = []
-            for signal_data in signals_data:
-                if isinstance(signal_data, dict) and PanicSignal:
-                    try:
-                        signal = PanicSignal(**signal_data)
-                        signals.append(signal)
-                    except Exception as e:
-                        logger.warning(f"Не удалось создать PanicSignal для карты: {e}")
-                        signals.append(signal_data)
-                else:
-                    signals.append(signal_data)
+            signals = signals_data
 
             # СОЗДАЁМ РЕАЛЬНЫЕ ДАННЫЕ ДЛЯ КАРТЫ ПАНИКИ
             heatmap_data = self._create_real_heatmap_data(signals)
+            heatmap_data['stats'] = day_stats
 
             # Формируем ASCII карту
             panic_map_text = self._create_panic_map_ascii(heatmap_data)
 
             # Отправляем сообщение
-            self.bot.reply_to(message, panic_map_text, parse_mode='Markdown')
+            self._reply(message, panic_map_text, parse_mode='Markdown')
 
-            logger.info(f"🗺️ Команда /panicmap выполнена: {len(signals)} сигналов")
+            logger.info("🗺️ Команда /panicmap выполнена: %s сигналов", len(signals))
 
         except Exception as e:
-            logger.error(f"❌ Ошибка в команде /panicmap: {e}")
-            self.bot.reply_to(
+            logger.error("❌ Ошибка в команде /panicmap: %s", e)
+            self._reply(
                 message,
                 "❌ **ОШИБКА СОЗДАНИЯ КАРТЫ ПАНИКИ**\n\n"
                 "Не удалось построить карту. Попробуйте позже.",
@@ -1233,103 +1975,62 @@ class TelegramPanickerBot:
 
     def _create_real_heatmap_data(self, signals):
         """Создание реальных данных для карты паники из полученных сигналов"""
-        from datetime import datetime
-        import collections
-
-        # Определяем временные интервалы (10, 12, 14, 16, 18)
-        hours = [10, 12, 14, 16, 18]
-
-        # Собираем тикеры из сигналов
-        tickers = []
-        for signal in signals:
-            if hasattr(signal, 'ticker') and signal.ticker:
-                tickers.append(signal.ticker)
-            elif isinstance(signal, dict):
-                ticker = signal.get('ticker')
-                if ticker:
-                    tickers.append(ticker)
-
-        tickers = list(set(tickers))
-        tickers.sort()
-
-        # Инициализируем пустую карту
-        heatmap = {ticker: {hour: '⚪' for hour in hours} for ticker in tickers}
-
-        # Заполняем карту реальными сигналами
-        for signal in signals:
-            # Извлекаем тикер в зависимости от типа
-            if hasattr(signal, 'ticker'):
-                ticker = signal.ticker
-                detected_at = signal.detected_at
-                level = signal.level
-                signal_type = signal.signal_type
-            elif isinstance(signal, dict):
-                ticker = signal.get('ticker')
-                detected_at = signal.get('detected_at', '')
-                level = signal.get('level', '')
-                signal_type = signal.get('signal_type', '')
-            else:
-                continue
+        hours = list(HEATMAP_HOURS)
+
+        # Один проход по сигналам: параллельные столбцы для таблицы
+        frame = pd.DataFrame(
+            [
+                (signal['ticker'], signal['detected_at'], signal['level'], signal['signal_type'])
+                for signal in signals if signal['ticker']
+            ],
+            columns=['ticker', 'detected_at', 'level', 'signal_type']
+        )
 
-            if not ticker:
-                continue
+        tickers = sorted(frame['ticker'].unique())
+        priorities = np.zeros((len(tickers), len(hours)), dtype=np.int8)
 
-            # Получаем время сигнала
-            try:
-                # Пробуем разные форматы времени
-                dt = None
-                if detected_at:
-                    if 'T' in detected_at:
-                        dt = datetime.fromisoformat(detected_at.replace('Z', '+00:00'))
-                    elif ' ' in detected_at:
-                        dt = datetime.strptime(detected_at, '%Y-%m-%d %H:%M:%S')
-                    elif len(detected_at) == 5:  # Формат HH:MM
-                        today = datetime.now()
-                        dt = datetime(today.year, today.month, today.day,
-                                      int(detected_at[:2]), int(detected_at[3:]))
-
-                if not dt:
-                    continue
+        if not frame.empty:
+            # Час сигнала из 'HH:MM', 'YYYY-MM-DD HH:MM:SS' или ISO-формата
+            frame['hour'] = pd.to_numeric(
+                frame['detected_at'].str.extract(_HEATMAP_HOUR_PATTERN, expand=False),
+                errors='coerce'
+            )
+            frame = frame.dropna(subset=['hour'])
 
-                # Определяем час для карты (ближайший из hours)
-                hour = dt.hour
-                # Находим ближайший час из нашего списка
-                closest_hour = min(hours, key=lambda x: abs(x - hour))
-
-                # Определяем эмодзи по уровню сигнала
-                level_upper = level.upper()
-                if '🔴' in level_upper or 'STRONG' in level_upper:
-                    emoji = '🔴'
-                elif '🟡' in level_upper or 'MODERATE' in level_upper:
-                    emoji = '🟡'
-                elif '⚪' in level_upper or 'URGENT' in level_upper:
-                    emoji = '⚪'
-                else:
-                    emoji = '⚪'
-
-                # Определяем цвет по типу сигнала (дополнительная информация)
-                # Паника = красный, Жадность = оранжевый
-                signal_type_upper = signal_type.upper()
-                if 'ПАНИКА' in signal_type_upper or 'PANIC' in signal_type_upper:
-                    color = '🔴'
-                elif 'ЖАДНОСТЬ' in signal_type_upper or 'GREED' in signal_type_upper:
-                    color = '🟠'  # Оранжевый для жадности
-                else:
-                    color = emoji  # Используем стандартный цвет
+            # Ближайший час карты (при равенстве - более ранний, как у min):
+            # на равномерной сетке это целочисленное деление и обрезка краёв
+            frame['bucket'] = np.clip(
+                (frame['hour'].to_numpy() - HEATMAP_HOURS[0]) // HEATMAP_HOUR_STEP,
+                0, len(hours) - 1
+            )
 
-                # Обновляем карту (берем самый сильный сигнал если их несколько)
-                current_emoji = heatmap[ticker][closest_hour]
-                # Приоритет: 🔴 > 🟠 > 🟡 > ⚪
-                priority = {'🔴': 4, '🟠': 3, '🟡': 2, '⚪': 1}
-                current_priority = priority.get(current_emoji, 0)
-                new_priority = priority.get(color, 0)
+            # Приоритет: 🔴 паника > 🟠 жадность > уровень сигнала (🔴 > 🟡 > ⚪)
+            signal_type = frame['signal_type'].str.upper()
+            level = frame['level'].str.upper()
+            frame['priority'] = np.select(
+                [
+                    signal_type.str.contains('ПАНИКА|PANIC'),
+                    signal_type.str.contains('ЖАДНОСТЬ|GREED'),
+                    level.str.contains('🔴|STRONG'),
+                    level.str.contains('🟡|MODERATE'),
+                ],
+                [4, 3, 4, 2],
+                default=1
+            )
 
-                if new_priority > current_priority:
-                    heatmap[ticker][closest_hour] = color
+            # Самый сильный сигнал в каждой клетке карты
+            priorities = _reduce_heatmap(
+                pd.Categorical(frame['ticker'], categories=tickers).codes.astype(np.int32),
+                frame['bucket'].to_numpy(dtype=np.int32),
+                frame['priority'].to_numpy(dtype=np.int8),
+                len(tickers),
+                len(hours)
+            )
 
-            except Exception as e:
-                logger.debug(f"Не удалось обработать время сигнала: {detected_at}, ошибка: {e}")
-                continue
+        heatmap = {
+            ticker: {hour: _HEATMAP_PRIORITY_EMOJI[priority] for hour, priority in zip(hours, row)}
+            for ticker, row in zip(tickers, priorities.tolist())
+        }
 
         return {
             'tickers': tickers,
@@ -1342,15 +2043,15 @@ class TelegramPanickerBot:
         """Обработчик команды /report - ежедневный отчёт в формате из плана"""
         try:
             # Получаем текущую дату
-            from datetime import datetime
             today = datetime.now()
-            date_str = today.strftime('%d.%m.%Y')
 
-            # ПОЛУЧАЕМ РЕАЛЬНУЮ СТАТИСТИКУ ЧЕРЕЗ gRPC
-            stats = self.grpc_client.get_stats(days=1)  # Статистика за сегодня
+            # ПОЛУЧАЕМ СТАТИСТИКУ ЗА СЕГОДНЯ И ТОП-3 СИГНАЛА ОДНИМ ЗАПРОСОМ gRPC
+            stats_future, signals_future = self._stats_future(1), self._today_signals_future()
+            stats = stats_future.result(timeout=GRPC_REQUEST_TIMEOUT)
+            top_signals = signals_future.result(timeout=GRPC_REQUEST_TIMEOUT)[:3]
 
             if not stats:
-                self.bot.reply_to(
+                self._reply(
                     message,
                     "📊 **ЕЖЕДНЕВНЫЙ ОТЧЁТ**\n\n"
                     "Не удалось получить статистику за сегодня.\n"
@@ -1360,40 +2061,37 @@ class TelegramPanickerBot:
                 return
 
             # Формируем отчёт по шаблону из плана проекта
-            report_text = self._format_daily_report(stats, date_str)
+            report_text = self._format_daily_report(stats, today, top_signals)
 
             # Отправляем пользователю
-            self.bot.reply_to(message, report_text, parse_mode='Markdown')
+            self._reply(message, report_text, parse_mode='Markdown')
 
-            logger.info(f"📊 Команда /report выполнена для {date_str}")
+            logger.info("📊 Команда /report выполнена для %s", today.date())
 
         except Exception as e:
-            logger.error(f"❌ Ошибка в команде /report: {e}")
-            self.bot.reply_to(
+            logger.error("❌ Ошибка в команде /report: %s", e)
+            self._reply(
                 message,
                 "❌ **ОШИБКА ГЕНЕРАЦИИ ОТЧЁТА**\n\n"
                 "Не удалось сформировать ежедневный отчёт. Попробуйте позже.",
                 parse_mode='Markdown'
             )
 
-    def _format_daily_report(self, stats, date_str):
+    def _format_daily_report(self, stats, date_obj: datetime, top_signals=None):
         """Форматирование ежедневного отчёта по шаблону из плана проекта (раздел 4.4)"""
 
-        from datetime import datetime
-
-        # Получаем день недели на русском
-        date_obj = datetime.strptime(date_str, '%d.%m.%Y')
-        weekday_rus = ['Понедельник', 'Вторник', 'Среда', 'Четверг', 'Пятница', 'Суббота', 'Воскресенье']
-        weekday = weekday_rus[date_obj.weekday()]
+        # Дата и день недели на русском
+        date_str = date_obj.strftime('%d.%m.%Y')
+        weekday = _WEEKDAY_RUS[date_obj.weekday()]
 
         # Формируем отчёт ТОЧНО как в плане проекта
-        report = f"📊 **ЕЖЕДНЕВНЫЙ ОТЧЁТ ОТРЯДА ПАНИКЁРОВ**\n\n"
-        report += f"Дата: {date_str} | День недели: {weekday}\n"
-        report += "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n\n"
+        parts = ["📊 **ЕЖЕДНЕВНЫЙ ОТЧЁТ ОТРЯДА ПАНИКЁРОВ**\n\n"]
+        parts.append(f"Дата: {date_str} | День недели: {weekday}\n")
+        parts.append(_REPORT_SEPARATOR)
 
         # 1. Рыночный контекст (пока заглушка - потом заменим на реальные данные)
-        report += f"📈 **РЫНОЧНЫЙ КОНТЕКСТ:**\n"
-        report += f"• IMOEX: +0.8% (данные обновляются)\n\n"
+        parts.append(f"\n📈 **РЫНОЧНЫЙ КОНТЕКСТ:**\n")
+        parts.append(f"• IMOEX: +0.8% (данные обновляются)\n\n")
 
         # 2. Сигналы за день (реальные данные из gRPC)
         total_signals = stats.get('total_signals', 0)
@@ -1401,40 +2099,50 @@ class TelegramPanickerBot:
         moderate_signals = stats.get('moderate_signals', 0)
         urgent_signals = stats.get('urgent_signals', 0)
 
-        report += f"🚨 **СИГНАЛОВ ЗА ДЕНЬ:** {total_signals}\n"
-        report += f"• 🔴 КРАСНЫХ (сильных): {strong_signals}\n"
-        report += f"• 🟡 ЖЁЛТЫХ (умеренных): {moderate_signals}\n"
-        report += f"• ⚪ БЕЛЫХ (срочных): {urgent_signals}\n\n"
+        parts.append(f"🚨 **СИГНАЛОВ ЗА ДЕНЬ:** {total_signals}\n")
+        parts.append(f"• 🔴 КРАСНЫХ (сильных): {strong_signals}\n")
+        parts.append(f"• 🟡 ЖЁЛТЫХ (умеренных): {moderate_signals}\n")
+        parts.append(f"• ⚪ БЕЛЫХ (срочных): {urgent_signals}\n\n")
 
         # 3. Лидеры по активности (берём из stats или используем заглушку)
         most_active = stats.get('most_active_ticker', 'SBER')
         most_active_count = stats.get('most_active_count', 0)
 
-        report += f"🏆 **ЛИДЕРЫ ПО АКТИВНОСТИ:**\n"
-        report += f"1. {most_active} — {most_active_count} сигнала\n"
+        parts.append(f"🏆 **ЛИДЕРЫ ПО АКТИВНОСТИ:**\n")
+        parts.append(f"1. {most_active} — {most_active_count} сигнала\n")
 
         # Добавляем ещё 2 тикера если есть данные
         # (здесь можно добавить логику для получения топ-3 тикеров)
         if 'second_active' in stats:
-            report += f"2. {stats['second_active']} — {stats['second_active_count']} сигнала\n"
+            parts.append(f"2. {stats['second_active']} — {stats['second_active_count']} сигнала\n")
         if 'third_active' in stats:
-            report += f"3. {stats['third_active']} — {stats['third_active_count']} сигнала\n"
+            parts.append(f"3. {stats['third_active']} — {stats['third_active_count']} сигнала\n")
+
+        # Сильнейшие сигналы дня
+        if top_signals:
+            parts.append("\n🔥 **СИЛЬНЕЙШИЕ СИГНАЛЫ:**\n")
+            for i, signal in enumerate(top_signals, 1):
+                if isinstance(signal, dict):
+                    ticker, level = signal.get('ticker', '---'), signal.get('level', '')
+                else:
+                    ticker, level = signal.ticker, signal.final_level
+                parts.append(f"{i}. {level} {ticker}\n")
 
         # 4. Самые спокойные
         most_calm = stats.get('most_calm_ticker', 'GMKN')
-        report += f"\n😌 **САМЫЕ СПОКОЙНЫЕ:** {most_calm} (0 сигналов)\n\n"
+        parts.append(f"\n😌 **САМЫЕ СПОКОЙНЫЕ:** {most_calm} (0 сигналов)\n\n")
 
         # 5. Общая напряжённость
         market_tension = stats.get('market_tension', '🟡 УМЕРЕННАЯ')
-        report += f"📊 **ОБЩАЯ НАПРЯЖЁННОСТЬ:** {market_tension}\n"
-        report += f"(по шкале от 🟢 спокойно до 🔴 паника)\n\n"
+        parts.append(f"📊 **ОБЩАЯ НАПРЯЖЁННОСТЬ:** {market_tension}\n")
+        parts.append(f"(по шкале от 🟢 спокойно до 🔴 паника)\n\n")
 
         # 6. Заключение (как в плане)
-        report += "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-        report += "📈 Завтра снова на страже в 10:00!\n\n"
-        report += "ℹ️ Полная статистика в дашборде: http://localhost:8501"
+        parts.append(_REPORT_SEPARATOR)
+        parts.append("📈 Завтра снова на страже в 10:00!\n\n")
+        parts.append("ℹ️ Полная статистика в дашборде: http://localhost:8501")
 
-        return report
+        return "".join(parts)
 
     def _create_panic_map_ascii(self, heatmap_data):
         """Создание ASCII тепловой карты"""
@@ -1445,72 +2153,60 @@ class TelegramPanickerBot:
         date = heatmap_data['date']
 
         # Заголовок
-        text = f"🗺️ **КАРТА ПАНИКИ ЗА {date}**\n\n"
+        parts = [f"🗺️ **КАРТА ПАНИКИ ЗА {date}**\n\n"]
+
+        # Итоги дня из статистики, полученной вместе с сигналами
+        stats = heatmap_data.get('stats')
+        if stats:
+            parts.append(
+                f"Сигналов за день: {stats.get('total_signals', 0)} "
+                f"(🔴 {stats.get('strong_signals', 0)} | 🟡 {stats.get('moderate_signals', 0)})\n\n"
+            )
 
         # Шапка с часами
         header = "      " + "   ".join(str(h).rjust(2) for h in hours)
-        text += f"`{header}`\n\n"
+        parts.append(f"`{header}`\n\n")
 
         # Данные по тикерам
         for ticker in tickers:
-            row = f"`{ticker:4} `"
-            for hour in hours:
-                emoji = heatmap.get(ticker, {}).get(hour, '⚪')
-                row += f" {emoji}  "
-            text += f"{row}\n"
+            cells = heatmap.get(ticker, {})
+            parts.append(f"`{ticker:4} `")
+            parts.extend(f" {cells.get(hour, '⚪')}  " for hour in hours)
+            parts.append("\n")
 
-        # Легенда (ИСПРАВЛЕНА: "умеренно" → "хорошо")
-        text += "\n"
-        text += "`⚪ = спокойно  |  🟡 = хорошо  |  🔴 = сильно`\n\n"
+        # Легенда и навигация
+        parts.append(_PANICMAP_LEGEND)
 
-        # Навигация
-        text += "━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-        text += "📊 Статистика: /stats\n"
-        text += "📅 Сегодняшние сигналы: /today\n"
-        text += "🔥 Самые сильные: /extreme"
+        return "".join(parts)
 
-        return text
+    def _verbose_for(self, chat_id: int) -> bool:
+        """Подробный /overheat в чате (без хранилища - значение из конфига)"""
+        if self.alert_settings is None:
+            return self._verbose_overheat
+        return self.alert_settings.get_verbose_overheat(chat_id, self._verbose_overheat)
+
+    def _alerts_enabled(self, user_id: int) -> bool:
+        """Включены ли уведомления у пользователя (без хранилища - всегда)"""
+        return self.alert_settings is None or self.alert_settings.is_enabled(user_id)
 
     def _show_alerts_status(self, message):
         """Показать текущий статус уведомлений"""
-        # Заглушка - всегда включено
-        # Позже заменим на реальное хранение в БД
-        self.bot.reply_to(
-            message,
-            "🔔 **СТАТУС УВЕДОМЛЕНИЙ**\n\n"
-            "Текущий статус: 🟢 **ВКЛЮЧЕНЫ**\n\n"
-            "━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-            "• `/alerts on` - включить уведомления\n"
-            "• `/alerts off` - выключить уведомления\n"
-            "• `/status` - общий статус системы",
-            parse_mode='Markdown'
-        )
+        enabled = self._alerts_enabled(message.from_user.id)
+        self._reply(message, _ALERTS_STATUS_TEXTS[enabled], parse_mode='Markdown')
 
     def _enable_alerts(self, message):
         """Включить уведомления"""
-        # Заглушка
-        self.bot.reply_to(
-            message,
-            "✅ **УВЕДОМЛЕНИЯ ВКЛЮЧЕНЫ**\n\n"
-            "Теперь вы будете получать автоматические оповещения "
-            "об обнаруженных сигналах паники/жадности.\n\n"
-            "ℹ️ *Для отключения используйте* `/alerts off`",
-            parse_mode='Markdown'
-        )
-        logger.info(f"🔔 Уведомления включены для пользователя {message.from_user.id}")
+        if self.alert_settings:
+            self.alert_settings.set_enabled(message.from_user.id, True)
+        self._reply(message, _ALERTS_ENABLED_TEXT, parse_mode='Markdown')
+        logger.info("🔔 Уведомления включены для пользователя %s", message.from_user.id)
 
     def _disable_alerts(self, message):
         """Выключить уведомления"""
-        # Заглушка
-        self.bot.reply_to(
-            message,
-            "🔕 **УВЕДОМЛЕНИЯ ВЫКЛЮЧЕНЫ**\n\n"
-            "Автоматические оповещения отключены.\n"
-            "Вы больше не будете получать уведомления об обнаруженных сигналах.\n\n"
-            "ℹ️ *Для включения используйте* `/alerts on`",
-            parse_mode='Markdown'
-        )
-        logger.info(f"🔔 Уведомления выключены для пользователя {message.from_user.id}")
+        if self.alert_settings:
+            self.alert_settings.set_enabled(message.from_user.id, False)
+        self._reply(message, _ALERTS_DISABLED_TEXT, parse_mode='Markdown')
+        logger.info("🔔 Уведомления выключены для пользователя %s", message.from_user.id)
 
     def command_alerts(self, message, args=None):
         """Обработчик команды /alerts on/off - управление уведомлениями"""
@@ -1528,37 +2224,63 @@ class TelegramPanickerBot:
             elif action == 'off':
                 self._disable_alerts(message)
             else:
-                self.bot.reply_to(
+                self._reply(message, _ALERTS_USAGE_TEXT, parse_mode='Markdown')
+
+        except Exception as e:
+            logger.error("❌ Ошибка в команде /alerts: %s", e)
+            self._reply(message, _ALERTS_ERROR_TEXT, parse_mode='Markdown')
+
+    def command_settings(self, message, args=None):
+        """Обработчик команды /settings verbose on/off - подробность /overheat в этом чате"""
+        try:
+            chat_id = message.chat.id
+            if len(args or ()) == 2 and args[0].lower() == 'verbose' and args[1].lower() in ('on', 'off'):
+                if self.alert_settings is None:
+                    self._reply(message, "❌ Хранилище настроек недоступно, изменение не сохранено")
+                    return
+                self.alert_settings.set_verbose_overheat(chat_id, args[1].lower() == 'on')
+                logger.info("⚙️ Подробный /overheat в чате %s: %s", chat_id, args[1].lower())
+            elif args:
+                self._reply(
                     message,
                     "❌ **НЕВЕРНАЯ КОМАНДА**\n\n"
                     "Используйте:\n"
-                    "• `/alerts on` - включить уведомления\n"
-                    "• `/alerts off` - выключить уведомления\n"
-                    "• `/alerts` - показать статус",
+                    "• `/settings verbose on` - риск-анализ и кластеры в /overheat\n"
+                    "• `/settings verbose off` - только основные показатели\n"
+                    "• `/settings` - показать настройки",
                     parse_mode='Markdown'
                 )
+                return
 
-        except Exception as e:
-            logger.error(f"❌ Ошибка в команде /alerts: {e}")
-            self.bot.reply_to(
+            verbose_status = "🟢 ВКЛ" if self._verbose_for(chat_id) else "🔴 ВЫКЛ"
+            self._reply(
                 message,
-                "❌ **ОШИБКА УПРАВЛЕНИЯ УВЕДОМЛЕНИЯМИ**\n\n"
-                "Не удалось выполнить команду. Попробуйте позже.",
+                f"⚙️ **НАСТРОЙКИ ЭТОГО ЧАТА**\n\n"
+                f"• Подробный /overheat: {verbose_status}\n\n"
+                f"ℹ️ *Изменить:* `/settings verbose on|off`",
                 parse_mode='Markdown'
             )
 
+        except Exception as e:
+            logger.error("❌ Ошибка в команде /settings: %s", e)
+            self._reply(message, "❌ Ошибка изменения настроек")
+
     def command_status(self, message):
         """Обработчик команды /status - детальный статус системы"""
         try:
-            # Получаем текущее время
-            from datetime import datetime
-            current_time = datetime.now()
+            # Текущее время биржи: одно чтение часов на весь ответ
+            current_time = datetime.now(self.market_calendar.moscow_tz)
 
-            # Проверяем статус биржи
-            is_open, reason = self.market_calendar.is_market_open_now()
-
-            # Получаем следующий торговый день
-            next_trading_day = self.market_calendar.get_next_trading_day()
+            # Статус биржи и следующий торговый день берём из общего кеша:
+            # при потоке нажатий /status календарь пересчитывается раз в TTL
+            is_open, reason = self.market_status_cache.get_or_call(
+                'market_open', self.market_calendar.is_market_open_now
+            )
+            today = current_time.date()
+            next_trading_day = self.market_status_cache.get_or_call(
+                ('next_trading_day', today),
+                lambda: self.market_calendar.get_next_trading_day(today)
+            )
             next_event = f"{next_trading_day.strftime('%d.%m.%Y')}"
 
             # Статус биржи с эмодзи
@@ -1586,16 +2308,16 @@ class TelegramPanickerBot:
                 f"📊 **СТАТИСТИКА:**\n"
                 f"• Активных тикеров: {len(self.default_tickers)}\n"
                 f"• gRPC соединение: {'🟢 Установлено' if self.grpc_client else '🔴 Отсутствует'}\n\n"
-                f"━━━━━━━━━━━━━━━━━━━━━━━━━\n"
+                f"{_SEPARATOR}"
                 f"🔍 Для сканирования: /startscan\n"
                 f"📋 Все команды: /help"
             )
 
-            self.bot.reply_to(message, status_text, parse_mode='Markdown')
+            self._reply(message, status_text, parse_mode='Markdown')
 
         except Exception as e:
-            logger.error(f"❌ Ошибка в /status: {e}")
-            self.bot.reply_to(message, f"❌ Ошибка получения статуса: {str(e)[:100]}", parse_mode='Markdown')
+            logger.error("❌ Ошибка в /status: %s", e)
+            self._reply(message, f"❌ Ошибка получения статуса: {str(e)[:100]}")
 
     # ------------------------------------------------------------------------
     # ОБРАБОТКА КНОПОК ГЛАВНОГО МЕНЮ
@@ -1603,37 +2325,18 @@ class TelegramPanickerBot:
     def _handle_overheat_menu(self, call):
         """Обработка нажатия кнопки 'ИНДЕКС ПЕРЕГРЕВА' в главном меню"""
         try:
-            # Запрашиваем тикер у пользователя
-            msg = self.bot.send_message(
+            # Тикер выбирается кнопкой: ответ приходит обычным callback,
+            # без ожидания следующего сообщения пользователя
+            self._send(
                 call.message.chat.id,
                 "🌡️ **ИНДЕКС ПЕРЕГРЕВА**\n\n"
-                "Введите тикер акции (например: SBER, GAZP):",
-                parse_mode='Markdown'
+                "Выберите акцию или отправьте /overheat [тикер]:",
+                reply_markup=inline_keyboards.get_ticker_choice_keyboard(tuple(self.default_tickers))
             )
 
-            # Регистрируем следующий шаг - обработку введенного тикера
-            self.bot.register_next_step_handler(msg, self._process_ticker_for_overheat)
-
-        except Exception as e:
-            logger.error(f"❌ Ошибка в _handle_overheat_menu: {e}")
-            self.bot.send_message(call.message.chat.id, "❌ Ошибка обработки запроса")
-
-    def _process_ticker_for_overheat(self, message):
-        """Обработка введенного тикера для индекса перегрева"""
-        try:
-            ticker = message.text.strip().upper()
-
-            # Проверяем валидность тикера (простая проверка)
-            if not ticker or len(ticker) > 10:
-                self.bot.reply_to(message, "❌ Неверный формат тикера. Попробуйте снова.")
-                return
-
-            # Вызываем команду /overheat для этого тикера
-            self.command_overheat(message, args=[ticker])
-
         except Exception as e:
-            logger.error(f"❌ Ошибка в _process_ticker_for_overheat: {e}")
-            self.bot.reply_to(message, "❌ Ошибка обработки тикера")
+            logger.error("❌ Ошибка в _handle_overheat_menu: %s", e)
+            self._send(call.message.chat.id, "❌ Ошибка обработки запроса")
 
     # ------------------------------------------------------------------------
     # ОБРАБОТКА КНОПОК
@@ -1642,64 +2345,32 @@ class TelegramPanickerBot:
         try:
             callback_data = call.data
 
-            # 1. Кнопки главного меню
-            if callback_data == "overheat_menu":
-                self.bot.answer_callback_query(call.id)
-                self._handle_overheat_menu(call)
-                return
-
-            elif callback_data == "panic_map":
-                self.bot.answer_callback_query(call.id)
-                self._handle_panic_map_callback(call)
-                return
-
-            elif callback_data == "today":
-                self.bot.answer_callback_query(call.id)
-                self._handle_today_callback(call)
-                return
-
-            elif callback_data == "stats":
-                self.bot.answer_callback_query(call.id)
-                self._handle_stats_callback(call)
-                return
-
-            # 2. Кнопки анализа акции (начинаются с префикса)
-            elif callback_data.startswith("graph_"):
-                ticker = callback_data.replace("graph_", "")
-                self.bot.answer_callback_query(call.id)
-                self._handle_graph_callback(call, ticker)
-                return
-
-            elif callback_data.startswith("compare_"):
-                ticker = callback_data.replace("compare_", "")
-                self.bot.answer_callback_query(call.id)
-                self._handle_compare_callback(call, ticker)
-                return
-
-            elif callback_data.startswith("history_"):
-                ticker = callback_data.replace("history_", "")
-                self.bot.answer_callback_query(call.id)
-                self._handle_history_callback(call, ticker)
-                return
+            # Снимаем индикатор загрузки с кнопки в фоне: результат не нужен,
+            # и обработчик не ждёт лишнего запроса к Telegram API
+            self._telegram_pool.submit(self.bot.answer_callback_query, call.id)
 
-            elif callback_data.startswith("explain_"):
-                ticker = callback_data.replace("explain_", "")
-                self.bot.answer_callback_query(call.id)
-                self._handle_explain_callback(call, ticker)
+            # 1. Кнопки главного меню: точное совпадение
+            handler = self._callback_menu_handlers.get(callback_data)
+            if handler is not None:
+                handler(call)
                 return
 
-            elif callback_data.startswith("ignore_"):
-                ticker = callback_data.replace("ignore_", "")
-                self.bot.answer_callback_query(call.id)
-                self._handle_ignore_callback(call, ticker)
+            # 2. Кнопки анализа акции: "<префикс>_<тикер>"
+            prefix, _, ticker = callback_data.partition('_')
+            handler = self._callback_ticker_handlers.get(prefix)
+            if handler is not None and ticker:
+                handler(call, ticker)
                 return
 
             # 3. Неизвестный callback
-            self.bot.answer_callback_query(call.id)
-            self.bot.send_message(call.message.chat.id, "❌ Неизвестная команда")
+            self._send(call.message.chat.id, "❌ Неизвестная команда")
 
         except Exception as e:
-            logger.error(f"❌ Ошибка обработки callback: {e}")
+            logger.error("❌ Ошибка обработки callback: %s", e)
+
+    def _handle_overheat_callback(self, call, ticker):
+        """Выбор тикера из меню индекса перегрева"""
+        self.command_overheat(call.message, args=[ticker])
 
     # ------------------------------------------------------------------------
     # ОБРАБОТКА CALLBACK-КНОПОК ГЛАВНОГО МЕНЮ
@@ -1708,50 +2379,32 @@ class TelegramPanickerBot:
         """Обработка кнопки 'КАРТА ПАНИКИ' из главного меню"""
         try:
             # Создаём fake message для вызова command_panicmap
-            class FakeMessage:
-                def __init__(self, chat):
-                    self.chat = chat
-                    self.message_id = call.message.message_id
-
-            fake_message = FakeMessage(call.message.chat)
+            fake_message = FakeMessage(call.message.chat, call.message.message_id)
             self.command_panicmap(fake_message)
 
         except Exception as e:
-            logger.error(f"❌ Ошибка в _handle_panic_map_callback: {e}")
-            self.bot.send_message(
-                call.message.chat.id,
-                "🗺️ **КАРТА ПАНИКИ**\n\nОшибка построения карты",
-                parse_mode='Markdown'
-            )
+            logger.error("❌ Ошибка в _handle_panic_map_callback: %s", e)
+            self._send(call.message.chat.id, "🗺️ **КАРТА ПАНИКИ**\n\nОшибка построения карты")
 
     def _handle_today_callback(self, call):
         """Обработка кнопки 'СЕГОДНЯШНИЕ ИСТЕРИКИ' из главного меню"""
         try:
             # Вызываем команду /today
-            fake_message = type('obj', (object,), {'chat': call.message.chat})()
+            fake_message = FakeMessage(call.message.chat, call.message.message_id)
             self.command_today(fake_message)
         except Exception as e:
-            logger.error(f"❌ Ошибка в _handle_today_callback: {e}")
+            logger.error("❌ Ошибка в _handle_today_callback: %s", e)
 
     def _handle_stats_callback(self, call):
         """Обработка кнопки 'СТАТИСТИКА' из главного меню"""
         try:
             # Создаём fake message для вызова command_stats
-            class FakeMessage:
-                def __init__(self, chat):
-                    self.chat = chat
-                    self.message_id = call.message.message_id
-
-            fake_message = FakeMessage(call.message.chat)
+            fake_message = FakeMessage(call.message.chat, call.message.message_id)
             self.command_stats(fake_message)
 
         except Exception as e:
-            logger.error(f"❌ Ошибка в _handle_stats_callback: {e}")
-            self.bot.send_message(
-                call.message.chat.id,
-                "📊 **СТАТИСТИКА ЗА НЕДЕЛЮ**\n\nОшибка получения статистики",
-                parse_mode='Markdown'
-            )
+            logger.error("❌ Ошибка в _handle_stats_callback: %s", e)
+            self._send(call.message.chat.id, "📊 **СТАТИСТИКА ЗА НЕДЕЛЮ**\n\nОшибка получения статистики")
 
     # ------------------------------------------------------------------------
     # ОБРАБОТКА CALLBACK-КНОПОК АНАЛИЗА АКЦИИ
@@ -1759,227 +2412,193 @@ class TelegramPanickerBot:
     def _handle_graph_callback(self, call, ticker):
         """Обработка кнопки 'ГРАФИК АКЦИИ'"""
         try:
-            from datetime import datetime, timedelta
-
-            # Получаем свечи за последний день
-            candles_data = self.grpc_client.get_candles(
-                ticker=ticker,
-                interval='hour',
-                count=24
-            )
+            # Свечи за последний день: тот же запрос, что у кнопки сравнения,
+            # поэтому оба нажатия обслуживаются одним вызовом GetCandles
+            candles_data = self._candles_future(ticker, 'hour', 24).result(timeout=BUTTON_GRPC_TIMEOUT)
 
             if candles_data:
-                # Формируем текстовый график (упрощённо)
-                prices = []
-                for candle in candles_data:
-                    if hasattr(candle, 'close'):
-                        prices.append(candle.close)
-                    elif isinstance(candle, dict):
-                        price = candle.get('close')
-                        if price is not None:
-                            prices.append(price)
-
-                if prices:
-                    min_price = min(prices)
-                    max_price = max(prices)
-                    current = prices[-1]
-
-                    text = f"📊 **ГРАФИК {ticker}**\n\n"
-                    text += f"• Текущая цена: {current:.2f}₽\n"
-                    text += f"• Минимум за сутки: {min_price:.2f}₽\n"
-                    text += f"• Максимум за сутки: {max_price:.2f}₽\n"
-                    text += f"• Изменение: {((current - prices[0]) / prices[0] * 100):+.2f}%\n\n"
-
-                    # Простая ASCII визуализация
-                    if len(prices) >= 2:
-                        trend = "📈" if current > prices[-2] else "📉" if current < prices[-2] else "➡️"
-                        change = current - prices[-2]
-                        text += f"Тренд: {trend} ({change:+.2f}₽)\n\n"
-
-                    text += f"📈 Подробный график доступен в дашборде\n"
-                    text += f"🌡️ Индекс перегрева: /overheat {ticker}"
-                else:
-                    text = f"📊 **ГРАФИК {ticker}**\n\nНет данных для построения графика"
+                # Формируем текстовый график (упрощённо): редукции - в NumPy,
+                # в текст идут обычные float (деление на ноль - как раньше, ошибкой)
+                prices = _close_prices(candles_data)
+                min_price = prices.min().item()
+                max_price = prices.max().item()
+                first, current = prices[[0, -1]].tolist()
+
+                parts = [
+                    f"📊 **ГРАФИК {ticker}**\n\n"
+                    f"• Текущая цена: {current:.2f}₽\n"
+                    f"• Минимум за сутки: {min_price:.2f}₽\n"
+                    f"• Максимум за сутки: {max_price:.2f}₽\n"
+                    f"• Изменение: {((current - first) / first * 100):+.2f}%\n\n"
+                ]
+
+                # Простая ASCII визуализация
+                if prices.size >= 2:
+                    previous = prices[-2].item()
+                    trend = "📈" if current > previous else "📉" if current < previous else "➡️"
+                    change = current - previous
+                    parts.append(f"Тренд: {trend} ({change:+.2f}₽)\n\n")
+
+                parts.append(
+                    f"📈 Подробный график доступен в дашборде\n"
+                    f"🌡️ Индекс перегрева: /overheat {ticker}"
+                )
+                text = "".join(parts)
             else:
                 text = f"📊 **ГРАФИК {ticker}**\n\nНе удалось получить данные"
 
+        except FutureTimeoutError:
+            logger.warning("⏳ Таймаут свечей для графика %s", ticker)
+            text = f"📊 **ГРАФИК {ticker}**\n\n{_BUTTON_TIMEOUT_TEXT}"
         except Exception as e:
-            logger.error(f"❌ Ошибка получения графика для {ticker}: {e}")
+            logger.error("❌ Ошибка получения графика для %s: %s", ticker, e)
             text = f"📊 **ГРАФИК {ticker}**\n\nОшибка получения данных"
 
-        self.bot.send_message(call.message.chat.id, text, parse_mode='Markdown')
+        self._send(call.message.chat.id, text)
 
     def _handle_compare_callback(self, call, ticker):
         """Обработка кнопки 'СРАВНИТЬ С IMOEX'"""
         try:
-            # Получаем данные по акции
-            ticker_candles = self.grpc_client.get_candles(
-                ticker=ticker,
-                interval='hour',
-                count=24
-            )
-
-            # Получаем данные по индексу IMOEX
-            imoex_candles = self.grpc_client.get_candles(
-                ticker='IMOEX',
-                interval='hour',
-                count=24
-            )
-
-            def extract_prices(candles):
-                prices = []
-                for candle in candles:
-                    if hasattr(candle, 'close'):
-                        prices.append(candle.close)
-                    elif isinstance(candle, dict):
-                        price = candle.get('close')
-                        if price is not None:
-                            prices.append(price)
-                return prices
+            # Свечи акции и индекса IMOEX запрашиваем одновременно
+            ticker_future = self._candles_future(ticker, 'hour', 24)
+            imoex_future = self._candles_future('IMOEX', 'hour', 24)
+            ticker_candles = ticker_future.result(timeout=BUTTON_GRPC_TIMEOUT)
+            imoex_candles = imoex_future.result(timeout=BUTTON_GRPC_TIMEOUT)
 
             if ticker_candles and imoex_candles:
-                ticker_prices = extract_prices(ticker_candles)
-                imoex_prices = extract_prices(imoex_candles)
-
-                if ticker_prices and imoex_prices:
-                    ticker_current = ticker_prices[-1]
-                    ticker_change = ((ticker_current - ticker_prices[0]) / ticker_prices[0] * 100) if ticker_prices[
-                                                                                                          0] != 0 else 0
-
-                    imoex_current = imoex_prices[-1]
-                    imoex_change = ((imoex_current - imoex_prices[0]) / imoex_prices[0] * 100) if imoex_prices[
-                                                                                                      0] != 0 else 0
-
-                    # Определяем outperformance/underperformance
-                    outperformance = ticker_change - imoex_change
-
-                    text = f"📈 **СРАВНЕНИЕ {ticker} С IMOEX**\n\n"
-                    text += f"• {ticker}: {ticker_current:.2f}₽ ({ticker_change:+.2f}%)\n"
-                    text += f"• IMOEX: {imoex_current:.2f} ({imoex_change:+.2f}%)\n\n"
-
-                    if outperformance > 0:
-                        text += f"✅ **{ticker} опережает рынок** на {outperformance:+.2f}%\n"
-                        text += f"Акция показывает лучшую динамику, чем индекс\n"
-                    elif outperformance < 0:
-                        text += f"⚠️ **{ticker} отстаёт от рынка** на {outperformance:+.2f}%\n"
-                        text += f"Акция показывает худшую динамику, чем индекс\n"
-                    else:
-                        text += f"➡️ **{ticker} движется вровень с рынком**\n"
-                        text += f"Динамика совпадает с индексом\n"
-
-                    text += f"\n📊 *За последние 24 часа*\n"
-                    text += f"📅 Подробнее в дашборде"
+                # Первая и последняя цена закрытия каждого ряда
+                ticker_first, ticker_current = _close_prices(ticker_candles)[[0, -1]].tolist()
+                imoex_first, imoex_current = _close_prices(imoex_candles)[[0, -1]].tolist()
+
+                ticker_change = ((ticker_current - ticker_first) / ticker_first * 100) if ticker_first != 0 else 0
+                imoex_change = ((imoex_current - imoex_first) / imoex_first * 100) if imoex_first != 0 else 0
+
+                # Определяем outperformance/underperformance
+                outperformance = ticker_change - imoex_change
+
+                if outperformance > 0:
+                    verdict = (
+                        f"✅ **{ticker} опережает рынок** на {outperformance:+.2f}%\n"
+                        f"Акция показывает лучшую динамику, чем индекс\n"
+                    )
+                elif outperformance < 0:
+                    verdict = (
+                        f"⚠️ **{ticker} отстаёт от рынка** на {outperformance:+.2f}%\n"
+                        f"Акция показывает худшую динамику, чем индекс\n"
+                    )
                 else:
-                    text = f"📈 **СРАВНЕНИЕ {ticker} С IMOEX**\n\nНедостаточно данных для сравнения"
+                    verdict = (
+                        f"➡️ **{ticker} движется вровень с рынком**\n"
+                        f"Динамика совпадает с индексом\n"
+                    )
+
+                text = "".join((
+                    f"📈 **СРАВНЕНИЕ {ticker} С IMOEX**\n\n"
+                    f"• {ticker}: {ticker_current:.2f}₽ ({ticker_change:+.2f}%)\n"
+                    f"• IMOEX: {imoex_current:.2f} ({imoex_change:+.2f}%)\n\n",
+                    verdict,
+                    "\n📊 *За последние 24 часа*\n"
+                    "📅 Подробнее в дашборде"
+                ))
             else:
                 text = f"📈 **СРАВНЕНИЕ {ticker} С IMOEX**\n\nНе удалось получить данные"
 
+        except FutureTimeoutError:
+            logger.warning("⏳ Таймаут свечей для сравнения %s с IMOEX", ticker)
+            text = f"📈 **СРАВНЕНИЕ {ticker} С IMOEX**\n\n{_BUTTON_TIMEOUT_TEXT}"
         except Exception as e:
-            logger.error(f"❌ Ошибка сравнения {ticker} с IMOEX: {e}")
+            logger.error("❌ Ошибка сравнения %s с IMOEX: %s", ticker, e)
             text = f"📈 **СРАВНЕНИЕ {ticker} С IMOEX**\n\nОшибка получения данных"
 
-        self.bot.send_message(call.message.chat.id, text, parse_mode='Markdown')
+        self._send(call.message.chat.id, text)
 
     def _handle_history_callback(self, call, ticker):
         """Обработка кнопки 'ИСТОРИЯ СИГНАЛОВ'"""
         try:
-            # Получаем историю сигналов через gRPC
-            history_data = self.grpc_client.get_signal_history(ticker=ticker, limit=5)
+            # Получаем историю сигналов через gRPC (future-вызов с ограничением ожидания)
+            history_data = self.grpc_client.get_signal_history_async(ticker=ticker, limit=5).result(
+                timeout=BUTTON_GRPC_TIMEOUT
+            )
 
             if history_data:
-                text = f"📋 **ИСТОРИЯ СИГНАЛОВ {ticker}**\n\n"
-                text += f"Последние {len(history_data)} сигналов:\n\n"
-
-                for i, signal_data in enumerate(history_data, 1):
-                    # Конвертируем в PanicSignal если нужно
-                    if isinstance(signal_data, dict) and PanicSignal:
-                        try:
-                            signal = PanicSignal(**signal_data)
-                        except Exception as e:
-                            logger.warning(f"Не удалось создать PanicSignal для истории: {e}")
-                            signal = signal_data
-                    else:
-                        signal = signal_data
-
-                    # Извлекаем данные в зависимости от типа
-                    if hasattr(signal, 'detected_at'):
-                        detected_at = signal.detected_at
-                        level = signal.level
-                        signal_type = signal.signal_type
-                        rsi = signal.rsi_14
-                        volume = signal.volume_ratio
-                        risk = signal.risk_metric
-                    elif isinstance(signal, dict):
+                parts = [
+                    f"📋 **ИСТОРИЯ СИГНАЛОВ {ticker}**\n\n"
+                    f"Последние {len(history_data)} сигналов:\n\n"
+                ]
+
+                for i, signal in enumerate(history_data, 1):
+                    # Поля читаем как есть: модель PanicSignal ради чтения
+                    # её же входных данных не строим
+                    if isinstance(signal, dict):
                         detected_at = signal.get('detected_at', '--:--')
                         level = signal.get('level', '')
                         signal_type = signal.get('signal_type', '')
                         rsi = signal.get('rsi_14', 0)
                         volume = signal.get('volume_ratio', 0)
                         risk = signal.get('risk_metric')
+                    elif PanicSignal and isinstance(signal, PanicSignal):
+                        # Клиент уже вернул провалидированную модель
+                        detected_at = signal.timestamp
+                        level = signal.final_level
+                        signal_type = signal.signal_type
+                        rsi = signal.rsi_14
+                        volume = signal.volume_ratio
+                        risk = signal.risk_metric
                     else:
                         continue
 
                     # Форматируем время
-                    time_str = detected_at
-                    if 'T' in time_str:
-                        # Формат ISO: 2024-12-18T14:30:00
-                        time_str = time_str.split('T')[1][:5]
-                    elif len(time_str) > 5:
-                        time_str = time_str[11:16]  # Берем только время
+                    time_str = _signal_time(detected_at)
 
                     # Определяем эмодзи уровня
-                    level_upper = level.upper()
-                    if '🔴' in level_upper or 'STRONG' in level_upper:
-                        level_emoji = '🔴'
-                        level_text = 'Сильная'
-                    elif '🟡' in level_upper or 'MODERATE' in level_upper:
-                        level_emoji = '🟡'
-                        level_text = 'Умеренная'
-                    elif '⚪' in level_upper or 'URGENT' in level_upper:
-                        level_emoji = '⚪'
-                        level_text = 'Срочная'
-                    else:
-                        level_emoji = '⚪'
-                        level_text = 'Сигнал'
-
-                    # Определяем тип
-                    signal_type_upper = signal_type.upper()
-                    if 'ПАНИКА' in signal_type_upper or 'PANIC' in signal_type_upper:
-                        type_text = 'паника'
-                    elif 'ЖАДНОСТЬ' in signal_type_upper or 'GREED' in signal_type_upper:
-                        type_text = 'жадность'
+                    if level in LEVEL_BUCKETS:
+                        level_group = LEVEL_BUCKETS[level]
                     else:
-                        type_text = 'сигнал'
-
-                    text += f"{i}. {time_str} {level_emoji} {level_text} {type_text}\n"
-                    text += f"   RSI: {rsi:.1f} | Объём: {volume:.1f}×"
-
-                    if risk is not None:
-                        text += f" | Риск: {risk:.1f}/100"
-
-                    text += "\n\n"
-
-                text += f"📊 Всего сигналов: {len(history_data)}\n"
-                text += f"📅 Полная история в дашборде"
+                        level_group = self._classify_level(level)
+                    level_emoji, level_text = _HISTORY_LEVEL_LABELS[level_group]
+
+                    # Определяем тип: один проход регулярного выражения вместо четырёх поисков
+                    type_match = _SIGNAL_TYPE_MARKER_RE.search(signal_type)
+                    type_text = _HISTORY_TYPE_LABELS[type_match.group().upper()] if type_match else 'сигнал'
+
+                    # Строка сигнала - одна f-строка (хвост с риском подставляется готовым)
+                    risk_text = f" | Риск: {risk:.1f}/100" if risk is not None else ""
+                    parts.append(
+                        f"{i}. {time_str} {level_emoji} {level_text} {type_text}\n"
+                        f"   RSI: {rsi:.1f} | Объём: {volume:.1f}×{risk_text}\n\n"
+                    )
+
+                parts.append(
+                    f"📊 Всего сигналов: {len(history_data)}\n"
+                    f"📅 Полная история в дашборде"
+                )
+                text = "".join(parts)
 
             else:
-                text = f"📋 **ИСТОРИЯ СИГНАЛОВ {ticker}**\n\n"
-                text += f"История сигналов пуста.\n"
-                text += f"Сигналы появятся после их обнаружения системой.\n\n"
-                text += f"🔍 Проверить сейчас: /overheat {ticker}"
+                text = (
+                    f"📋 **ИСТОРИЯ СИГНАЛОВ {ticker}**\n\n"
+                    f"История сигналов пуста.\n"
+                    f"Сигналы появятся после их обнаружения системой.\n\n"
+                    f"🔍 Проверить сейчас: /overheat {ticker}"
+                )
 
+        except FutureTimeoutError:
+            logger.warning("⏳ Таймаут истории сигналов %s", ticker)
+            text = f"📋 **ИСТОРИЯ СИГНАЛОВ {ticker}**\n\n{_BUTTON_TIMEOUT_TEXT}"
         except Exception as e:
-            logger.error(f"❌ Ошибка получения истории для {ticker}: {e}")
-            text = f"📋 **ИСТОРИЯ СИГНАЛОВ {ticker}**\n\n"
-            text += f"Ошибка получения данных истории.\n"
-            text += f"Попробуйте позже."
+            logger.error("❌ Ошибка получения истории для %s: %s", ticker, e)
+            text = (
+                f"📋 **ИСТОРИЯ СИГНАЛОВ {ticker}**\n\n"
+                f"Ошибка получения данных истории.\n"
+                f"Попробуйте позже."
+            )
 
-        self.bot.send_message(call.message.chat.id, text, parse_mode='Markdown')
+        self._send(call.message.chat.id, text)
 
     def _handle_explain_callback(self, call, ticker):
         """Обработка кнопки 'ОБЪЯСНИТЬ СИГНАЛ'"""
         try:
-            self.bot.send_message(
+            self._send(
                 call.message.chat.id,
                 f"🤔 **ОБЪЯСНЕНИЕ СИГНАЛА ДЛЯ {ticker}**\n\n"
                 f"Алгоритм анализа:\n"
@@ -1987,25 +2606,23 @@ class TelegramPanickerBot:
                 f"2. Анализ объёма относительно средней нормы\n"
                 f"3. Мультипериодная верификация (7, 14, 21 дней)\n"
                 f"4. Применение контекстных фильтров\n\n"
-                f"*Подробнее в документации проекта*",
-                parse_mode='Markdown'
+                f"*Подробнее в документации проекта*"
             )
         except Exception as e:
-            logger.error(f"❌ Ошибка в _handle_explain_callback: {e}")
+            logger.error("❌ Ошибка в _handle_explain_callback: %s", e)
 
     def _handle_ignore_callback(self, call, ticker):
         """Обработка кнопки 'ИГНОРИРОВАТЬ 2 ЧАСА'"""
         try:
-            self.bot.send_message(
+            hidden_until = datetime.now() + timedelta(hours=2)
+            self._send(
                 call.message.chat.id,
                 f"🚫 **ИГНОРИРОВАНИЕ {ticker} НА 2 ЧАСА**\n\n"
-                f"Сигналы для {ticker} будут скрыты до "
-                f"{(datetime.now() + timedelta(hours=2)).strftime('%H:%M')}\n\n"
-                f"*Функция временного игнорирования активирована*",
-                parse_mode='Markdown'
+                f"Сигналы для {ticker} будут скрыты до {hidden_until:%H:%M}\n\n"
+                f"*Функция временного игнорирования активирована*"
             )
         except Exception as e:
-            logger.error(f"❌ Ошибка в _handle_ignore_callback: {e}")
+            logger.error("❌ Ошибка в _handle_ignore_callback: %s", e)
 
     # ------------------------------------------------------------------------
     # ЗАВЕРШЕНИЕ РАБОТЫ
@@ -2013,6 +2630,18 @@ class TelegramPanickerBot:
     def stop_bot(self):
         """Корректная остановка бота"""
         try:
+            # Дожидаемся автооповещений, уже поставленных в фоновые потоки
+            self._telegram_pool.shutdown(wait=True)
+
+            if self.alert_batcher:
+                self.alert_batcher.flush()
+
+            if self.reply_batcher:
+                self.reply_batcher.flush()
+
+            if self.outbox:
+                self.outbox.stop()
+
             if self.grpc_client:
                 self.grpc_client.close()
                 logger.info("✅ gRPC соединение закрыто")
@@ -2021,8 +2650,11 @@ class TelegramPanickerBot:
                 self.data_cache.cleanup()
                 logger.info("✅ Кеш очищен")
 
+            if self.alert_settings:
+                self.alert_settings.close()
+
         except Exception as e:
-            logger.error(f"❌ Ошибка при остановке: {e}")
+            logger.error("❌ Ошибка при остановке: %s", e)
         finally:
             self.is_active = False
             logger.info("🤖 Бот остановлен")
@@ -2041,7 +2673,7 @@ def main():
         logger.info("Получен сигнал KeyboardInterrupt, останавливаем бота...")
         bot.stop_bot()
     except Exception as e:
-        logger.error(f"❌ Критическая ошибка: {e}")
+        logger.error("❌ Критическая ошибка: %s", e)
         bot.stop_bot()
         raise
 
@@ -4,16 +4,32 @@
 """
 
 import logging
-from typing import List, Dict, Any, Tuple
+import threading
+from typing import List, Dict, Any, NamedTuple, Optional, Tuple
 import numpy as np
-from dataclasses import dataclass
+from numpy.typing import ArrayLike
 
 logger = logging.getLogger(__name__)
 
+# Начиная с этого числа цен зона считается арифметически по ширине зоны
+# (зоны равные), а не бинарным поиском по границам: на больших окнах
+# это вдвое быстрее, на коротких - медленнее из-за лишних проверок границ
+UNIFORM_BINNING_MIN_POINTS = 1000
 
-@dataclass
-class VolumeCluster:
-    """Кластер объёма - ключевой ценовой уровень"""
+# Наибольшее число ценовых зон (меньше, если различных цен меньше)
+MAX_PRICE_ZONES = 20
+
+# Сколько последних результатов analyze хранить: сканер каждые 5 минут
+# заново анализирует те же исторические окна, пока не придут новые свечи
+ANALYZE_CACHE_SIZE = 32
+
+
+class VolumeCluster(NamedTuple):
+    """
+    Кластер объёма - ключевой ценовой уровень.
+    Неизменяемый кортеж: без __dict__ на каждый уровень, и кэш analyze
+    можно отдавать вызывающим без риска, что его изменят.
+    """
     price_level: float  # Ценовой уровень
     volume_percentage: float  # Доля объёма на этом уровне (%)
     total_volume: float  # Суммарный объём на уровне
@@ -27,6 +43,13 @@ class VolumeClusterAnalyzer:
     Определяет ключевые ценовые уровни на основе распределения объёма.
     """
 
+    # Эмодзи роли уровня в текстовой сводке
+    _ROLE_EMOJI = {
+        'support': '🟢',
+        'resistance': '🔴',
+        'neutral': '🟡'
+    }
+
     def __init__(self, num_clusters: int = 3):
         """
         Args:
@@ -35,13 +58,17 @@ class VolumeClusterAnalyzer:
         self.num_clusters = num_clusters
         self.min_volume_share = 0.1  # Минимальная доля объёма для уровня (10%)
 
-    def analyze(self, prices: List[float], volumes: List[float]) -> List[VolumeCluster]:
+        # Кэш результатов analyze: (параметры, байты цен, байты объёмов) -> кластеры
+        self._cache: Dict[Tuple[int, float, bytes, bytes], List[VolumeCluster]] = {}
+        self._cache_lock = threading.Lock()
+
+    def analyze(self, prices: ArrayLike, volumes: ArrayLike) -> List[VolumeCluster]:
         """
         Анализ кластеров объёма на основе цен и объёмов.
 
         Args:
-            prices: Список цен
-            volumes: Список объёмов (соответствует ценам)
+            prices: Цены (список или массив NumPy - массив float64 не копируется)
+            volumes: Объёмы (соответствуют ценам)
 
         Returns:
             Список ключевых кластеров объёма
@@ -55,6 +82,20 @@ class VolumeClusterAnalyzer:
             return []
 
         try:
+            # Дальше все шаги работают с одними и теми же массивами
+            prices = np.asarray(prices, dtype=np.float64)
+            volumes = np.asarray(volumes, dtype=np.float64)
+
+            # Ключ - параметры отбора и точное содержимое окна: новая свеча
+            # или другие num_clusters/min_volume_share меняют ключ,
+            # а то же самое окно отдаётся из кэша без пересчёта
+            cache_key = (self.num_clusters, self.min_volume_share, prices.tobytes(), volumes.tobytes())
+            with self._cache_lock:
+                cached = self._cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"📊 Кластеры объёма из кэша: {len(cached)} уровней")
+                return list(cached)
+
             # 1. Группируем объёмы по ценовым зонам
             clusters = self._group_volume_by_price_zones(prices, volumes)
 
@@ -66,68 +107,234 @@ class VolumeClusterAnalyzer:
 
             logger.info(f"📊 Найдено {len(clusters_with_roles)} ключевых уровней объёма")
 
-            return clusters_with_roles
+            # Вытесняем самую старую запись (словарь хранит порядок вставки)
+            with self._cache_lock:
+                if len(self._cache) >= ANALYZE_CACHE_SIZE:
+                    del self._cache[next(iter(self._cache))]
+                self._cache[cache_key] = clusters_with_roles
+
+            return list(clusters_with_roles)
 
         except Exception as e:
             logger.error(f"❌ Ошибка анализа кластеров объёма: {e}")
             return []
 
-    def _group_volume_by_price_zones(self, prices: List[float], volumes: List[float]) -> List[Dict[str, Any]]:
+    def analyze_batch(self, prices_per_ticker: List[ArrayLike],
+                      volumes_per_ticker: List[ArrayLike]) -> List[List[VolumeCluster]]:
+        """
+        Анализ кластеров объёма сразу для нескольких тикеров.
+        Объём всех тикеров раскладывается по зонам одной гистограммой,
+        результат по каждому тикеру тот же, что у analyze.
+
+        Args:
+            prices_per_ticker: Цены каждого тикера
+            volumes_per_ticker: Объёмы каждого тикера (в том же порядке)
+
+        Returns:
+            Список ключевых кластеров для каждого тикера
+        """
+        if len(prices_per_ticker) != len(volumes_per_ticker):
+            logger.error(f"Несовпадение числа тикеров: цены={len(prices_per_ticker)}, "
+                         f"объёмы={len(volumes_per_ticker)}")
+            return [[] for _ in prices_per_ticker]
+
+        prices_list = [np.asarray(prices, dtype=np.float64) for prices in prices_per_ticker]
+        volumes_list = [np.asarray(volumes, dtype=np.float64) for volumes in volumes_per_ticker]
+        results: List[List[VolumeCluster]] = [[] for _ in prices_list]
+
+        # Пустые и несогласованные окна - через analyze (он же и сообщит об ошибке)
+        batch = []
+        for i, (prices, volumes) in enumerate(zip(prices_list, volumes_list)):
+            if prices.size == 0 or prices.size != volumes.size:
+                results[i] = self.analyze(prices, volumes)
+            else:
+                batch.append(i)
+
+        if not batch:
+            return results
+
+        try:
+            zones_per_ticker = self._group_volume_by_price_zones_batch(
+                [prices_list[i] for i in batch], [volumes_list[i] for i in batch]
+            )
+
+            for i, clusters in zip(batch, zones_per_ticker):
+                if clusters is None:
+                    # Все цены одинаковые - один кластер, как в analyze
+                    results[i] = self.analyze(prices_list[i], volumes_list[i])
+                    continue
+
+                significant_clusters = self._find_significant_clusters(clusters)
+                results[i] = self._assign_roles(significant_clusters, prices_list[i])
+
+            logger.info(f"📊 Кластеры объёма рассчитаны для {len(batch)} тикеров")
+
+        except Exception as e:
+            logger.error(f"❌ Ошибка пакетного анализа кластеров объёма: {e}")
+
+        return results
+
+    def _group_volume_by_price_zones(self, prices: ArrayLike, volumes: ArrayLike,
+                                     bins: Optional[ArrayLike] = None) -> List[Dict[str, Any]]:
         """
         Группировка объёма по ценовым зонам.
 
         Args:
-            prices: Список цен
-            volumes: Список объёмов
+            prices: Цены
+            volumes: Объёмы
+            bins: Свои границы зон по возрастанию (могут быть неравными).
+                  Если None - 20 равных зон по диапазону цен
 
         Returns:
             Список кластеров с агрегированным объёмом
         """
-        if not prices:
+        if len(prices) == 0:
             return []
 
-        # Определяем диапазон цен
-        min_price = min(prices)
-        max_price = max(prices)
+        # Один массив цен и объёмов на все проходы: минимум, максимум, число
+        # различных цен и суммы считает NumPy, без min/max/set/sum по списку
+        prices_arr = np.asarray(prices, dtype=np.float64)
+        volumes_arr = np.asarray(volumes, dtype=np.float64)
+
+        if bins is not None:
+            # Свои границы: цены за крайними границами не входят ни в одну зону
+            bins = np.asarray(bins, dtype=np.float64)
+            num_bins = bins.size - 1
+            inside = (prices_arr >= bins[0]) & (prices_arr <= bins[-1])
+            prices_arr = prices_arr[inside]
+            volumes_arr = volumes_arr[inside]
+            uniform = False
+        else:
+            # Определяем диапазон цен
+            min_price = prices_arr.min()
+            max_price = prices_arr.max()
+            price_range = max_price - min_price
+
+            if price_range == 0:
+                # Все цены одинаковые - один кластер
+                return [{
+                    'price_level': prices_arr[0].item(),
+                    'total_volume': volumes_arr.sum().item(),
+                    'count': prices_arr.size
+                }]
+
+            # Создаём 20 ценовых зон (биннинг)
+            num_bins = min(MAX_PRICE_ZONES, np.unique(prices_arr).size)
+            bins = np.linspace(min_price, max_price, num_bins + 1)
+            uniform = prices_arr.size >= UNIFORM_BINNING_MIN_POINTS
+
+        # Зона каждой цены - за один проход NumPy: последняя граница не выше цены
+        if uniform:
+            zone_idx = ((prices_arr - min_price) * (num_bins / price_range)).astype(np.intp)
+            np.clip(zone_idx, 0, num_bins - 1, out=zone_idx)
+            # Поправка на округление: сверяем с теми же границами linspace
+            zone_idx -= prices_arr < bins[zone_idx]
+            zone_idx += (zone_idx < num_bins - 1) & (prices_arr >= bins[zone_idx + 1])
+        else:
+            # Бинарный поиск по границам - подходит и для неравных зон
+            zone_idx = np.searchsorted(bins, prices_arr, side='right') - 1
+            np.minimum(zone_idx, num_bins - 1, out=zone_idx)
+
+        # Зоны замкнуты с обеих сторон (lower <= price <= upper): цена ровно
+        # на внутренней границе учитывается и в нижней соседней зоне
+        on_edge = (zone_idx > 0) & (prices_arr == bins[zone_idx])
+        if on_edge.any():
+            zone_idx = np.concatenate((zone_idx, zone_idx[on_edge] - 1))
+            volumes_arr = np.concatenate((volumes_arr, volumes_arr[on_edge]))
+
+        zone_volumes = np.bincount(zone_idx, weights=volumes_arr, minlength=num_bins)
+        counts = np.bincount(zone_idx, minlength=num_bins)
+        centers = (bins[:-1] + bins[1:]) / 2
+
+        return [
+            {
+                'price_level': centers[i],
+                'total_volume': zone_volumes[i].item(),
+                'count': counts[i].item(),
+                'price_range': (bins[i], bins[i + 1])
+            }
+            for i in np.flatnonzero(zone_volumes > 0).tolist()
+        ]
+
+    def _group_volume_by_price_zones_batch(self, prices_list: List[np.ndarray],
+                                           volumes_list: List[np.ndarray]) -> List[Optional[List[Dict[str, Any]]]]:
+        """
+        Группировка объёма по ценовым зонам сразу для нескольких тикеров.
+        Зоны те же, что у _group_volume_by_price_zones (свои у каждого тикера),
+        но все тикеры считаются одним проходом NumPy и одним np.bincount.
+
+        Args:
+            prices_list: Непустые массивы цен по тикерам
+            volumes_list: Массивы объёмов той же длины
+
+        Returns:
+            Кластеры каждого тикера; None - если все цены тикера одинаковые
+        """
+        num_tickers = len(prices_list)
+        lengths = np.array([prices.size for prices in prices_list])
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        ticker_idx = np.repeat(np.arange(num_tickers), lengths)
+        prices_arr = np.concatenate(prices_list)
+        volumes_arr = np.concatenate(volumes_list)
+
+        # Диапазон цен каждого тикера
+        min_price = np.minimum.reduceat(prices_arr, starts)
+        max_price = np.maximum.reduceat(prices_arr, starts)
         price_range = max_price - min_price
+        flat = price_range == 0
+
+        # Число различных цен тикера: цены сортируются внутри своего тикера,
+        # новая цена - та, что отличается от предыдущей того же тикера
+        sorted_prices = prices_arr[np.lexsort((prices_arr, ticker_idx))]
+        is_new = np.ones(prices_arr.size, dtype=bool)
+        is_new[1:] = (sorted_prices[1:] != sorted_prices[:-1]) | (ticker_idx[1:] != ticker_idx[:-1])
+        num_bins = np.minimum(MAX_PRICE_ZONES, np.bincount(ticker_idx[is_new], minlength=num_tickers))
+        num_bins[flat] = 1
+        price_range[flat] = 1.0  # Плоские окна в гистограмму не попадают
+
+        # Границы зон - как у np.linspace: start + k * step, последняя ровно max
+        bins = min_price[:, None] + np.arange(MAX_PRICE_ZONES + 1) * (price_range / num_bins)[:, None]
+        bins[np.arange(num_tickers), num_bins] = max_price
+
+        # Зона каждой цены - по ширине зоны своего тикера с поправкой по границам
+        zone_bins = num_bins[ticker_idx]
+        zone_idx = ((prices_arr - min_price[ticker_idx])
+                    * (num_bins / price_range)[ticker_idx]).astype(np.intp)
+        np.clip(zone_idx, 0, zone_bins - 1, out=zone_idx)
+        zone_idx -= prices_arr < bins[ticker_idx, zone_idx]
+        zone_idx += (zone_idx < zone_bins - 1) & (prices_arr >= bins[ticker_idx, zone_idx + 1])
+
+        # Цена ровно на внутренней границе входит и в нижнюю соседнюю зону
+        on_edge = (zone_idx > 0) & (prices_arr == bins[ticker_idx, zone_idx])
+        if on_edge.any():
+            ticker_idx = np.concatenate((ticker_idx, ticker_idx[on_edge]))
+            zone_idx = np.concatenate((zone_idx, zone_idx[on_edge] - 1))
+            volumes_arr = np.concatenate((volumes_arr, volumes_arr[on_edge]))
+
+        # Одна гистограмма (тикер, зона) на все тикеры
+        flat_idx = ticker_idx * MAX_PRICE_ZONES + zone_idx
+        size = num_tickers * MAX_PRICE_ZONES
+        zone_volumes = np.bincount(flat_idx, weights=volumes_arr, minlength=size).reshape(num_tickers, -1)
+        counts = np.bincount(flat_idx, minlength=size).reshape(num_tickers, -1)
+        centers = (bins[:, :-1] + bins[:, 1:]) / 2
+
+        result: List[Optional[List[Dict[str, Any]]]] = []
+        for t in range(num_tickers):
+            if flat[t]:
+                result.append(None)
+                continue
+
+            result.append([
+                {
+                    'price_level': centers[t, i],
+                    'total_volume': zone_volumes[t, i].item(),
+                    'count': counts[t, i].item(),
+                    'price_range': (bins[t, i], bins[t, i + 1])
+                }
+                for i in np.flatnonzero(zone_volumes[t, :num_bins[t]] > 0).tolist()
+            ])
 
-        if price_range == 0:
-            # Все цены одинаковые - один кластер
-            total_volume = sum(volumes)
-            return [{
-                'price_level': prices[0],
-                'total_volume': total_volume,
-                'count': len(prices)
-            }]
-
-        # Создаём 20 ценовых зон (биннинг)
-        num_bins = min(20, len(set(prices)))
-        bins = np.linspace(min_price, max_price, num_bins + 1)
-
-        clusters = []
-        for i in range(len(bins) - 1):
-            lower = bins[i]
-            upper = bins[i + 1]
-            center = (lower + upper) / 2
-
-            # Суммируем объём в этой зоне
-            zone_volume = 0
-            count = 0
-
-            for price, volume in zip(prices, volumes):
-                if lower <= price <= upper:
-                    zone_volume += volume
-                    count += 1
-
-            if zone_volume > 0:
-                clusters.append({
-                    'price_level': center,
-                    'total_volume': zone_volume,
-                    'count': count,
-                    'price_range': (lower, upper)
-                })
-
-        return clusters
+        return result
 
     def _find_significant_clusters(self, clusters: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -142,33 +349,31 @@ class VolumeClusterAnalyzer:
         if not clusters:
             return []
 
-        # Сортируем по объёму (по убыванию)
-        sorted_clusters = sorted(clusters, key=lambda x: x['total_volume'], reverse=True)
-
-        # Рассчитываем общий объём
-        total_volume = sum(c['total_volume'] for c in sorted_clusters)
+        # Объёмы кластеров одним массивом и общий объём
+        volumes = np.fromiter((c['total_volume'] for c in clusters), dtype=np.float64, count=len(clusters))
+        total_volume = volumes.sum()
+        if total_volume <= 0:
+            return []
 
         # Оставляем только значимые кластеры (мин. доля объёма)
-        significant_clusters = []
-        for cluster in sorted_clusters:
-            volume_share = cluster['total_volume'] / total_volume if total_volume > 0 else 0
+        significant = np.flatnonzero(volumes / total_volume >= self.min_volume_share)
 
-            if volume_share >= self.min_volume_share:
-                cluster['volume_percentage'] = volume_share * 100
-                significant_clusters.append(cluster)
+        # Берём топ-N по объёму (по убыванию; при равенстве - в исходном порядке)
+        top = significant[np.argsort(-volumes[significant], kind='stable')[:self.num_clusters]]
 
-        # Берём топ-N наиболее значимых
-        top_clusters = significant_clusters[:self.num_clusters]
+        # Проценты - относительно отобранных кластеров
+        top_volumes = volumes[top]
+        percentages = (top_volumes / top_volumes.sum() * 100).tolist()
 
-        # Пересчитываем проценты относительно отобранных кластеров
-        selected_volume = sum(c['total_volume'] for c in top_clusters)
-        for cluster in top_clusters:
-            if selected_volume > 0:
-                cluster['volume_percentage'] = (cluster['total_volume'] / selected_volume) * 100
+        top_clusters = []
+        for index, percentage in zip(top.tolist(), percentages):
+            cluster = clusters[index]
+            cluster['volume_percentage'] = percentage
+            top_clusters.append(cluster)
 
         return top_clusters
 
-    def _assign_roles(self, clusters: List[Dict[str, Any]], prices: List[float]) -> List[VolumeCluster]:
+    def _assign_roles(self, clusters: List[Dict[str, Any]], prices: ArrayLike) -> List[VolumeCluster]:
         """
         Определение роли каждого уровня (поддержка/сопротивление).
 
@@ -179,37 +384,38 @@ class VolumeClusterAnalyzer:
         Returns:
             Кластеры с определёнными ролями
         """
-        if not prices or not clusters:
+        if len(prices) == 0 or not clusters:
             return []
 
         current_price = prices[-1]
-        result = []
-
-        for cluster in clusters:
-            price_level = cluster['price_level']
-            volume_percentage = cluster.get('volume_percentage', 0)
-            total_volume = cluster['total_volume']
-
-            # Определяем роль на основе позиции относительно текущей цены
-            if price_level < current_price:
-                role = 'support'  # Уровень поддержки
-            elif price_level > current_price:
-                role = 'resistance'  # Уровень сопротивления
-            else:
-                role = 'neutral'  # Текущий уровень
-
-            # Рассчитываем значимость (чем больше объём, тем значимее)
-            significance = min(volume_percentage / 100 * 2, 1.0)  # Нормализуем к 0-1
-
-            result.append(VolumeCluster(
+        price_levels = [cluster['price_level'] for cluster in clusters]
+        volume_percentages = [cluster.get('volume_percentage', 0) for cluster in clusters]
+        levels = np.asarray(price_levels, dtype=np.float64)
+
+        # Роль по позиции относительно текущей цены:
+        # ниже - поддержка, выше - сопротивление, на уровне - нейтральный
+        roles = np.select(
+            [levels < current_price, levels > current_price],
+            ['support', 'resistance'],
+            default='neutral'
+        ).tolist()
+
+        # Значимость: чем больше объём, тем значимее (нормализуем к 0-1)
+        significances = np.minimum(
+            np.asarray(volume_percentages, dtype=np.float64) / 100 * 2, 1.0
+        ).tolist()
+
+        return [
+            VolumeCluster(
                 price_level=price_level,
                 volume_percentage=volume_percentage,
-                total_volume=total_volume,
+                total_volume=cluster['total_volume'],
                 role=role,
                 significance=significance
-            ))
-
-        return result
+            )
+            for cluster, price_level, volume_percentage, role, significance
+            in zip(clusters, price_levels, volume_percentages, roles, significances)
+        ]
 
     def get_clusters_summary(self, clusters: List[VolumeCluster]) -> str:
         """
@@ -224,23 +430,19 @@ class VolumeClusterAnalyzer:
         if not clusters:
             return "Кластеры объёма не обнаружены"
 
-        summary = "📊 **КЛЮЧЕВЫЕ УРОВНИ ОБЪЁМА:**\n\n"
+        parts = ["📊 **КЛЮЧЕВЫЕ УРОВНИ ОБЪЁМА:**\n\n"]
 
         for i, cluster in enumerate(clusters, 1):
-            role_emoji = {
-                'support': '🟢',
-                'resistance': '🔴',
-                'neutral': '🟡'
-            }.get(cluster.role, '⚪')
+            role_emoji = self._ROLE_EMOJI.get(cluster.role, '⚪')
 
-            summary += (
+            parts.append(
                 f"{i}. {role_emoji} **{cluster.price_level:.2f}₽** "
                 f"({cluster.role})\n"
                 f"   • Доля объёма: {cluster.volume_percentage:.1f}%\n"
                 f"   • Значимость: {cluster.significance:.2f}/1.0\n"
             )
 
-        return summary
+        return "".join(parts)
 
 
 # ============================================================================
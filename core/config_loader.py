@@ -1,6 +1,6 @@
 """
 Модуль загрузки конфигурации для Паникёра 3000.
-Загружает настройки из YAML файлов с использованием ruamel.yaml.
+Загружает настройки из YAML файлов с использованием PyYAML (libyaml, если доступна).
 """
 
 # ============================================================================
@@ -8,15 +8,26 @@
 # ============================================================================
 import os
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Set, Tuple
 import logging
-from ruamel.yaml import YAML
+import yaml
+
+# C-реализация (libyaml) разбирает YAML на порядок быстрее чистого Python
+try:
+    from yaml import CSafeLoader as YamlLoader, CSafeDumper as YamlDumper
+except ImportError:
+    from yaml import SafeLoader as YamlLoader, SafeDumper as YamlDumper
 
 # ============================================================================
 # НАСТРОЙКА ЛОГГИРОВАНИЯ
 # ============================================================================
 logger = logging.getLogger(__name__)
-yaml = YAML()
+
+# Маркер отсутствующей настройки в кэше get_setting
+_MISSING = object()
+
+# Директории конфигов, уже созданные/проверенные в этом процессе
+_VERIFIED_DIRS: Set[Path] = set()
 
 
 # ============================================================================
@@ -28,6 +39,10 @@ class ConfigLoader:
     Обеспечивает доступ к настройкам проекта.
     """
 
+    # Фиксированный набор атрибутов: без __dict__, доступ к настройкам - по слотам
+    __slots__ = ('config_dir', 'settings', '_setting_cache', '_tickers',
+                 'panic_thresholds', '_panic_flat', '_telegram_commands')
+
     # ------------------------------------------------------------------------
     # ИНИЦИАЛИЗАЦИЯ
     # ------------------------------------------------------------------------
@@ -41,8 +56,11 @@ class ConfigLoader:
         self._setup_logging()
         self.config_dir = self._get_config_dir(config_path)
         self.settings = {}
-        self.tickers = {}
+        self._setting_cache: Dict[str, Any] = {}  # 'a.b.c' -> значение (или _MISSING)
         self.panic_thresholds = {}
+        self._panic_flat: Dict[Tuple[str, str], Any] = {}  # (уровень, тип порога) -> значение
+        self._tickers: Optional[Dict[str, Any]] = None  # Читаются при первом обращении
+        self._telegram_commands: Optional[Dict[str, Any]] = None
 
         self._load_all_configs()
         logger.info("ConfigLoader инициализирован")
@@ -79,8 +97,10 @@ class ConfigLoader:
             project_root = current_file.parent.parent
             path = project_root / "config"
 
-        # Создаём директорию, если её нет
-        path.mkdir(parents=True, exist_ok=True)
+        # Создаём директорию, если её нет (один раз на процесс)
+        if path not in _VERIFIED_DIRS:
+            path.mkdir(parents=True, exist_ok=True)
+            _VERIFIED_DIRS.add(path)
         logger.info(f"Директория конфигов: {path}")
 
         return path
@@ -89,34 +109,37 @@ class ConfigLoader:
     # ЗАГРУЗКА ВСЕХ КОНФИГОВ
     # ------------------------------------------------------------------------
     def _load_all_configs(self):
-        """Загрузка всех конфигурационных файлов"""
-        try:
-            self.settings = self._load_config_file("settings.yaml", self._get_default_settings())
-            self.tickers = self._load_config_file("tickers.yaml", self._get_default_tickers())
-            self.panic_thresholds = self._load_config_file("panic_thresholds.yaml",
-                                                           self._get_default_panic_thresholds())
-            self._telegram_commands = self._load_config_file("telegram_commands.yaml", {})
-            logger.info("Все конфигурационные файлы загружены")
-
-        except Exception as e:
-            logger.error(f"Ошибка загрузки конфигурации: {e}")
-            raise
-
-    def _load_all_configs(self):
-        """Загрузка всех конфигурационных файлов"""
+        """
+        Загрузка конфигурационных файлов.
+        settings и panic_thresholds нужны сразу; tickers.yaml и telegram_commands.yaml
+        читаются при первом обращении (см. tickers и load_telegram_commands).
+        """
         try:
             self.settings = self._load_config_file("settings.yaml", self._get_default_settings())
-            self.tickers = self._load_config_file("tickers.yaml", self._get_default_tickers())
             self.panic_thresholds = self._load_config_file("panic_thresholds.yaml",
                                                            self._get_default_panic_thresholds())
-            self._telegram_commands = self._load_config_file("telegram_commands.yaml", {})
+            self._panic_flat = self._flatten_panic_thresholds(self.panic_thresholds)
+            self._tickers = None
+            self._telegram_commands = None
+            self._setting_cache.clear()
 
-            logger.info("Все конфигурационные файлы загружены")
+            logger.info("Основные конфигурационные файлы загружены")
 
         except Exception as e:
             logger.error(f"Ошибка загрузки конфигурации: {e}")
             raise
 
+    @staticmethod
+    def _flatten_panic_thresholds(panic_thresholds: Dict[str, Any]) -> Dict[Tuple[str, str], Any]:
+        """Пороги паники одним словарём: (уровень, тип порога) -> значение"""
+        levels = panic_thresholds.get("panic_thresholds") or {}
+        return {
+            (level, threshold_type): value
+            for level, level_thresholds in levels.items()
+            if isinstance(level_thresholds, dict)
+            for threshold_type, value in level_thresholds.items()
+        }
+
     # ------------------------------------------------------------------------
     # ЗАГРУЗКА КОНФИГУРАЦИОННОГО ФАЙЛА
     # ------------------------------------------------------------------------
@@ -140,8 +163,9 @@ class ConfigLoader:
             return default_config
 
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                config = yaml.load(f)
+            # Байты отдаём парсеру напрямую: кодировку libyaml определяет сама
+            with open(filepath, 'rb') as f:
+                config = yaml.load(f.read(), Loader=YamlLoader)
 
             if not config:
                 logger.warning(f"Файл {filename} пуст, используем дефолтные значения")
@@ -167,7 +191,7 @@ class ConfigLoader:
         """
         try:
             with open(filepath, 'w', encoding='utf-8') as f:
-                yaml.dump(config, f)
+                yaml.dump(config, f, Dumper=YamlDumper, sort_keys=False, allow_unicode=True)
 
             logger.info(f"Файл {filepath.name} сохранён с дефолтными значениями")
 
@@ -184,7 +208,8 @@ class ConfigLoader:
             "telegram": {
                 "token": "${TELEGRAM_TOKEN}",
                 "alert_cooldown": 7200,
-                "daily_report_time": "18:30"
+                "daily_report_time": "18:30",
+                "verbose_overheat": True
             },
             "tinkoff": {
                 "token": "${TINKOFF_API_TOKEN}",
@@ -247,6 +272,14 @@ class ConfigLoader:
     # ------------------------------------------------------------------------
     # ПУБЛИЧНЫЕ МЕТОДЫ
     # ------------------------------------------------------------------------
+    def reload(self):
+        """
+        Перечитать конфигурационные файлы с диска.
+        Экземпляр из get_config() общий, поэтому новые значения сразу видят все модули.
+        """
+        self._load_all_configs()
+        logger.info("Конфигурация перечитана")
+
     def get_setting(self, key: str, default: Any = None) -> Any:
         """
         Получение значения настройки.
@@ -258,17 +291,35 @@ class ConfigLoader:
         Returns:
             Any: Значение настройки
         """
+        # Путь по ключу разбираем один раз, дальше - поиск в словаре
+        try:
+            value = self._setting_cache[key]
+        except KeyError:
+            value = self._setting_cache[key] = self._resolve_setting(key)
+
+        if value is _MISSING:
+            logger.debug(f"Настройка '{key}' не найдена, возвращаем дефолт: {default}")
+            return default
+        return value
+
+    def _resolve_setting(self, key: str) -> Any:
+        """Значение настройки по ключу через точку или _MISSING"""
         try:
-            keys = key.split('.')
             value = self.settings
 
-            for k in keys:
+            for k in key.split('.'):
                 value = value[k]
 
             return value
         except (KeyError, TypeError):
-            logger.debug(f"Настройка '{key}' не найдена, возвращаем дефолт: {default}")
-            return default
+            return _MISSING
+
+    @property
+    def tickers(self) -> Dict[str, Any]:
+        """Содержимое tickers.yaml (читается при первом обращении)"""
+        if self._tickers is None:
+            self._tickers = self._load_config_file("tickers.yaml", self._get_default_tickers())
+        return self._tickers
 
     def get_tickers(self) -> list:
         """Получение списка тикеров"""
@@ -285,13 +336,7 @@ class ConfigLoader:
         Returns:
             Any: Значение порога
         """
-        try:
-            thresholds = self.panic_thresholds.get("panic_thresholds", {})
-            level_thresholds = thresholds.get(level, {})
-            return level_thresholds.get(threshold_type)
-        except KeyError:
-            logger.warning(f"Порог не найден: level={level}, type={threshold_type}")
-            return None
+        return self._panic_flat.get((level, threshold_type))
 
     # ------------------------------------------------------------------------
     # МЕТОДЫ ЗАГРУЗКИ КОНФИГОВ
@@ -312,9 +357,9 @@ class ConfigLoader:
         Returns:
             Dict[str, Any]: Команды Telegram
         """
-        if hasattr(self, '_telegram_commands'):
-            return self._telegram_commands
-        return {}
+        if self._telegram_commands is None:
+            self._telegram_commands = self._load_config_file("telegram_commands.yaml", {})
+        return self._telegram_commands
 
     def load_settings(self) -> Dict[str, Any]:
         """
@@ -337,11 +382,20 @@ class ConfigLoader:
 # ============================================================================
 # ФУНКЦИИ ДЛЯ УДОБСТВА
 # ============================================================================
+_config_instance: Optional[ConfigLoader] = None
+
+
 def get_config() -> ConfigLoader:
     """
-    Функция для получения экземпляра ConfigLoader.
+    Функция для получения глобального экземпляра ConfigLoader.
+
+    Конфигурация читается с диска при первом вызове, дальше возвращается
+    тот же экземпляр.
 
     Returns:
         ConfigLoader: Экземпляр загрузчика конфигурации
     """
-    return ConfigLoader()
\ No newline at end of file
+    global _config_instance
+    if _config_instance is None:
+        _config_instance = ConfigLoader()
+    return _config_instance
\ No newline at end of file
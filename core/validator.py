@@ -64,7 +64,7 @@ except ImportError:
     print("⚠️  Используется SimpleStatistics (fallback)")
 
 from core.panic_detector import PanicDetector
-from core.config_loader import ConfigLoader
+from core.config_loader import ConfigLoader, get_config
 from data.tinkoff_client import TinkoffClient
 from data.data_cache import DataCache
 
@@ -162,7 +162,7 @@ class StrategyValidator:
 
     def __init__(self, config_loader: Optional[ConfigLoader] = None):
         """Инициализация валидатора"""
-        self.config_loader = config_loader or ConfigLoader()
+        self.config_loader = config_loader or get_config()
         self.panic_detector = PanicDetector(config_loader=self.config_loader)
         self.tinkoff_client = TinkoffClient()
         self.data_cache = DataCache()
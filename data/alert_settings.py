@@ -0,0 +1,143 @@
+# panicker3000/data/alert_settings.py
+"""
+Хранение настроек бота: автооповещения (/alerts on/off) по пользователям
+и подробный /overheat (/settings verbose on/off) по чатам.
+Чтение идёт из памяти, запись на диск - отложенными пачками в SQLite (WAL).
+"""
+
+# ============================================================================
+# ИМПОРТЫ
+# ============================================================================
+import logging
+import os
+import queue
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# КОНСТАНТЫ
+# ============================================================================
+DEFAULT_DB_NAME = "alert_settings.db"
+FLUSH_INTERVAL = 1.0  # Период записи накопленных изменений на диск (секунды)
+
+# Настройка -> (таблица, ключевой столбец)
+SETTING_TABLES = {
+    'alerts': ('alert_settings', 'user_id'),
+    'verbose_overheat': ('verbose_overheat_settings', 'chat_id'),
+}
+
+
+# ============================================================================
+# КЛАСС AlertSettingsStore
+# ============================================================================
+class AlertSettingsStore:
+    """
+    Включены ли автооповещения у пользователя и подробный /overheat в чате.
+
+    Все настройки загружаются из БД при старте и читаются из словарей.
+    Переключение сразу меняет словарь и ставит запись в очередь; фоновый
+    поток раз в FLUSH_INTERVAL сохраняет накопленное одним executemany,
+    поэтому серия нажатий /alerts не превращается в серию транзакций.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_NAME, flush_interval: float = FLUSH_INTERVAL):
+        """
+        Args:
+            db_path: Файл БД (относительный путь - от каталога data)
+            flush_interval: Период записи изменений на диск (секунды)
+        """
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        self.db_path = os.path.join(current_dir, db_path)
+        self.flush_interval = flush_interval
+
+        self._pending: "queue.Queue[Tuple[str, int, bool, str]]" = queue.Queue()
+        self._stop = threading.Event()
+
+        # Соединение после инициализации использует только поток записи
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._state: Dict[str, Dict[int, bool]] = {}
+        for setting, (table, key_column) in SETTING_TABLES.items():
+            self._conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    {key_column} INTEGER PRIMARY KEY,
+                    enabled INTEGER NOT NULL,
+                    updated_at TEXT NOT NULL
+                )
+            """)
+            self._state[setting] = {
+                key: bool(enabled)
+                for key, enabled in self._conn.execute(f"SELECT {key_column}, enabled FROM {table}")
+            }
+        self._conn.commit()
+
+        logger.info("✅ Настройки загружены: уведомления - %d пользователей, подробный /overheat - %d чатов",
+                    len(self._state['alerts']), len(self._state['verbose_overheat']))
+
+        self._writer = threading.Thread(
+            target=self._write_loop, name='alert-settings-writer', daemon=True
+        )
+        self._writer.start()
+
+    def is_enabled(self, user_id: int) -> bool:
+        """Включены ли уведомления (по умолчанию - включены)"""
+        return self._state['alerts'].get(user_id, True)
+
+    def set_enabled(self, user_id: int, enabled: bool):
+        """Включить/выключить уведомления пользователя"""
+        self._set('alerts', user_id, enabled)
+
+    def get_verbose_overheat(self, chat_id: int, default: bool) -> bool:
+        """Подробный /overheat в чате (если чат не менял - default)"""
+        return self._state['verbose_overheat'].get(chat_id, default)
+
+    def set_verbose_overheat(self, chat_id: int, enabled: bool):
+        """Включить/выключить подробный /overheat в чате"""
+        self._set('verbose_overheat', chat_id, enabled)
+
+    def _set(self, setting: str, key: int, enabled: bool):
+        """Изменить настройку: сразу в памяти, на диск - со следующей пачкой"""
+        self._state[setting][key] = enabled
+        self._pending.put((setting, key, enabled, datetime.now().isoformat()))
+
+    def _write_loop(self):
+        """Фоновая запись накопленных изменений"""
+        while not self._stop.wait(self.flush_interval):
+            self._flush()
+
+    def _flush(self):
+        """Записать все изменения из очереди одной транзакцией"""
+        latest: Dict[Tuple[str, int], Tuple[int, bool, str]] = {}
+        while True:
+            try:
+                setting, key, enabled, updated_at = self._pending.get_nowait()
+            except queue.Empty:
+                break
+            # Для пользователя/чата важно только последнее переключение
+            latest[(setting, key)] = (key, enabled, updated_at)
+
+        if not latest:
+            return
+
+        try:
+            with self._conn:
+                for setting, (table, key_column) in SETTING_TABLES.items():
+                    rows = [row for (name, _), row in latest.items() if name == setting]
+                    if rows:
+                        self._conn.executemany(
+                            f"INSERT OR REPLACE INTO {table} ({key_column}, enabled, updated_at) VALUES (?, ?, ?)",
+                            rows
+                        )
+        except sqlite3.Error as e:
+            logger.error("❌ Ошибка сохранения настроек: %s", e)
+
+    def close(self):
+        """Остановить поток записи и сохранить оставшиеся изменения"""
+        self._stop.set()
+        self._writer.join()
+        self._flush()
+        self._conn.close()
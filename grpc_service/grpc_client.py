@@ -8,7 +8,11 @@ gRPC клиент для взаимодействия с сервером Пан
 # ИМПОРТЫ
 # ============================================================================
 import grpc
+import itertools
 import logging
+import queue
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 from typing import List, Dict, Any, Optional, Union
 from datetime import datetime, timedelta
 import time
@@ -61,6 +65,244 @@ except ImportError as e:
 
 logger = logging.getLogger(__name__)
 
+# Таймаут ожидания ответа в потоке ScanStream (секунды)
+SCAN_STREAM_TIMEOUT = 30.0
+
+# Не чаще одной попытки переоткрыть оборванный ScanStream за интервал (секунды)
+SCAN_STREAM_REOPEN_INTERVAL = 30.0
+
+# Окно сбора запросов топа/статистики в один BatchGetSignals (секунды)
+REQUEST_BATCH_WINDOW = 0.001
+
+# Названия уровней и типов сигнала из proto (строятся один раз на модуль)
+if panicker_pb2 is not None:
+    _LEVEL_NAMES = {
+        panicker_pb2.PanicSignal.STRONG: '🔴 СИЛЬНЫЙ',
+        panicker_pb2.PanicSignal.MODERATE: '🟡 ХОРОШИЙ',
+        panicker_pb2.PanicSignal.URGENT: '⚪ СРОЧНЫЙ',
+        panicker_pb2.PanicSignal.IGNORE: '❌ ИГНОРИРОВАТЬ'
+    }
+    _SIGNAL_TYPE_NAMES = {
+        panicker_pb2.PanicSignal.PANIC: 'ПАНИКА',
+        panicker_pb2.PanicSignal.GREED: 'ЖАДНОСТЬ',
+        panicker_pb2.PanicSignal.NEUTRAL: 'НЕЙТРАЛЬНО'
+    }
+else:
+    _LEVEL_NAMES = {}
+    _SIGNAL_TYPE_NAMES = {}
+
+# Keepalive для долгоживущего канала: соединение не простаивает до обрыва
+# и не требует нового рукопожатия после паузы в запросах
+CHANNEL_OPTIONS = [
+    ('grpc.keepalive_time_ms', 20000),
+    ('grpc.keepalive_timeout_ms', 10000),
+    ('grpc.keepalive_permit_without_calls', 1),
+    ('grpc.http2.max_pings_without_data', 0),
+]
+
+
+# ============================================================================
+# КЛАСС ScanStream - ДОЛГОЖИВУЩИЙ ПОТОК СКАНИРОВАНИЯ
+# ============================================================================
+class ScanStream:
+    """
+    Двунаправленный поток PanickerService.ScanStream.
+
+    Все запросы сканирования идут через один HTTP/2 поток вместо отдельного
+    unary-вызова на каждый запрос. Ответы сопоставляются с запросами по
+    request_id, поэтому scan() можно вызывать из нескольких потоков.
+    """
+
+    _CLOSE = object()
+
+    def __init__(self, stub, timeout: float = SCAN_STREAM_TIMEOUT):
+        """
+        Args:
+            stub: PanickerServiceStub
+            timeout: Таймаут ожидания ответа на один запрос (секунды)
+        """
+        self.timeout = timeout
+        self._requests: "queue.Queue" = queue.Queue()
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._closed = False
+
+        self._call = stub.ScanStream(self._request_iterator())
+        self._reader = threading.Thread(
+            target=self._read_responses, name="scan-stream-reader", daemon=True
+        )
+        self._reader.start()
+
+    @property
+    def is_active(self) -> bool:
+        """Поток открыт и может принимать запросы"""
+        return not self._closed
+
+    def scan(self, request):
+        """Отправить ScanRequest в поток и дождаться соответствующего ScanResponse"""
+        if self._closed:
+            raise RuntimeError("поток ScanStream закрыт")
+
+        request_id = str(next(self._ids))
+        request.request_id = request_id
+        future = Future()
+
+        with self._lock:
+            # Проверка под замком: поток мог закрыться после проверки выше
+            if self._closed:
+                raise RuntimeError("поток ScanStream закрыт")
+            self._pending[request_id] = future
+        self._requests.put(request)
+
+        try:
+            return future.result(timeout=self.timeout)
+        finally:
+            with self._lock:
+                self._pending.pop(request_id, None)
+
+    def close(self):
+        """Закрыть поток"""
+        self._closed = True
+        self._requests.put(self._CLOSE)
+        self._call.cancel()
+
+    def _request_iterator(self):
+        """Итератор запросов, который gRPC читает из отдельного потока"""
+        while True:
+            request = self._requests.get()
+            if request is self._CLOSE:
+                return
+            yield request
+
+    def _read_responses(self):
+        """Чтение ответов сервера и передача их ожидающим запросам"""
+        error: Exception = RuntimeError("поток ScanStream завершён сервером")
+        try:
+            for response in self._call:
+                with self._lock:
+                    future = self._pending.pop(response.request_id, None)
+                if future is not None:
+                    future.set_result(response)
+        except grpc.RpcError as e:
+            if not self._closed:
+                logger.warning("Поток ScanStream прерван: %s", e)
+            error = e
+        finally:
+            self._closed = True
+            with self._lock:
+                pending = list(self._pending.values())
+                self._pending.clear()
+            for future in pending:
+                if not future.done():
+                    future.set_exception(error)
+
+
+# ============================================================================
+# КЛАСС RequestBatcher - ОБЪЕДИНЕНИЕ ОДНОВРЕМЕННЫХ ЗАПРОСОВ
+# ============================================================================
+class RequestBatcher:
+    """
+    Объединение запросов топа/статистики от разных пользователей.
+
+    Запросы, пришедшие в течение окна (1 мс), уходят одним вызовом
+    BatchGetSignals; одинаковые запросы выполняются один раз, и результат
+    получают все ожидающие. Результат общий - вызывающие его не изменяют.
+    """
+
+    _STOP = object()
+
+    def __init__(self, batch_func, window: float = REQUEST_BATCH_WINDOW):
+        """
+        Args:
+            batch_func: Функция пакетного запроса (GrpcClient.batch)
+            window: Окно сбора запросов (секунды)
+        """
+        self.batch_func = batch_func
+        self.window = window
+        self._queue: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, query: Dict[str, Any]) -> Future:
+        """Поставить запрос в очередь, результат придёт в Future"""
+        future = Future()
+
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="grpc-request-batcher", daemon=True
+                )
+                self._thread.start()
+
+        self._queue.put((query, future))
+        return future
+
+    def stop(self):
+        """Остановить фоновый поток после обработки уже поставленных запросов"""
+        with self._lock:
+            if self._thread is not None:
+                self._queue.put(self._STOP)
+                self._thread = None
+
+    def _run(self):
+        """Фоновый цикл: ждём первый запрос, добираем остальные за окно и отправляем"""
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                return
+
+            time.sleep(self.window)
+
+            pending = [item]
+            stopping = False
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    stopping = True
+                    break
+                pending.append(item)
+
+            try:
+                self._dispatch(pending)
+            except Exception as e:
+                # Поток батчера не должен умирать из-за одного плохого пакета
+                logger.error("❌ Ошибка обработки пакета запросов: %s", e)
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+            if stopping:
+                return
+
+    def _dispatch(self, pending):
+        """Один пакетный вызов на все ожидающие запросы"""
+        queries = []
+        positions: Dict[tuple, int] = {}
+        waiters = []
+
+        for query, future in pending:
+            key = tuple(sorted(query.items()))
+            if key not in positions:
+                positions[key] = len(queries)
+                queries.append(query)
+            waiters.append((positions[key], future))
+
+        try:
+            results = self.batch_func(queries)
+            if len(results) != len(queries):
+                raise RuntimeError(
+                    f"BatchGetSignals вернул {len(results)} ответов на {len(queries)} запросов"
+                )
+            for position, future in waiters:
+                future.set_result(results[position])
+        except Exception as e:
+            for _, future in waiters:
+                if not future.done():
+                    future.set_exception(e)
+
 
 # ============================================================================
 # КЛАСС GrpcClient
@@ -81,14 +323,23 @@ class GrpcClient:
         """
         self.host = host
         self.port = port
-        self.channel = grpc.insecure_channel(f'{host}:{port}')
+        self.channel = grpc.insecure_channel(f'{host}:{port}', options=CHANNEL_OPTIONS)
 
         # Создаём заглушки для всех сервисов
         self.panicker_stub = panicker_pb2_grpc.PanickerServiceStub(self.channel)
         self.market_stub = panicker_pb2_grpc.MarketDataServiceStub(self.channel)
         self.signals_stub = panicker_pb2_grpc.SignalsServiceStub(self.channel)
 
-        logger.info(f"gRPC клиент подключён к {host}:{port}")
+        # Поток ScanStream открывается явно через open_scan_stream()
+        # и переоткрывается в _scan после обрыва (не чаще SCAN_STREAM_REOPEN_INTERVAL)
+        self.scan_stream: Optional[ScanStream] = None
+        self._scan_stream_enabled = False
+        self._scan_stream_retry_at = 0.0
+
+        # Одновременные запросы топа/статистики уходят одним BatchGetSignals
+        self.request_batcher = RequestBatcher(self.batch)
+
+        logger.info("gRPC клиент подключён к %s:%s", host, port)
 
     # ------------------------------------------------------------------------
     # МЕТОДЫ PanickerService
@@ -103,7 +354,7 @@ class GrpcClient:
         Returns:
             Словарь с данными индекса перегрева
         """
-        logger.info(f"Запрос индекса перегрева для {ticker}")
+        logger.info("Запрос индекса перегрева для %s", ticker)
 
         try:
             response = self.panicker_stub.GetOverheatIndex(
@@ -120,26 +371,33 @@ class GrpcClient:
             }
 
         except grpc.RpcError as e:
-            logger.error(f"gRPC ошибка при запросе индекса перегрева {ticker}: {e}")
+            logger.error("gRPC ошибка при запросе индекса перегрева %s: %s", ticker, e)
             return self._get_default_overheat_response(ticker)
         except Exception as e:
-            logger.error(f"Ошибка при запросе индекса перегрева {ticker}: {e}")
+            logger.error("Ошибка при запросе индекса перегрева %s: %s", ticker, e)
             return self._get_default_overheat_response(ticker)
 
-    def scan_tickers(self, tickers: List[str], real_time: bool = True) -> List[Union[Dict[str, Any], PanicSignal]]:
+    def scan_tickers(self, tickers: List[str], real_time: bool = True,
+                     raise_on_error: bool = False) -> List[Union[Dict[str, Any], PanicSignal]]:
         """
         Сканирование тикеров на наличие паники/жадности
 
+        Args:
+            tickers: Тикеры для сканирования
+            real_time: Режим реального времени
+            raise_on_error: Пробрасывать ошибку вместо пустого списка -
+                            чтобы вызывающий отличал сбой от "сигналов нет"
+
         Returns:
             Список PanicSignal моделей или словарей (если Pydantic недоступен)
         """
-        logger.info(f"Сканирование {len(tickers)} тикеров (режим: {'real-time' if real_time else 'historical'})")
+        logger.info("Сканирование %s тикеров (режим: %s)", len(tickers), 'real-time' if real_time else 'historical')
 
         try:
             ticker_objs = [panicker_pb2.Ticker(symbol=t) for t in tickers]
             request = panicker_pb2.ScanRequest(tickers=ticker_objs, real_time=real_time)
 
-            response = self.panicker_stub.ScanTickers(request)
+            response = self._scan(request)
 
             signals = []
             for signal in response.signals:
@@ -148,31 +406,85 @@ class GrpcClient:
 
             # Логируем тип возвращаемых данных
             if signals and PYDANTIC_AVAILABLE and isinstance(signals[0], PanicSignal):
-                logger.info(f"✅ Найдено {len(signals)} Pydantic сигналов из {response.total_scanned} тикеров")
+                logger.info("✅ Найдено %s Pydantic сигналов из %s тикеров", len(signals), response.total_scanned)
             else:
-                logger.info(f"⚠️ Найдено {len(signals)} dict сигналов из {response.total_scanned} тикеров")
+                logger.info("⚠️ Найдено %s dict сигналов из %s тикеров", len(signals), response.total_scanned)
 
             return signals
 
         except grpc.RpcError as e:
-            logger.error(f"gRPC ошибка при сканировании: {e}")
+            logger.error("gRPC ошибка при сканировании: %s", e)
+            if raise_on_error:
+                raise
             return []
         except Exception as e:
-            logger.error(f"Ошибка при сканировании: {e}")
+            logger.error("Ошибка при сканировании: %s", e)
+            if raise_on_error:
+                raise
             return []
 
-    def get_signal_history(self, ticker: str, days_back: int = 7) -> List[Dict[str, Any]]:
+    def open_scan_stream(self) -> bool:
+        """
+        Открыть долгоживущий поток ScanStream для scan_tickers
+
+        Returns:
+            True если поток открыт
+        """
+        self._scan_stream_enabled = True
+        self._scan_stream_retry_at = time.monotonic() + SCAN_STREAM_REOPEN_INTERVAL
+
+        if self.scan_stream is not None and self.scan_stream.is_active:
+            return True
+
+        try:
+            self.scan_stream = ScanStream(self.panicker_stub)
+            logger.info("Поток ScanStream открыт")
+            return True
+        except Exception as e:
+            logger.warning("Не удалось открыть поток ScanStream: %s", e)
+            self.scan_stream = None
+            return False
+
+    def _scan(self, request):
+        """
+        Сканирование через ScanStream с откатом на unary ScanTickers.
+
+        Откат только при закрытом или оборванном потоке. По таймауту сервер
+        ещё выполняет запрос, и повтор через ScanTickers удвоил бы работу.
+        Оборванный поток переоткрывается не чаще SCAN_STREAM_REOPEN_INTERVAL,
+        чтобы не дозваниваться заново на каждый запрос к серверу без ScanStream.
+        """
+        stream = self.scan_stream
+        if (self._scan_stream_enabled
+                and (stream is None or not stream.is_active)
+                and time.monotonic() >= self._scan_stream_retry_at):
+            logger.info("Поток ScanStream неактивен, переоткрываем")
+            self.open_scan_stream()
+            stream = self.scan_stream
+        if stream is not None and stream.is_active:
+            try:
+                return stream.scan(request)
+            except FutureTimeoutError:
+                logger.warning("Таймаут ответа ScanStream (%s с)", stream.timeout)
+                raise
+            except Exception as e:
+                logger.warning("Ошибка ScanStream, используем unary ScanTickers: %s", e)
+
+        return self.panicker_stub.ScanTickers(request)
+
+    def get_signal_history(self, ticker: str, days_back: int = 7, limit: int = 100) -> List[Dict[str, Any]]:
         """
         Получить историю сигналов для тикера
 
         Args:
             ticker: Тикер акции
             days_back: Количество дней истории
+            limit: Максимальное количество сигналов
 
         Returns:
             Список исторических сигналов
         """
-        logger.info(f"Запрос истории сигналов для {ticker} за {days_back} дней")
+        logger.info("Запрос истории сигналов для %s за %s дней", ticker, days_back)
 
         try:
             end_date = datetime.now().isoformat()
@@ -181,7 +493,7 @@ class GrpcClient:
             request = panicker_pb2.HistoryRequest(
                 ticker=ticker,
                 days_back=days_back,
-                limit=100
+                limit=limit
             )
 
             response = self.panicker_stub.GetSignalHistory(request)
@@ -190,16 +502,37 @@ class GrpcClient:
             for signal in response.signals:
                 signals.append(self._convert_signal_from_proto(signal))
 
-            logger.info(f"Получено {len(signals)} исторических сигналов")
+            logger.info("Получено %s исторических сигналов", len(signals))
             return signals
 
         except grpc.RpcError as e:
-            logger.error(f"gRPC ошибка при запросе истории: {e}")
+            logger.error("gRPC ошибка при запросе истории: %s", e)
             return []
         except Exception as e:
-            logger.error(f"Ошибка при запросе истории: {e}")
+            logger.error("Ошибка при запросе истории: %s", e)
             return []
 
+    def get_signal_history_async(self, ticker: str, days_back: int = 7, limit: int = 100) -> Future:
+        """
+        История сигналов без блокировки вызывающего потока
+        (результат - как у get_signal_history, см. get_candles_async)
+        """
+        future = Future()
+        request = panicker_pb2.HistoryRequest(ticker=ticker, days_back=days_back, limit=limit)
+
+        def on_done(call):
+            try:
+                future.set_result([self._convert_signal_from_proto(signal) for signal in call.result().signals])
+            except grpc.RpcError as e:
+                logger.error("gRPC ошибка при запросе истории: %s", e)
+                future.set_result([])
+            except Exception as e:
+                logger.error("Ошибка при запросе истории: %s", e)
+                future.set_result([])
+
+        self.panicker_stub.GetSignalHistory.future(request).add_done_callback(on_done)
+        return future
+
     # ------------------------------------------------------------------------
     # МЕТОДЫ MarketDataService
     # ------------------------------------------------------------------------
@@ -213,7 +546,7 @@ class GrpcClient:
         Returns:
             Текущая цена или None при ошибке
         """
-        logger.info(f"Запрос текущей цены для {ticker}")
+        logger.info("Запрос текущей цены для %s", ticker)
 
         try:
             request = panicker_pb2.PriceRequest(tickers=[ticker])
@@ -223,14 +556,14 @@ class GrpcClient:
             if price:
                 return price
             else:
-                logger.warning(f"Цена для {ticker} не найдена в ответе")
+                logger.warning("Цена для %s не найдена в ответе", ticker)
                 return None
 
         except grpc.RpcError as e:
-            logger.error(f"gRPC ошибка при запросе цены {ticker}: {e}")
+            logger.error("gRPC ошибка при запросе цены %s: %s", ticker, e)
             return None
         except Exception as e:
-            logger.error(f"Ошибка при запросе цены {ticker}: {e}")
+            logger.error("Ошибка при запросе цены %s: %s", ticker, e)
             return None
 
     def get_candles(self, ticker: str, interval: str = 'min5', count: int = 100) -> List[Dict[str, Any]]:
@@ -245,7 +578,7 @@ class GrpcClient:
         Returns:
             Список свечей
         """
-        logger.info(f"Запрос свечей для {ticker}, интервал {interval}, количество {count}")
+        logger.info("Запрос свечей для %s, интервал %s, количество %s", ticker, interval, count)
 
         try:
             request = panicker_pb2.CandleRequest(
@@ -256,29 +589,58 @@ class GrpcClient:
 
             response = self.market_stub.GetCandles(request)
 
-            candles = []
-            for candle in response.candles:
-                candles.append({
-                    'ticker': candle.ticker,
-                    'open': candle.open,
-                    'high': candle.high,
-                    'low': candle.low,
-                    'close': candle.close,
-                    'volume': candle.volume,
-                    'timestamp': candle.timestamp,
-                    'interval': candle.interval
-                })
-
-            logger.info(f"Получено {len(candles)} свечей")
+            candles = self._convert_candles_from_proto(response)
+
+            logger.info("Получено %s свечей", len(candles))
             return candles
 
         except grpc.RpcError as e:
-            logger.error(f"gRPC ошибка при запросе свечей {ticker}: {e}")
+            logger.error("gRPC ошибка при запросе свечей %s: %s", ticker, e)
             return []
         except Exception as e:
-            logger.error(f"Ошибка при запросе свечей {ticker}: {e}")
+            logger.error("Ошибка при запросе свечей %s: %s", ticker, e)
             return []
 
+    def get_candles_async(self, ticker: str, interval: str = 'min5', count: int = 100) -> Future:
+        """
+        Свечи без блокировки вызывающего потока (результат - как у get_candles)
+
+        Запрос уходит через future-вызов gRPC, поэтому несколько таких
+        запросов выполняются на канале одновременно.
+        """
+        future = Future()
+        request = panicker_pb2.CandleRequest(ticker=ticker, interval=interval, count=count)
+
+        def on_done(call):
+            try:
+                future.set_result(self._convert_candles_from_proto(call.result()))
+            except grpc.RpcError as e:
+                logger.error("gRPC ошибка при запросе свечей %s: %s", ticker, e)
+                future.set_result([])
+            except Exception as e:
+                logger.error("Ошибка при запросе свечей %s: %s", ticker, e)
+                future.set_result([])
+
+        self.market_stub.GetCandles.future(request).add_done_callback(on_done)
+        return future
+
+    @staticmethod
+    def _convert_candles_from_proto(response) -> List[Dict[str, Any]]:
+        """Конвертация CandleResponse в список словарей"""
+        return [
+            {
+                'ticker': candle.ticker,
+                'open': candle.open,
+                'high': candle.high,
+                'low': candle.low,
+                'close': candle.close,
+                'volume': candle.volume,
+                'timestamp': candle.timestamp,
+                'interval': candle.interval
+            }
+            for candle in response.candles
+        ]
+
     # ------------------------------------------------------------------------
     # МЕТОДЫ SignalsService
     # ------------------------------------------------------------------------
@@ -291,26 +653,24 @@ class GrpcClient:
             limit: Максимальное количество сигналов
 
         Returns:
-            Список топ сигналов
+            Список топ сигналов (плоские словари, см. _signal_dict_from_proto)
         """
-        logger.info(f"Запрос топ-{limit} сигналов за период {period}")
+        logger.info("Запрос топ-%s сигналов за период %s", limit, period)
 
         try:
             request = panicker_pb2.TopRequest(period=period, limit=limit)
             response = self.signals_stub.GetTopSignals(request)
 
-            signals = []
-            for signal in response.top_signals:
-                signals.append(self._convert_signal_from_proto(signal))
+            signals = [self._signal_dict_from_proto(signal) for signal in response.top_signals]
 
-            logger.info(f"Получено {len(signals)} топ сигналов")
+            logger.info("Получено %s топ сигналов", len(signals))
             return signals
 
         except grpc.RpcError as e:
-            logger.error(f"gRPC ошибка при запросе топ сигналов: {e}")
+            logger.error("gRPC ошибка при запросе топ сигналов: %s", e)
             return []
         except Exception as e:
-            logger.error(f"Ошибка при запросе топ сигналов: {e}")
+            logger.error("Ошибка при запросе топ сигналов: %s", e)
             return []
 
     def ignore_ticker(self, ticker: str, duration_hours: int = 2) -> bool:
@@ -324,7 +684,7 @@ class GrpcClient:
         Returns:
             True если успешно, False если ошибка
         """
-        logger.info(f"Игнорирование {ticker} на {duration_hours} часов")
+        logger.info("Игнорирование %s на %s часов", ticker, duration_hours)
 
         try:
             request = panicker_pb2.IgnoreRequest(
@@ -335,17 +695,17 @@ class GrpcClient:
             response = self.signals_stub.IgnoreTicker(request)
 
             if response.success:
-                logger.info(f"Тикер {ticker} игнорируется до {response.ignored_until}")
+                logger.info("Тикер %s игнорируется до %s", ticker, response.ignored_until)
                 return True
             else:
-                logger.warning(f"Не удалось игнорировать {ticker}")
+                logger.warning("Не удалось игнорировать %s", ticker)
                 return False
 
         except grpc.RpcError as e:
-            logger.error(f"gRPC ошибка при игнорировании {ticker}: {e}")
+            logger.error("gRPC ошибка при игнорировании %s: %s", ticker, e)
             return False
         except Exception as e:
-            logger.error(f"Ошибка при игнорировании {ticker}: {e}")
+            logger.error("Ошибка при игнорировании %s: %s", ticker, e)
             return False
 
     # ------------------------------------------------------------------------
@@ -353,54 +713,7 @@ class GrpcClient:
     # ------------------------------------------------------------------------
     def _convert_signal_from_proto(self, signal) -> Union[Dict[str, Any], PanicSignal]:
         """Конвертация сигнала из proto в Pydantic модель (или словарь при ошибке)"""
-        level_map = {
-            panicker_pb2.PanicSignal.STRONG: '🔴 СИЛЬНЫЙ',
-            panicker_pb2.PanicSignal.MODERATE: '🟡 ХОРОШИЙ',
-            panicker_pb2.PanicSignal.URGENT: '⚪ СРОЧНЫЙ',
-            panicker_pb2.PanicSignal.IGNORE: '❌ ИГНОРИРОВАТЬ'
-        }
-
-        signal_type_map = {
-            panicker_pb2.PanicSignal.PANIC: 'ПАНИКА',
-            panicker_pb2.PanicSignal.GREED: 'ЖАДНОСТЬ',
-            panicker_pb2.PanicSignal.NEUTRAL: 'НЕЙТРАЛЬНО'
-        }
-
-        # Базовые поля
-        result = {
-            'ticker': signal.ticker,
-            'signal_type': signal_type_map.get(signal.signal_type, 'НЕИЗВЕСТНО'),
-            'level': level_map.get(signal.level, 'НЕИЗВЕСТНО'),
-            'rsi_14': signal.rsi_14,
-            'rsi_7': signal.rsi_7,
-            'rsi_21': signal.rsi_21,
-            'volume_ratio': signal.volume_ratio,
-            'current_price': signal.current_price,
-            'price': signal.current_price,  # Для совместимости
-            'detected_at': signal.detected_at,
-            'timestamp': datetime.now().isoformat(),
-        }
-
-        # Дополнительные поля (если есть)
-        if hasattr(signal, 'risk_metric'):
-            result['risk_metric'] = signal.risk_metric
-        else:
-            result['risk_metric'] = 0.0
-
-        if hasattr(signal, 'interpretation'):
-            result['interpretation'] = signal.interpretation
-        else:
-            result['interpretation'] = ''
-
-        # Кластеры объёма (если есть)
-        result['volume_clusters'] = []
-        if hasattr(signal, 'volume_clusters'):
-            for cluster in signal.volume_clusters:
-                result['volume_clusters'].append({
-                    'price_level': cluster.price_level,
-                    'volume_percentage': cluster.volume_percentage,
-                    'role': cluster.role
-                })
+        result = self._signal_dict_from_proto(signal)
 
         # ========================================================================
         # ПЫТАЕМСЯ СОЗДАТЬ PYDANTIC МОДЕЛЬ
@@ -409,45 +722,165 @@ class GrpcClient:
             try:
                 is_valid, pydantic_signal, error = validate_panic_signal(result)
                 if is_valid and pydantic_signal:
-                    logger.info(f"✅ Создана Pydantic модель для {signal.ticker}")
+                    logger.info("✅ Создана Pydantic модель для %s", signal.ticker)
                     return pydantic_signal  # Возвращаем PanicSignal
                 else:
-                    logger.warning(f"⚠️ Валидация не прошла для {signal.ticker}: {error}")
+                    logger.warning("⚠️ Валидация не прошла для %s: %s", signal.ticker, error)
                     return result  # Возвращаем словарь как запасной вариант
             except Exception as e:
-                logger.error(f"❌ Ошибка создания Pydantic модели: {e}")
+                logger.error("❌ Ошибка создания Pydantic модели: %s", e)
                 return result  # Возвращаем словарь
 
         # Если Pydantic недоступен, возвращаем словарь
-        logger.info(f"⚠️ Pydantic недоступен, возвращаем dict для {signal.ticker}")
+        logger.info("⚠️ Pydantic недоступен, возвращаем dict для %s", signal.ticker)
         return result
 
+    def _signal_dict_from_proto(self, signal) -> Dict[str, Any]:
+        """
+        Конвертация сигнала из proto в плоский словарь без валидации.
+
+        Топ сигналов из БД всегда отдаётся словарями с одним набором ключей,
+        чтобы бот разбирал их одним путём без проверки типа. Словарь
+        собирается одним литералом: все поля объявлены в proto, поэтому
+        проверки hasattr не нужны.
+        """
+        return {
+            'ticker': signal.ticker,
+            'signal_type': _SIGNAL_TYPE_NAMES.get(signal.signal_type, 'НЕИЗВЕСТНО'),
+            'level': _LEVEL_NAMES.get(signal.level, 'НЕИЗВЕСТНО'),
+            'rsi_14': signal.rsi_14,
+            'rsi_7': signal.rsi_7,
+            'rsi_21': signal.rsi_21,
+            'volume_ratio': signal.volume_ratio,
+            'current_price': signal.current_price,
+            'price': signal.current_price,  # Для совместимости
+            'detected_at': signal.detected_at,
+            'timestamp': datetime.now().isoformat(),
+            'risk_metric': signal.risk_metric,
+            'interpretation': signal.interpretation,
+            # Кластеры объёма
+            'volume_clusters': [
+                {
+                    'price_level': cluster.price_level,
+                    'volume_percentage': cluster.volume_percentage,
+                    'role': cluster.role
+                }
+                for cluster in signal.volume_clusters
+            ],
+        }
+
     def get_stats(self, days: int = 7) -> Dict[str, Any]:
-        logger.info(f"Запрос статистики за {days} дней")
+        logger.info("Запрос статистики за %s дней", days)
 
         try:
             request = panicker_pb2.StatsRequest(days=days)
             response = self.signals_stub.GetStats(request)
 
-            return {
-                'total_signals': response.total_signals,
-                'strong_signals': response.strong_signals,
-                'moderate_signals': response.moderate_signals,
-                'urgent_signals': response.urgent_signals,
-                'most_active_ticker': response.most_active_ticker,
-                'most_active_count': response.most_active_count,
-                'most_calm_ticker': response.most_calm_ticker,
-                'most_calm_count': response.most_calm_count,
-                'market_tension': response.market_tension
-            }
+            return self._convert_stats_from_proto(response)
 
         except grpc.RpcError as e:
-            logger.error(f"gRPC ошибка при запросе статистики: {e}")
+            logger.error("gRPC ошибка при запросе статистики: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Ошибка при запросе статистики: {e}")
+            logger.error("Ошибка при запросе статистики: %s", e)
             raise
 
+    def get_top_signals_async(self, period: str = 'today', limit: int = 5) -> Future:
+        """Топ сигналов через RequestBatcher (результат - как у get_top_signals)"""
+        return self.request_batcher.submit({'kind': 'top', 'period': period, 'limit': limit})
+
+    def get_stats_async(self, days: int = 7) -> Future:
+        """Статистика через RequestBatcher (None, если получить не удалось)"""
+        return self.request_batcher.submit({'kind': 'stats', 'days': days})
+
+    def batch(self, queries: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Несколько запросов топа/статистики за один вызов BatchGetSignals
+
+        Args:
+            queries: Запросы вида {'kind': 'top', 'period': 'today', 'limit': 5}
+                     или {'kind': 'stats', 'days': 7}. Для топа можно указать
+                     'input_from' - индекс предыдущего запроса топа в пакете,
+                     тогда сигналы берутся из его результата.
+
+        Returns:
+            Результаты в порядке запросов: список сигналов для топа,
+            словарь статистики для stats
+        """
+        logger.info("Пакетный запрос: %s запросов", len(queries))
+
+        try:
+            request = panicker_pb2.BatchSignalRequest(
+                queries=[self._build_signal_query(query) for query in queries]
+            )
+            response = self.signals_stub.BatchGetSignals(request)
+
+            results = []
+            for result in response.results:
+                kind = result.WhichOneof('result')
+                if kind == 'top':
+                    results.append([self._signal_dict_from_proto(s) for s in result.top.top_signals])
+                elif kind == 'stats':
+                    results.append(self._convert_stats_from_proto(result.stats))
+                else:
+                    results.append(None)
+            return results
+
+        except grpc.RpcError as e:
+            if e.code() != grpc.StatusCode.UNIMPLEMENTED:
+                # Сервер недоступен или упал - N отдельных запросов тоже не пройдут
+                logger.error("Ошибка BatchGetSignals: %s", e)
+                return [[] if query['kind'] == 'top' else None for query in queries]
+
+            # Сервер без BatchGetSignals - выполняем запросы по одному
+            logger.warning("BatchGetSignals не поддерживается сервером, запросы выполняются по одному")
+
+        results = []
+        for query in queries:
+            if query['kind'] == 'top':
+                source = query.get('input_from')
+                if source is not None and 0 <= source < len(results) and isinstance(results[source], list):
+                    results.append(results[source][:query.get('limit', 5)])
+                else:
+                    results.append(self.get_top_signals(query.get('period', 'today'), query.get('limit', 5)))
+            else:
+                try:
+                    results.append(self.get_stats(query.get('days', 7)))
+                except Exception:
+                    results.append(None)
+        return results
+
+    @staticmethod
+    def _build_signal_query(query: Dict[str, Any]):
+        """Запрос пакета (словарь) -> proto SignalQuery"""
+        if query['kind'] == 'top':
+            signal_query = panicker_pb2.SignalQuery(
+                top=panicker_pb2.TopRequest(period=query.get('period', 'today'), limit=query.get('limit', 5))
+            )
+            if query.get('input_from') is not None:
+                signal_query.input_from = query['input_from']
+            return signal_query
+
+        if query['kind'] == 'stats':
+            return panicker_pb2.SignalQuery(stats=panicker_pb2.StatsRequest(days=query.get('days', 7)))
+
+        raise ValueError(f"Неизвестный тип запроса: {query['kind']}")
+
+    @staticmethod
+    def _convert_stats_from_proto(response) -> Dict[str, Any]:
+        """Конвертация StatsResponse в словарь"""
+        return {
+            'total_signals': response.total_signals,
+            'strong_signals': response.strong_signals,
+            'moderate_signals': response.moderate_signals,
+            'urgent_signals': response.urgent_signals,
+            'most_active_ticker': response.most_active_ticker,
+            'most_active_count': response.most_active_count,
+            'most_calm_ticker': response.most_calm_ticker,
+            'most_calm_count': response.most_calm_count,
+            'market_tension': response.market_tension
+        }
+
     def _convert_level_from_proto(self, level_proto: int) -> str:
         """Конвертация уровня из proto в строку"""
         level_map = {
@@ -488,6 +921,12 @@ class GrpcClient:
     # ------------------------------------------------------------------------
     def close(self):
         """Закрыть соединение с сервером"""
+        self.request_batcher.stop()
+
+        if self.scan_stream is not None:
+            self.scan_stream.close()
+            self.scan_stream = None
+
         if self.channel:
             self.channel.close()
             logger.info("Соединение с gRPC сервером закрыто")
@@ -497,12 +936,15 @@ class GrpcClient:
 # ГЛОБАЛЬНЫЙ ЭКЗЕМПЛЯР КЛИЕНТА
 # ============================================================================
 _client_instance: Optional[GrpcClient] = None
+_client_lock = threading.Lock()
 
 
 def get_grpc_client() -> GrpcClient:
-    """Получить глобальный экземпляр gRPC клиента (синглтон)"""
+    """Получить глобальный экземпляр gRPC клиента (синглтон, один канал на процесс)"""
     global _client_instance
     if _client_instance is None:
-        _client_instance = GrpcClient()
+        with _client_lock:
+            if _client_instance is None:
+                _client_instance = GrpcClient()
     return _client_instance
 
@@ -9,6 +9,8 @@ gRPC сервер для Паникёра 3000.
 import grpc
 from concurrent import futures
 import logging
+import queue
+import threading
 from datetime import datetime
 import time
 import sys
@@ -77,16 +79,20 @@ except ImportError as e:
 
 logger = logging.getLogger(__name__)
 
+# Сколько запросов одного потока ScanStream выполняется параллельно
+SCAN_STREAM_WORKERS = 4
+
 # ============================================================================
 # РЕАЛЬНЫЕ ИМПОРТЫ ПРОЕКТА (проверка доступности)
 # ============================================================================
 try:
-    from core.config_loader import ConfigLoader
+    from core.config_loader import ConfigLoader, get_config
 
     logger.info("✅ ConfigLoader импортирован успешно")
 except ImportError as e:
     logger.warning(f"⚠️ ConfigLoader недоступен: {e}")
     ConfigLoader = None
+    get_config = None
 
 try:
     from core.panic_detector import PanicDetector
@@ -128,7 +134,7 @@ class PanickerServiceServicer(panicker_pb2_grpc.PanickerServiceServicer):
 
         try:
             if ConfigLoader is not None:
-                self.config_loader = ConfigLoader()
+                self.config_loader = get_config()
                 logger.info("✅ ConfigLoader инициализирован")
 
                 if PanicDetector is not None:
@@ -237,6 +243,62 @@ class PanickerServiceServicer(panicker_pb2_grpc.PanickerServiceServicer):
             signals_found=len(signals)
         )
 
+    def ScanStream(self, request_iterator, context):
+        """
+        Потоковое сканирование: каждый запрос обрабатывается как ScanTickers.
+
+        Запросы выполняются параллельно в пуле потоков, ответы отдаются по мере
+        готовности - долгий скан не задерживает остальные. Клиент сопоставляет
+        ответы с запросами по request_id, поэтому порядок ответов не важен.
+        """
+        logger.info("ScanStream: поток сканирования открыт")
+
+        responses: "queue.Queue" = queue.Queue()
+        stream_end = object()
+        executor = futures.ThreadPoolExecutor(
+            max_workers=SCAN_STREAM_WORKERS, thread_name_prefix="scan-stream"
+        )
+
+        def scan_one(request):
+            try:
+                response = self.ScanTickers(request, context)
+            except Exception as e:
+                logger.error(f"❌ ScanStream: ошибка сканирования: {e}")
+                response = panicker_pb2.ScanResponse(
+                    signals=[],
+                    scan_id=f"scan_error_{int(time.time())}",
+                    timestamp=datetime.now().isoformat(),
+                    total_scanned=0,
+                    signals_found=0
+                )
+            response.request_id = request.request_id
+            responses.put(response)
+
+        def read_requests():
+            try:
+                for request in request_iterator:
+                    executor.submit(scan_one, request)
+            except Exception as e:
+                # Клиент закрыл поток или соединение оборвалось
+                logger.debug(f"ScanStream: чтение запросов прервано: {e}")
+            finally:
+                executor.shutdown(wait=True)
+                responses.put(stream_end)
+
+        threading.Thread(target=read_requests, name="scan-stream-reader", daemon=True).start()
+
+        try:
+            while True:
+                response = responses.get()
+                if response is stream_end:
+                    break
+                yield response
+        finally:
+            # Поток закрыт раньше времени - невыполненные запросы не нужны
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        logger.info("ScanStream: поток сканирования закрыт")
+
     def GetOverheatIndex(self, request, context):
         logger.info(f"GetOverheatIndex: {request.symbol}")
 
@@ -840,6 +902,37 @@ class SignalsServiceServicer(panicker_pb2_grpc.SignalsServiceServicer):
                 market_tension="🟢 НЕТ ДАННЫХ"
             )
 
+    def BatchGetSignals(self, request, context):
+        """Выполнить пакет запросов топа/статистики, ответы в порядке запросов"""
+        logger.info(f"BatchGetSignals: {len(request.queries)} запросов")
+
+        results = []
+        for index, query in enumerate(request.queries):
+            kind = query.WhichOneof('query')
+
+            if kind == 'top':
+                source = query.input_from if query.HasField('input_from') else None
+                if (source is not None and 0 <= source < index
+                        and results[source].WhichOneof('result') == 'top'):
+                    # Топ берём из результата предыдущего запроса пакета
+                    previous = results[source].top
+                    top = panicker_pb2.TopResponse(
+                        top_signals=previous.top_signals[:query.top.limit],
+                        period=previous.period
+                    )
+                else:
+                    top = self.GetTopSignals(query.top, context)
+                results.append(panicker_pb2.SignalResult(top=top))
+
+            elif kind == 'stats':
+                results.append(panicker_pb2.SignalResult(stats=self.GetStats(query.stats, context)))
+
+            else:
+                # Пустой запрос - пустой результат, чтобы не сбить порядок
+                results.append(panicker_pb2.SignalResult())
+
+        return panicker_pb2.BatchSignalResponse(results=results)
+
     def IgnoreTicker(self, request, context):
         logger.info(f"IgnoreTicker: {request.ticker}")
         return panicker_pb2.IgnoreResponse(
@@ -855,7 +948,14 @@ class SignalsServiceServicer(panicker_pb2_grpc.SignalsServiceServicer):
 # ФУНКЦИЯ serve
 # ============================================================================
 def serve():
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+    # Разрешаем keepalive-пинги клиента (иначе сервер закроет канал с too_many_pings)
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=10),
+        options=[
+            ('grpc.keepalive_permit_without_calls', 1),
+            ('grpc.http2.min_ping_interval_without_data_ms', 10000),
+        ]
+    )
 
     panicker_pb2_grpc.add_PanickerServiceServicer_to_server(
         PanickerServiceServicer(), server
@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0epanicker.proto\x12\x08panicker\"&\n\x06Ticker\x12\x0e\n\x06symbol\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\"\x85\x01\n\x06\x43\x61ndle\x12\x0e\n\x06ticker\x18\x01 \x01(\t\x12\x0c\n\x04open\x18\x02 \x01(\x01\x12\x0c\n\x04high\x18\x03 \x01(\x01\x12\x0b\n\x03low\x18\x04 \x01(\x01\x12\r\n\x05\x63lose\x18\x05 \x01(\x01\x12\x0e\n\x06volume\x18\x06 \x01(\x03\x12\x11\n\ttimestamp\x18\x07 \x01(\t\x12\x10\n\x08interval\x18\x08 \x01(\t\"\xbc\x03\n\x0bPanicSignal\x12\x0e\n\x06ticker\x18\x01 \x01(\t\x12\x35\n\x0bsignal_type\x18\x02 \x01(\x0e\x32 .panicker.PanicSignal.SignalType\x12*\n\x05level\x18\x03 \x01(\x0e\x32\x1b.panicker.PanicSignal.Level\x12\x0e\n\x06rsi_14\x18\x04 \x01(\x01\x12\r\n\x05rsi_7\x18\x05 \x01(\x01\x12\x0e\n\x06rsi_21\x18\x06 \x01(\x01\x12\x14\n\x0cvolume_ratio\x18\x07 \x01(\x01\x12\x15\n\rcurrent_price\x18\x08 \x01(\x01\x12\x13\n\x0b\x64\x65tected_at\x18\t \x01(\t\x12\x13\n\x0brisk_metric\x18\n \x01(\x01\x12\x30\n\x0fvolume_clusters\x18\x0b \x03(\x0b\x32\x17.panicker.VolumeCluster\x12\x16\n\x0einterpretation\x18\x0c \x01(\t\"/\n\nSignalType\x12\t\n\x05PANIC\x10\x00\x12\t\n\x05GREED\x10\x01\x12\x0b\n\x07NEUTRAL\x10\x02\"9\n\x05Level\x12\n\n\x06STRONG\x10\x00\x12\x0c\n\x08MODERATE\x10\x01\x12\n\n\x06URGENT\x10\x02\x12\n\n\x06IGNORE\x10\x03\"M\n\rVolumeCluster\x12\x13\n\x0bprice_level\x18\x01 \x01(\x01\x12\x19\n\x11volume_percentage\x18\x02 \x01(\x01\x12\x0c\n\x04role\x18\x03 \x01(\t\"\xb9\x01\n\rOverheatIndex\x12\x0e\n\x06ticker\x18\x01 \x01(\t\x12\x1b\n\x13overheat_percentage\x18\x02 \x01(\x01\x12\x13\n\x0b\x63urrent_rsi\x18\x03 \x01(\x01\x12\x14\n\x0cvolume_ratio\x18\x04 \x01(\x01\x12\x18\n\x10last_signal_time\x18\x05 \x01(\t\x12\x36\n\x11last_signal_level\x18\x06 \x01(\x0e\x32\x1b.panicker.PanicSignal.Level\"C\n\x0bScanRequest\x12!\n\x07tickers\x18\x01 \x03(\x0b\x32\x10.panicker.Ticker\x12\x11\n\treal_time\x18\x02 \x01(\x08\"\x88\x01\n\x0cScanResponse\x12&\n\x07signals\x18\x01 \x03(\x0b\x32\x15.panicker.PanicSignal\x12\x0f\n\x07scan_id\x18\x02 \x01(\t\x12\x11\n\ttimestamp\x18\x03 \x01(\t\x12\x15\n\rtotal_scanned\x18\x04 \x01(\x05\x12\x15\n\rsignals_found\x18\x05 \x01(\x05\"h\n\x0eHistoryRequest\x12\x0e\n\x06ticker\x18\x01 \x01(\t\x12\x11\n\tdays_back\x18\x02 \x01(\x05\x12\x12\n\nstart_date\x18\x03 \x01(\t\x12\x10\n\x08\x65nd_date\x18\x04 \x01(\t\x12\r\n\x05limit\x18\x05 \x01(\x05\"L\n\rSignalHistory\x12&\n\x07signals\x18\x01 \x03(\x0b\x32\x15.panicker.PanicSignal\x12\x13\n\x0btotal_count\x18\x02 \x01(\x05\"@\n\rCandleRequest\x12\x0e\n\x06ticker\x18\x01 \x01(\t\x12\x10\n\x08interval\x18\x02 \x01(\t\x12\r\n\x05\x63ount\x18\x03 \x01(\x05\"G\n\x0e\x43\x61ndleResponse\x12!\n\x07\x63\x61ndles\x18\x01 \x03(\x0b\x32\x10.panicker.Candle\x12\x12\n\nrequest_id\x18\x02 \x01(\t\"\x1f\n\x0cPriceRequest\x12\x0f\n\x07tickers\x18\x01 \x03(\t\"\x86\x01\n\rPriceResponse\x12\x33\n\x06prices\x18\x01 \x03(\x0b\x32#.panicker.PriceResponse.PricesEntry\x12\x11\n\ttimestamp\x18\x02 \x01(\t\x1a-\n\x0bPricesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x01:\x02\x38\x01\"1\n\x10OrderBookRequest\x12\x0e\n\x06ticker\x18\x01 \x01(\t\x12\r\n\x05\x64\x65pth\x18\x02 \x01(\x05\"\x8e\x01\n\x11OrderBookResponse\x12\x0e\n\x06ticker\x18\x01 \x01(\t\x12&\n\x04\x62ids\x18\x02 \x03(\x0b\x32\x18.panicker.OrderBookEntry\x12&\n\x04\x61sks\x18\x03 \x03(\x0b\x32\x18.panicker.OrderBookEntry\x12\x19\n\x11spread_percentage\x18\x04 \x01(\x01\"1\n\x0eOrderBookEntry\x12\r\n\x05price\x18\x01 \x01(\x01\x12\x10\n\x08quantity\x18\x02 \x01(\x03\"5\n\rStreamRequest\x12\x0f\n\x07tickers\x18\x01 \x03(\t\x12\x13\n\x0binclude_all\x18\x02 \x01(\x08\"+\n\nTopRequest\x12\x0e\n\x06period\x18\x01 \x01(\t\x12\r\n\x05limit\x18\x02 \x01(\x05\"I\n\x0bTopResponse\x12*\n\x0btop_signals\x18\x01 \x03(\x0b\x32\x15.panicker.PanicSignal\x12\x0e\n\x06period\x18\x02 \x01(\t\"7\n\rIgnoreRequest\x12\x0e\n\x06ticker\x18\x01 \x01(\t\x12\x16\n\x0e\x64uration_hours\x18\x02 \x01(\x05\"8\n\x0eIgnoreResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x15\n\rignored_until\x18\x02 \x01(\t\"\x1c\n\x0cStatsRequest\x12\x0c\n\x04\x64\x61ys\x18\x01 \x01(\x05\"\xf2\x01\n\rStatsResponse\x12\x15\n\rtotal_signals\x18\x01 \x01(\x05\x12\x16\n\x0estrong_signals\x18\x02 \x01(\x05\x12\x18\n\x10moderate_signals\x18\x03 \x01(\x05\x12\x16\n\x0eurgent_signals\x18\x04 \x01(\x05\x12\x1a\n\x12most_active_ticker\x18\x05 \x01(\t\x12\x19\n\x11most_active_count\x18\x06 \x01(\x05\x12\x18\n\x10most_calm_ticker\x18\x07 \x01(\t\x12\x17\n\x0fmost_calm_count\x18\x08 \x01(\x05\x12\x16\n\x0emarket_tension\x18\t \x01(\t2\xd5\x01\n\x0fPanickerService\x12<\n\x0bScanTickers\x12\x15.panicker.ScanRequest\x1a\x16.panicker.ScanResponse\x12=\n\x10GetOverheatIndex\x12\x10.panicker.Ticker\x1a\x17.panicker.OverheatIndex\x12\x45\n\x10GetSignalHistory\x12\x18.panicker.HistoryRequest\x1a\x17.panicker.SignalHistory2\xe2\x01\n\x11MarketDataService\x12?\n\nGetCandles\x12\x17.panicker.CandleRequest\x1a\x18.panicker.CandleResponse\x12\x43\n\x10GetCurrentPrices\x12\x16.panicker.PriceRequest\x1a\x17.panicker.PriceResponse\x12G\n\x0cGetOrderBook\x12\x1a.panicker.OrderBookRequest\x1a\x1b.panicker.OrderBookResponse2\x91\x02\n\x0eSignalsService\x12\x41\n\rStreamSignals\x12\x17.panicker.StreamRequest\x1a\x15.panicker.PanicSignal0\x01\x12<\n\rGetTopSignals\x12\x14.panicker.TopRequest\x1a\x15.panicker.TopResponse\x12;\n\x08GetStats\x12\x16.panicker.StatsRequest\x1a\x17.panicker.StatsResponse\x12\x41\n\x0cIgnoreTicker\x12\x17.panicker.IgnoreRequest\x1a\x18.panicker.IgnoreResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0epanicker.proto\x12\x08panicker\"&\n\x06Ticker\x12\x0e\n\x06symbol\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\"\x85\x01\n\x06\x43\x61ndle\x12\x0e\n\x06ticker\x18\x01 \x01(\t\x12\x0c\n\x04open\x18\x02 \x01(\x01\x12\x0c\n\x04high\x18\x03 \x01(\x01\x12\x0b\n\x03low\x18\x04 \x01(\x01\x12\r\n\x05\x63lose\x18\x05 \x01(\x01\x12\x0e\n\x06volume\x18\x06 \x01(\x03\x12\x11\n\ttimestamp\x18\x07 \x01(\t\x12\x10\n\x08interval\x18\x08 \x01(\t\"\xbc\x03\n\x0bPanicSignal\x12\x0e\n\x06ticker\x18\x01 \x01(\t\x12\x35\n\x0bsignal_type\x18\x02 \x01(\x0e\x32 .panicker.PanicSignal.SignalType\x12*\n\x05level\x18\x03 \x01(\x0e\x32\x1b.panicker.PanicSignal.Level\x12\x0e\n\x06rsi_14\x18\x04 \x01(\x01\x12\r\n\x05rsi_7\x18\x05 \x01(\x01\x12\x0e\n\x06rsi_21\x18\x06 \x01(\x01\x12\x14\n\x0cvolume_ratio\x18\x07 \x01(\x01\x12\x15\n\rcurrent_price\x18\x08 \x01(\x01\x12\x13\n\x0b\x64\x65tected_at\x18\t \x01(\t\x12\x13\n\x0brisk_metric\x18\n \x01(\x01\x12\x30\n\x0fvolume_clusters\x18\x0b \x03(\x0b\x32\x17.panicker.VolumeCluster\x12\x16\n\x0einterpretation\x18\x0c \x01(\t\"/\n\nSignalType\x12\t\n\x05PANIC\x10\x00\x12\t\n\x05GREED\x10\x01\x12\x0b\n\x07NEUTRAL\x10\x02\"9\n\x05Level\x12\n\n\x06STRONG\x10\x00\x12\x0c\n\x08MODERATE\x10\x01\x12\n\n\x06URGENT\x10\x02\x12\n\n\x06IGNORE\x10\x03\"M\n\rVolumeCluster\x12\x13\n\x0bprice_level\x18\x01 \x01(\x01\x12\x19\n\x11volume_percentage\x18\x02 \x01(\x01\x12\x0c\n\x04role\x18\x03 \x01(\t\"\xb9\x01\n\rOverheatIndex\x12\x0e\n\x06ticker\x18\x01 \x01(\t\x12\x1b\n\x13overheat_percentage\x18\x02 \x01(\x01\x12\x13\n\x0b\x63urrent_rsi\x18\x03 \x01(\x01\x12\x14\n\x0cvolume_ratio\x18\x04 \x01(\x01\x12\x18\n\x10last_signal_time\x18\x05 \x01(\t\x12\x36\n\x11last_signal_level\x18\x06 \x01(\x0e\x32\x1b.panicker.PanicSignal.Level\"W\n\x0bScanRequest\x12!\n\x07tickers\x18\x01 \x03(\x0b\x32\x10.panicker.Ticker\x12\x11\n\treal_time\x18\x02 \x01(\x08\x12\x12\n\nrequest_id\x18\x03 \x01(\t\"\x9c\x01\n\x0cScanResponse\x12&\n\x07signals\x18\x01 \x03(\x0b\x32\x15.panicker.PanicSignal\x12\x0f\n\x07scan_id\x18\x02 \x01(\t\x12\x11\n\ttimestamp\x18\x03 \x01(\t\x12\x15\n\rtotal_scanned\x18\x04 \x01(\x05\x12\x15\n\rsignals_found\x18\x05 \x01(\x05\x12\x12\n\nrequest_id\x18\x06 \x01(\t\"h\n\x0eHistoryRequest\x12\x0e\n\x06ticker\x18\x01 \x01(\t\x12\x11\n\tdays_back\x18\x02 \x01(\x05\x12\x12\n\nstart_date\x18\x03 \x01(\t\x12\x10\n\x08\x65nd_date\x18\x04 \x01(\t\x12\r\n\x05limit\x18\x05 \x01(\x05\"L\n\rSignalHistory\x12&\n\x07signals\x18\x01 \x03(\x0b\x32\x15.panicker.PanicSignal\x12\x13\n\x0btotal_count\x18\x02 \x01(\x05\"@\n\rCandleRequest\x12\x0e\n\x06ticker\x18\x01 \x01(\t\x12\x10\n\x08interval\x18\x02 \x01(\t\x12\r\n\x05\x63ount\x18\x03 \x01(\x05\"G\n\x0e\x43\x61ndleResponse\x12!\n\x07\x63\x61ndles\x18\x01 \x03(\x0b\x32\x10.panicker.Candle\x12\x12\n\nrequest_id\x18\x02 \x01(\t\"\x1f\n\x0cPriceRequest\x12\x0f\n\x07tickers\x18\x01 \x03(\t\"\x86\x01\n\rPriceResponse\x12\x33\n\x06prices\x18\x01 \x03(\x0b\x32#.panicker.PriceResponse.PricesEntry\x12\x11\n\ttimestamp\x18\x02 \x01(\t\x1a-\n\x0bPricesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x01:\x02\x38\x01\"1\n\x10OrderBookRequest\x12\x0e\n\x06ticker\x18\x01 \x01(\t\x12\r\n\x05\x64\x65pth\x18\x02 \x01(\x05\"\x8e\x01\n\x11OrderBookResponse\x12\x0e\n\x06ticker\x18\x01 \x01(\t\x12&\n\x04\x62ids\x18\x02 \x03(\x0b\x32\x18.panicker.OrderBookEntry\x12&\n\x04\x61sks\x18\x03 \x03(\x0b\x32\x18.panicker.OrderBookEntry\x12\x19\n\x11spread_percentage\x18\x04 \x01(\x01\"1\n\x0eOrderBookEntry\x12\r\n\x05price\x18\x01 \x01(\x01\x12\x10\n\x08quantity\x18\x02 \x01(\x03\"5\n\rStreamRequest\x12\x0f\n\x07tickers\x18\x01 \x03(\t\x12\x13\n\x0binclude_all\x18\x02 \x01(\x08\"+\n\nTopRequest\x12\x0e\n\x06period\x18\x01 \x01(\t\x12\r\n\x05limit\x18\x02 \x01(\x05\"I\n\x0bTopResponse\x12*\n\x0btop_signals\x18\x01 \x03(\x0b\x32\x15.panicker.PanicSignal\x12\x0e\n\x06period\x18\x02 \x01(\t\"7\n\rIgnoreRequest\x12\x0e\n\x06ticker\x18\x01 \x01(\t\x12\x16\n\x0e\x64uration_hours\x18\x02 \x01(\x05\"8\n\x0eIgnoreResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x15\n\rignored_until\x18\x02 \x01(\t\"\x1c\n\x0cStatsRequest\x12\x0c\n\x04\x64\x61ys\x18\x01 \x01(\x05\"\xf2\x01\n\rStatsResponse\x12\x15\n\rtotal_signals\x18\x01 \x01(\x05\x12\x16\n\x0estrong_signals\x18\x02 \x01(\x05\x12\x18\n\x10moderate_signals\x18\x03 \x01(\x05\x12\x16\n\x0eurgent_signals\x18\x04 \x01(\x05\x12\x1a\n\x12most_active_ticker\x18\x05 \x01(\t\x12\x19\n\x11most_active_count\x18\x06 \x01(\x05\x12\x18\n\x10most_calm_ticker\x18\x07 \x01(\t\x12\x17\n\x0fmost_calm_count\x18\x08 \x01(\x05\x12\x16\n\x0emarket_tension\x18\t \x01(\t\"\x8c\x01\n\x0bSignalQuery\x12#\n\x03top\x18\x01 \x01(\x0b\x32\x14.panicker.TopRequestH\x00\x12\'\n\x05stats\x18\x02 \x01(\x0b\x32\x16.panicker.StatsRequestH\x00\x12\x17\n\ninput_from\x18\x03 \x01(\x05H\x01\x88\x01\x01\x42\x07\n\x05queryB\r\n\x0b_input_from\"h\n\x0cSignalResult\x12$\n\x03top\x18\x01 \x01(\x0b\x32\x15.panicker.TopResponseH\x00\x12(\n\x05stats\x18\x02 \x01(\x0b\x32\x17.panicker.StatsResponseH\x00\x42\x08\n\x06result\"<\n\x12\x42\x61tchSignalRequest\x12&\n\x07queries\x18\x01 \x03(\x0b\x32\x15.panicker.SignalQuery\">\n\x13\x42\x61tchSignalResponse\x12\'\n\x07results\x18\x01 \x03(\x0b\x32\x16.panicker.SignalResult2\x96\x02\n\x0fPanickerService\x12<\n\x0bScanTickers\x12\x15.panicker.ScanRequest\x1a\x16.panicker.ScanResponse\x12?\n\nScanStream\x12\x15.panicker.ScanRequest\x1a\x16.panicker.ScanResponse(\x01\x30\x01\x12=\n\x10GetOverheatIndex\x12\x10.panicker.Ticker\x1a\x17.panicker.OverheatIndex\x12\x45\n\x10GetSignalHistory\x12\x18.panicker.HistoryRequest\x1a\x17.panicker.SignalHistory2\xe2\x01\n\x11MarketDataService\x12?\n\nGetCandles\x12\x17.panicker.CandleRequest\x1a\x18.panicker.CandleResponse\x12\x43\n\x10GetCurrentPrices\x12\x16.panicker.PriceRequest\x1a\x17.panicker.PriceResponse\x12G\n\x0cGetOrderBook\x12\x1a.panicker.OrderBookRequest\x1a\x1b.panicker.OrderBookResponse2\xe1\x02\n\x0eSignalsService\x12\x41\n\rStreamSignals\x12\x17.panicker.StreamRequest\x1a\x15.panicker.PanicSignal0\x01\x12<\n\rGetTopSignals\x12\x14.panicker.TopRequest\x1a\x15.panicker.TopResponse\x12;\n\x08GetStats\x12\x16.panicker.StatsRequest\x1a\x17.panicker.StatsResponse\x12\x41\n\x0cIgnoreTicker\x12\x17.panicker.IgnoreRequest\x1a\x18.panicker.IgnoreResponse\x12N\n\x0f\x42\x61tchGetSignals\x12\x1c.panicker.BatchSignalRequest\x1a\x1d.panicker.BatchSignalResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -48,47 +48,55 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_OVERHEATINDEX']._serialized_start=731
   _globals['_OVERHEATINDEX']._serialized_end=916
   _globals['_SCANREQUEST']._serialized_start=918
-  _globals['_SCANREQUEST']._serialized_end=985
-  _globals['_SCANRESPONSE']._serialized_start=988
-  _globals['_SCANRESPONSE']._serialized_end=1124
-  _globals['_HISTORYREQUEST']._serialized_start=1126
-  _globals['_HISTORYREQUEST']._serialized_end=1230
-  _globals['_SIGNALHISTORY']._serialized_start=1232
-  _globals['_SIGNALHISTORY']._serialized_end=1308
-  _globals['_CANDLEREQUEST']._serialized_start=1310
-  _globals['_CANDLEREQUEST']._serialized_end=1374
-  _globals['_CANDLERESPONSE']._serialized_start=1376
-  _globals['_CANDLERESPONSE']._serialized_end=1447
-  _globals['_PRICEREQUEST']._serialized_start=1449
-  _globals['_PRICEREQUEST']._serialized_end=1480
-  _globals['_PRICERESPONSE']._serialized_start=1483
-  _globals['_PRICERESPONSE']._serialized_end=1617
-  _globals['_PRICERESPONSE_PRICESENTRY']._serialized_start=1572
-  _globals['_PRICERESPONSE_PRICESENTRY']._serialized_end=1617
-  _globals['_ORDERBOOKREQUEST']._serialized_start=1619
-  _globals['_ORDERBOOKREQUEST']._serialized_end=1668
-  _globals['_ORDERBOOKRESPONSE']._serialized_start=1671
-  _globals['_ORDERBOOKRESPONSE']._serialized_end=1813
-  _globals['_ORDERBOOKENTRY']._serialized_start=1815
-  _globals['_ORDERBOOKENTRY']._serialized_end=1864
-  _globals['_STREAMREQUEST']._serialized_start=1866
-  _globals['_STREAMREQUEST']._serialized_end=1919
-  _globals['_TOPREQUEST']._serialized_start=1921
-  _globals['_TOPREQUEST']._serialized_end=1964
-  _globals['_TOPRESPONSE']._serialized_start=1966
-  _globals['_TOPRESPONSE']._serialized_end=2039
-  _globals['_IGNOREREQUEST']._serialized_start=2041
-  _globals['_IGNOREREQUEST']._serialized_end=2096
-  _globals['_IGNORERESPONSE']._serialized_start=2098
-  _globals['_IGNORERESPONSE']._serialized_end=2154
-  _globals['_STATSREQUEST']._serialized_start=2156
-  _globals['_STATSREQUEST']._serialized_end=2184
-  _globals['_STATSRESPONSE']._serialized_start=2187
-  _globals['_STATSRESPONSE']._serialized_end=2429
-  _globals['_PANICKERSERVICE']._serialized_start=2432
-  _globals['_PANICKERSERVICE']._serialized_end=2645
-  _globals['_MARKETDATASERVICE']._serialized_start=2648
-  _globals['_MARKETDATASERVICE']._serialized_end=2874
-  _globals['_SIGNALSSERVICE']._serialized_start=2877
-  _globals['_SIGNALSSERVICE']._serialized_end=3150
+  _globals['_SCANREQUEST']._serialized_end=1005
+  _globals['_SCANRESPONSE']._serialized_start=1008
+  _globals['_SCANRESPONSE']._serialized_end=1164
+  _globals['_HISTORYREQUEST']._serialized_start=1166
+  _globals['_HISTORYREQUEST']._serialized_end=1270
+  _globals['_SIGNALHISTORY']._serialized_start=1272
+  _globals['_SIGNALHISTORY']._serialized_end=1348
+  _globals['_CANDLEREQUEST']._serialized_start=1350
+  _globals['_CANDLEREQUEST']._serialized_end=1414
+  _globals['_CANDLERESPONSE']._serialized_start=1416
+  _globals['_CANDLERESPONSE']._serialized_end=1487
+  _globals['_PRICEREQUEST']._serialized_start=1489
+  _globals['_PRICEREQUEST']._serialized_end=1520
+  _globals['_PRICERESPONSE']._serialized_start=1523
+  _globals['_PRICERESPONSE']._serialized_end=1657
+  _globals['_PRICERESPONSE_PRICESENTRY']._serialized_start=1612
+  _globals['_PRICERESPONSE_PRICESENTRY']._serialized_end=1657
+  _globals['_ORDERBOOKREQUEST']._serialized_start=1659
+  _globals['_ORDERBOOKREQUEST']._serialized_end=1708
+  _globals['_ORDERBOOKRESPONSE']._serialized_start=1711
+  _globals['_ORDERBOOKRESPONSE']._serialized_end=1853
+  _globals['_ORDERBOOKENTRY']._serialized_start=1855
+  _globals['_ORDERBOOKENTRY']._serialized_end=1904
+  _globals['_STREAMREQUEST']._serialized_start=1906
+  _globals['_STREAMREQUEST']._serialized_end=1959
+  _globals['_TOPREQUEST']._serialized_start=1961
+  _globals['_TOPREQUEST']._serialized_end=2004
+  _globals['_TOPRESPONSE']._serialized_start=2006
+  _globals['_TOPRESPONSE']._serialized_end=2079
+  _globals['_IGNOREREQUEST']._serialized_start=2081
+  _globals['_IGNOREREQUEST']._serialized_end=2136
+  _globals['_IGNORERESPONSE']._serialized_start=2138
+  _globals['_IGNORERESPONSE']._serialized_end=2194
+  _globals['_STATSREQUEST']._serialized_start=2196
+  _globals['_STATSREQUEST']._serialized_end=2224
+  _globals['_STATSRESPONSE']._serialized_start=2227
+  _globals['_STATSRESPONSE']._serialized_end=2469
+  _globals['_SIGNALQUERY']._serialized_start=2472
+  _globals['_SIGNALQUERY']._serialized_end=2612
+  _globals['_SIGNALRESULT']._serialized_start=2614
+  _globals['_SIGNALRESULT']._serialized_end=2718
+  _globals['_BATCHSIGNALREQUEST']._serialized_start=2720
+  _globals['_BATCHSIGNALREQUEST']._serialized_end=2780
+  _globals['_BATCHSIGNALRESPONSE']._serialized_start=2782
+  _globals['_BATCHSIGNALRESPONSE']._serialized_end=2844
+  _globals['_PANICKERSERVICE']._serialized_start=2847
+  _globals['_PANICKERSERVICE']._serialized_end=3125
+  _globals['_MARKETDATASERVICE']._serialized_start=3128
+  _globals['_MARKETDATASERVICE']._serialized_end=3354
+  _globals['_SIGNALSSERVICE']._serialized_start=3357
+  _globals['_SIGNALSSERVICE']._serialized_end=3710
 # @@protoc_insertion_point(module_scope)
@@ -40,6 +40,11 @@ class PanickerServiceStub(object):
                 request_serializer=panicker__pb2.ScanRequest.SerializeToString,
                 response_deserializer=panicker__pb2.ScanResponse.FromString,
                 _registered_method=True)
+        self.ScanStream = channel.stream_stream(
+                '/panicker.PanickerService/ScanStream',
+                request_serializer=panicker__pb2.ScanRequest.SerializeToString,
+                response_deserializer=panicker__pb2.ScanResponse.FromString,
+                _registered_method=True)
         self.GetOverheatIndex = channel.unary_unary(
                 '/panicker.PanickerService/GetOverheatIndex',
                 request_serializer=panicker__pb2.Ticker.SerializeToString,
@@ -63,6 +68,13 @@ class PanickerServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def ScanStream(self, request_iterator, context):
+        """Долгоживущий поток сканирования (один HTTP/2 поток на много запросов)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def GetOverheatIndex(self, request, context):
         """Получить статус здоровья акции
         """
@@ -85,6 +97,11 @@ def add_PanickerServiceServicer_to_server(servicer, server):
                     request_deserializer=panicker__pb2.ScanRequest.FromString,
                     response_serializer=panicker__pb2.ScanResponse.SerializeToString,
             ),
+            'ScanStream': grpc.stream_stream_rpc_method_handler(
+                    servicer.ScanStream,
+                    request_deserializer=panicker__pb2.ScanRequest.FromString,
+                    response_serializer=panicker__pb2.ScanResponse.SerializeToString,
+            ),
             'GetOverheatIndex': grpc.unary_unary_rpc_method_handler(
                     servicer.GetOverheatIndex,
                     request_deserializer=panicker__pb2.Ticker.FromString,
@@ -134,6 +151,33 @@ class PanickerService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def ScanStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/panicker.PanickerService/ScanStream',
+            panicker__pb2.ScanRequest.SerializeToString,
+            panicker__pb2.ScanResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def GetOverheatIndex(request,
             target,
@@ -382,6 +426,11 @@ class SignalsServiceStub(object):
                 request_serializer=panicker__pb2.IgnoreRequest.SerializeToString,
                 response_deserializer=panicker__pb2.IgnoreResponse.FromString,
                 _registered_method=True)
+        self.BatchGetSignals = channel.unary_unary(
+                '/panicker.SignalsService/BatchGetSignals',
+                request_serializer=panicker__pb2.BatchSignalRequest.SerializeToString,
+                response_deserializer=panicker__pb2.BatchSignalResponse.FromString,
+                _registered_method=True)
 
 
 class SignalsServiceServicer(object):
@@ -415,6 +464,13 @@ class SignalsServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def BatchGetSignals(self, request, context):
+        """Несколько запросов топа/статистики за один вызов (ответы в порядке запросов)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_SignalsServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -438,6 +494,11 @@ def add_SignalsServiceServicer_to_server(servicer, server):
                     request_deserializer=panicker__pb2.IgnoreRequest.FromString,
                     response_serializer=panicker__pb2.IgnoreResponse.SerializeToString,
             ),
+            'BatchGetSignals': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchGetSignals,
+                    request_deserializer=panicker__pb2.BatchSignalRequest.FromString,
+                    response_serializer=panicker__pb2.BatchSignalResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'panicker.SignalsService', rpc_method_handlers)
@@ -556,3 +617,30 @@ class SignalsService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def BatchGetSignals(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/panicker.SignalsService/BatchGetSignals',
+            panicker__pb2.BatchSignalRequest.SerializeToString,
+            panicker__pb2.BatchSignalResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -0,0 +1,65 @@
+# panicker3000/tests/test_alert_settings.py
+"""
+Тесты для хранилища настроек автооповещений (/alerts on/off).
+"""
+
+# ============================================================================
+# ИМПОРТЫ
+# ============================================================================
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from data.alert_settings import AlertSettingsStore
+
+
+# ============================================================================
+# ТЕСТ 1: ПЕРЕКЛЮЧЕНИЕ СРАЗУ В ПАМЯТИ, НА ДИСКЕ - ПОСЛЕДНЕЕ ЗНАЧЕНИЕ
+# ============================================================================
+def test_toggle_persisted_on_close(tmp_path):
+    """Чтение видит изменение сразу, после перезапуска сохраняется последнее"""
+    print("🧪 Тест 1: Сохранение настроек уведомлений")
+
+    db_path = str(tmp_path / "alerts.db")
+
+    store = AlertSettingsStore(db_path, flush_interval=60)
+    assert store.is_enabled(42) is True
+
+    store.set_enabled(42, False)
+    store.set_enabled(7, False)
+    store.set_enabled(7, True)
+    assert store.is_enabled(42) is False
+    store.close()
+
+    reopened = AlertSettingsStore(db_path, flush_interval=60)
+    assert reopened.is_enabled(42) is False
+    assert reopened.is_enabled(7) is True
+    assert reopened._conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+    reopened.close()
+
+    print("✅ Настройки уведомлений сохраняются")
+
+
+# ============================================================================
+# ТЕСТ 2: ПОДРОБНЫЙ /OVERHEAT - ОТДЕЛЬНО ДЛЯ КАЖДОГО ЧАТА
+# ============================================================================
+def test_verbose_overheat_per_chat(tmp_path):
+    """Режим /overheat хранится по чатам и не влияет на другие чаты"""
+    print("\n🧪 Тест 2: Подробный /overheat по чатам")
+
+    db_path = str(tmp_path / "settings.db")
+
+    store = AlertSettingsStore(db_path, flush_interval=60)
+    store.set_verbose_overheat(100, False)
+    assert store.get_verbose_overheat(100, True) is False
+    assert store.get_verbose_overheat(200, True) is True
+    assert store.is_enabled(100) is True
+    store.close()
+
+    reopened = AlertSettingsStore(db_path, flush_interval=60)
+    assert reopened.get_verbose_overheat(100, True) is False
+    assert reopened.get_verbose_overheat(200, False) is False
+    reopened.close()
+
+    print("✅ Режим /overheat сохраняется для своего чата")
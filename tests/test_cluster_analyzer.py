@@ -0,0 +1,164 @@
+# panicker3000/tests/test_cluster_analyzer.py
+"""
+Тесты для анализатора кластеров объёма.
+"""
+
+# ============================================================================
+# ИМПОРТЫ
+# ============================================================================
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+import core.cluster_analyzer as cluster_analyzer
+from core.cluster_analyzer import VolumeClusterAnalyzer
+
+
+# ============================================================================
+# ТЕСТ 1: ГРУППИРОВКА ОБЪЁМА ПО ЗАМКНУТЫМ ЦЕНОВЫМ ЗОНАМ
+# ============================================================================
+def test_group_volume_matches_closed_zones():
+    """Объём зоны - сумма по ценам lower <= price <= upper, цена на границе входит в обе зоны"""
+    print("🧪 Тест 1: Группировка объёма по зонам")
+
+    # Цены на сетке шага: часть попадает ровно на внутренние границы зон
+    prices = [100.0 + 0.25 * (i % 41) for i in range(60)]
+    volumes = [float(10 + i) for i in range(60)]
+
+    clusters = VolumeClusterAnalyzer()._group_volume_by_price_zones(prices, volumes)
+    assert clusters
+
+    for cluster in clusters:
+        lower, upper = cluster['price_range']
+        inside = [v for p, v in zip(prices, volumes) if lower <= p <= upper]
+        assert np.isclose(cluster['total_volume'], sum(inside))
+        assert cluster['count'] == len(inside)
+
+    print("✅ Объём по зонам совпадает с определением")
+
+
+# ============================================================================
+# ТЕСТ 2: АРИФМЕТИЧЕСКИЙ ИНДЕКС ЗОН НА БОЛЬШИХ ОКНАХ
+# ============================================================================
+def test_uniform_binning_matches_search(monkeypatch):
+    """Индекс зоны по ширине даёт те же зоны, что и поиск по границам"""
+    print("\n🧪 Тест 2: Равные зоны на большом окне")
+
+    rng = np.random.default_rng(7)
+    size = cluster_analyzer.UNIFORM_BINNING_MIN_POINTS * 2
+    prices = (100.0 + 0.25 * rng.integers(0, 41, size)).tolist()
+    volumes = rng.uniform(1, 1000, size).tolist()
+    analyzer = VolumeClusterAnalyzer()
+
+    uniform = analyzer._group_volume_by_price_zones(prices, volumes)
+    monkeypatch.setattr(cluster_analyzer, 'UNIFORM_BINNING_MIN_POINTS', size + 1)
+    searched = analyzer._group_volume_by_price_zones(prices, volumes)
+
+    assert [c['count'] for c in uniform] == [c['count'] for c in searched]
+    assert np.allclose([c['total_volume'] for c in uniform], [c['total_volume'] for c in searched])
+
+    print("✅ Оба способа разбиения совпадают")
+
+
+# ============================================================================
+# ТЕСТ 3: КЭШ РЕЗУЛЬТАТОВ ANALYZE
+# ============================================================================
+def test_analyze_cache_hits_only_same_window(monkeypatch):
+    """Повторное окно берётся из кэша, окно с новой свечой пересчитывается"""
+    print("\n🧪 Тест 3: Кэш analyze")
+
+    rng = np.random.default_rng(5)
+    prices = (100.0 + rng.choice([-5.0, 0.0, 5.0], 300) + rng.uniform(-1, 1, 300)).tolist()
+    volumes = rng.uniform(100, 1000, 300).tolist()
+    analyzer = VolumeClusterAnalyzer()
+
+    first = analyzer.analyze(prices, volumes)
+    assert len(first) > 1
+    calls = []
+    original = analyzer._group_volume_by_price_zones
+    monkeypatch.setattr(analyzer, '_group_volume_by_price_zones',
+                        lambda p, v: calls.append(1) or original(p, v))
+
+    assert analyzer.analyze(prices, volumes) == first
+    assert not calls
+
+    analyzer.analyze(prices + [120.0], volumes + [500.0])
+    assert len(calls) == 1
+
+    # Другие параметры отбора - другой результат, не из кэша
+    analyzer.num_clusters = 1
+    assert len(analyzer.analyze(prices, volumes)) == 1
+    assert len(calls) == 2
+
+    print("✅ Кэш срабатывает только на том же окне")
+
+
+# ============================================================================
+# ТЕСТ 4: МАССИВЫ NUMPY НА ВХОДЕ
+# ============================================================================
+def test_analyze_accepts_numpy_arrays():
+    """Массивы NumPy дают те же кластеры, что и списки"""
+    print("\n🧪 Тест 4: analyze с массивами NumPy")
+
+    rng = np.random.default_rng(3)
+    prices = 100.0 + rng.choice([-5.0, 0.0, 5.0], 300) + rng.uniform(-1, 1, 300)
+    volumes = rng.uniform(100, 1000, 300)
+
+    from_arrays = VolumeClusterAnalyzer().analyze(prices, volumes)
+    from_lists = VolumeClusterAnalyzer().analyze(prices.tolist(), volumes.tolist())
+
+    assert from_arrays
+    assert from_arrays == from_lists
+
+    print("✅ Массивы и списки дают одинаковый результат")
+
+
+# ============================================================================
+# ТЕСТ 5: СВОИ (НЕРАВНЫЕ) ГРАНИЦЫ ЗОН
+# ============================================================================
+def test_custom_bins_closed_zones():
+    """Свои границы зон: та же замкнутая зона, цены за границами не учитываются"""
+    print("\n🧪 Тест 5: Свои границы зон")
+
+    prices = [100.0 + 0.25 * (i % 41) for i in range(60)]
+    volumes = [float(10 + i) for i in range(60)]
+    bins = [101.0, 101.5, 103.0, 105.0, 108.0]
+
+    clusters = VolumeClusterAnalyzer()._group_volume_by_price_zones(prices, volumes, bins=bins)
+    assert len(clusters) == len(bins) - 1
+
+    for cluster in clusters:
+        lower, upper = cluster['price_range']
+        inside = [v for p, v in zip(prices, volumes) if lower <= p <= upper]
+        assert np.isclose(cluster['total_volume'], sum(inside))
+        assert cluster['count'] == len(inside)
+
+    print("✅ Объём по своим границам совпадает с определением")
+
+
+# ============================================================================
+# ТЕСТ 6: ПАКЕТНЫЙ АНАЛИЗ НЕСКОЛЬКИХ ТИКЕРОВ
+# ============================================================================
+def test_analyze_batch_matches_analyze():
+    """analyze_batch даёт по каждому тикеру то же, что analyze"""
+    print("\n🧪 Тест 6: analyze_batch")
+
+    rng = np.random.default_rng(11)
+    prices_per_ticker = [
+        100.0 + 0.25 * rng.integers(0, 41, 60),                                 # цены на границах зон
+        250.0 + rng.choice([-5.0, 0.0, 5.0], 300) + rng.uniform(-1, 1, 300),    # три уровня
+        np.full(10, 42.0),                                                      # плоское окно
+        np.array([]),                                                           # нет данных
+    ]
+    volumes_per_ticker = [rng.uniform(100, 1000, prices.size) for prices in prices_per_ticker]
+
+    batch = VolumeClusterAnalyzer().analyze_batch(prices_per_ticker, volumes_per_ticker)
+    single = [VolumeClusterAnalyzer().analyze(p, v) for p, v in zip(prices_per_ticker, volumes_per_ticker)]
+
+    assert batch == single
+    assert batch[1] and batch[2] and not batch[3]
+
+    print("✅ Пакетный анализ совпадает с поштучным")
@@ -83,4 +83,27 @@ def test_config_loader():
 
     print("\n🎉 Все конфиги загружены успешно!")
 
-# Pytest автоматически найдет эту функцию
\ No newline at end of file
+# Pytest автоматически найдет эту функцию
+
+
+def test_load_all_configs_populates_settings(tmp_path):
+    """Загрузка из временной директории заполняет settings и panic_thresholds"""
+    print("🧪 Тестирование загрузки конфигов из временной директории...")
+
+    (tmp_path / "settings.yaml").write_text("telegram:\n  alert_cooldown: 60\n", encoding="utf-8")
+    (tmp_path / "panic_thresholds.yaml").write_text(
+        "panic_thresholds:\n  red:\n    rsi_buy: 20\n", encoding="utf-8"
+    )
+
+    loader = ConfigLoader(str(tmp_path))
+
+    assert loader.get_setting('telegram.alert_cooldown') == 60
+    assert loader.get_panic_threshold('red', 'rsi_buy') == 20
+    assert loader.load_panic_thresholds()['panic_thresholds']['red'] == {'rsi_buy': 20}
+
+    # reload() перечитывает файлы
+    (tmp_path / "settings.yaml").write_text("telegram:\n  alert_cooldown: 90\n", encoding="utf-8")
+    loader.reload()
+    assert loader.get_setting('telegram.alert_cooldown') == 90
+
+    print("✅ settings и panic_thresholds загружены")
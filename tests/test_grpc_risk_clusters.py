@@ -3,6 +3,9 @@
 
 import sys
 import os
+import threading
+import time
+from types import SimpleNamespace
 
 # Добавляем корень проекта в путь
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -49,6 +52,353 @@ def test_panic_signal_structure():
         pytest.skip("Pydantic модели не настроены")
 
 
+@pytest.mark.skipif(not HAS_GRPC_CLIENT, reason="gRPC клиент не настроен")
+def test_batch_falls_back_to_single_requests():
+    """Пакетный запрос без BatchGetSignals на сервере: порядок и input_from сохраняются"""
+    import grpc
+
+    class FakeRpcError(grpc.RpcError):
+        def __init__(self, code):
+            self._code = code
+
+        def code(self):
+            return self._code
+
+    class FakeSignalsStub:
+        def __init__(self, code):
+            self.code = code
+
+        def BatchGetSignals(self, request):
+            raise FakeRpcError(self.code)
+
+    single_calls = []
+
+    def fake_top(period='today', limit=5):
+        single_calls.append('top')
+        return [{'ticker': f"T{i}"} for i in range(limit)]
+
+    def fake_stats(days=7):
+        single_calls.append('stats')
+        return {'total_signals': days}
+
+    client = GrpcClient.__new__(GrpcClient)
+    client.get_top_signals = fake_top
+    client.get_stats = fake_stats
+    queries = [
+        {'kind': 'top', 'period': 'today', 'limit': 4},
+        {'kind': 'stats', 'days': 1},
+        {'kind': 'top', 'limit': 2, 'input_from': 0},
+    ]
+
+    # UNIMPLEMENTED: сервер без BatchGetSignals - запросы по одному
+    client.signals_stub = FakeSignalsStub(grpc.StatusCode.UNIMPLEMENTED)
+    top, stats, top_two = client.batch(queries)
+
+    assert [s['ticker'] for s in top] == ['T0', 'T1', 'T2', 'T3']
+    assert stats == {'total_signals': 1}
+    assert top_two == top[:2]
+    assert single_calls == ['top', 'stats']
+
+    # UNAVAILABLE: сервер недоступен - значения по умолчанию без повторных запросов
+    single_calls.clear()
+    client.signals_stub = FakeSignalsStub(grpc.StatusCode.UNAVAILABLE)
+
+    assert client.batch(queries) == [[], None, []]
+    assert single_calls == []
+
+
+
+@pytest.mark.skipif(not HAS_GRPC_CLIENT, reason="gRPC клиент не настроен")
+def test_request_batcher_coalesces_identical_queries():
+    """Запросы в одном окне уходят одним пакетом, одинаковые - один раз"""
+    from grpc_service.grpc_client import RequestBatcher
+
+    calls = []
+
+    def fake_batch(queries):
+        calls.append(queries)
+        return [query['limit'] for query in queries]
+
+    batcher = RequestBatcher(fake_batch, window=0.05)
+    futures = [batcher.submit({'kind': 'top', 'period': 'today', 'limit': limit}) for limit in (10, 10, 3)]
+
+    assert [f.result(timeout=5) for f in futures] == [10, 10, 3]
+    assert len(calls) == 1
+    assert [q['limit'] for q in calls[0]] == [10, 3]
+
+    batcher.stop()
+
+
+@pytest.mark.skipif(not HAS_GRPC_CLIENT, reason="gRPC клиент не настроен")
+def test_request_batcher_survives_short_results():
+    """Неполный ответ пакета - ошибка во всех Future, поток батчера жив"""
+    from grpc_service.grpc_client import RequestBatcher
+
+    responses = [[], ['ok']]
+
+    def fake_batch(queries):
+        return responses.pop(0)
+
+    batcher = RequestBatcher(fake_batch, window=0.01)
+
+    bad = [batcher.submit({'kind': 'top', 'limit': limit}) for limit in (10, 3)]
+    for future in bad:
+        with pytest.raises(RuntimeError):
+            future.result(timeout=5)
+
+    good = batcher.submit({'kind': 'stats'})
+    assert good.result(timeout=5) == 'ok'
+
+    batcher.stop()
+
+
+class _FakeScanCall:
+    """Заглушка двунаправленного вызова ScanStream: ответы задаёт тест"""
+
+    def __init__(self, requests, respond):
+        self.requests = requests
+        self.respond = respond
+        self.cancelled = threading.Event()
+
+    def __iter__(self):
+        return self.respond(self)
+
+    def cancel(self):
+        self.cancelled.set()
+
+
+class _FakeScanStub:
+    """Заглушка PanickerServiceStub с потоковым и unary сканированием"""
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.call = None
+        self.opened = 0
+        self.unary_requests = []
+
+    def ScanStream(self, request_iterator):
+        self.opened += 1
+        self.call = _FakeScanCall(request_iterator, self.respond)
+        return self.call
+
+    def ScanTickers(self, request):
+        self.unary_requests.append(request)
+        return SimpleNamespace(request_id='', source='unary')
+
+
+def _stream_rpc_error():
+    import grpc
+
+    class _StreamError(grpc.RpcError):
+        pass
+
+    return _StreamError("stream reset")
+
+
+def _scan_client(stub, stream):
+    """GrpcClient без канала: только заглушка и только что открытый поток"""
+    client = GrpcClient.__new__(GrpcClient)
+    client.panicker_stub = stub
+    client.scan_stream = stream
+    client._scan_stream_enabled = True
+    client._scan_stream_retry_at = time.monotonic() + 60
+    return client
+
+
+@pytest.mark.skipif(not HAS_GRPC_CLIENT, reason="gRPC клиент не настроен")
+def test_scan_stream_matches_responses_by_request_id():
+    """Ответы в обратном порядке попадают своим запросам по request_id"""
+    from grpc_service.grpc_client import ScanStream
+
+    def respond(call):
+        first = next(call.requests)
+        second = next(call.requests)
+        for request in (second, first):
+            yield SimpleNamespace(request_id=request.request_id, ticker=request.ticker)
+        call.cancelled.wait(5)
+
+    stream = ScanStream(_FakeScanStub(respond), timeout=5)
+    results = {}
+
+    def scan(ticker):
+        results[ticker] = stream.scan(SimpleNamespace(request_id='', ticker=ticker)).ticker
+
+    threads = [threading.Thread(target=scan, args=(ticker,)) for ticker in ('SBER', 'GAZP')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert results == {'SBER': 'SBER', 'GAZP': 'GAZP'}
+    stream.close()
+
+
+@pytest.mark.skipif(not HAS_GRPC_CLIENT, reason="gRPC клиент не настроен")
+def test_scan_stream_failover_to_unary():
+    """Оборванный поток: запрос уходит в ScanTickers, поток помечается закрытым"""
+    from grpc_service.grpc_client import ScanStream
+
+    def respond(call):
+        next(call.requests)
+        raise _stream_rpc_error()
+        yield
+
+    stub = _FakeScanStub(respond)
+    stream = ScanStream(stub, timeout=5)
+    client = _scan_client(stub, stream)
+
+    response = client._scan(SimpleNamespace(request_id='', ticker='SBER'))
+
+    assert response.source == 'unary'
+    assert len(stub.unary_requests) == 1
+    assert not stream.is_active
+
+
+@pytest.mark.skipif(not HAS_GRPC_CLIENT, reason="gRPC клиент не настроен")
+def test_scan_stream_reopened_after_break():
+    """Оборванный поток переоткрывается на следующем запросе, но не чаще интервала"""
+    stub = None
+
+    def respond(call):
+        request = next(call.requests)
+        if stub.opened == 1:
+            raise _stream_rpc_error()
+        yield SimpleNamespace(request_id=request.request_id, source='stream')
+        call.cancelled.wait(5)
+
+    stub = _FakeScanStub(respond)
+    client = _scan_client(stub, None)
+    assert client.open_scan_stream()
+
+    # Первый поток обрывается - запрос уходит в ScanTickers
+    assert client._scan(SimpleNamespace(request_id='', ticker='SBER')).source == 'unary'
+
+    # Интервал не истёк - повторно не дозваниваемся
+    assert client._scan(SimpleNamespace(request_id='', ticker='SBER')).source == 'unary'
+    assert stub.opened == 1
+
+    # Интервал истёк - поток открывается заново
+    client._scan_stream_retry_at = 0.0
+    assert client._scan(SimpleNamespace(request_id='', ticker='SBER')).source == 'stream'
+    assert stub.opened == 2
+    assert len(stub.unary_requests) == 2
+
+    client.scan_stream.close()
+
+
+@pytest.mark.skipif(not HAS_GRPC_CLIENT, reason="gRPC клиент не настроен")
+def test_scan_stream_timeout_does_not_rescan():
+    """Таймаут ответа в потоке не дублирует скан через ScanTickers"""
+    from concurrent.futures import TimeoutError as FutureTimeoutError
+    from grpc_service.grpc_client import ScanStream
+
+    def respond(call):
+        call.cancelled.wait(5)
+        return
+        yield
+
+    stub = _FakeScanStub(respond)
+    stream = ScanStream(stub, timeout=0.05)
+    client = _scan_client(stub, stream)
+
+    with pytest.raises(FutureTimeoutError):
+        client._scan(SimpleNamespace(request_id='', ticker='SBER'))
+    assert stub.unary_requests == []
+
+    stream.close()
+
+
+@pytest.mark.skipif(not HAS_GRPC_CLIENT, reason="gRPC клиент не настроен")
+def test_scan_stream_close():
+    """close() отменяет вызов, дальнейшие запросы идут через ScanTickers"""
+    from grpc_service.grpc_client import ScanStream
+
+    def respond(call):
+        call.cancelled.wait(5)
+        raise _stream_rpc_error()
+        yield
+
+    stub = _FakeScanStub(respond)
+    stream = ScanStream(stub, timeout=5)
+    client = _scan_client(stub, stream)
+
+    stream.close()
+
+    assert stub.call.cancelled.is_set()
+    assert not stream.is_active
+    with pytest.raises(RuntimeError):
+        stream.scan(SimpleNamespace(request_id='', ticker='SBER'))
+    assert client._scan(SimpleNamespace(request_id='', ticker='SBER')).source == 'unary'
+
+
+@pytest.mark.skipif(not HAS_GRPC_CLIENT, reason="gRPC клиент не настроен")
+def test_get_candles_async_uses_future_call():
+    """Свечи запрашиваются future-вызовом gRPC, ошибка даёт пустой список"""
+    import grpc
+    from grpc_service.grpc_client import panicker_pb2
+
+    class FakeCall:
+        def __init__(self, response):
+            self.response = response
+
+        def result(self):
+            if self.response is None:
+                raise grpc.RpcError("UNAVAILABLE")
+            return self.response
+
+        def add_done_callback(self, callback):
+            callback(self)
+
+    class FakeGetCandles:
+        def future(self, request):
+            if request.ticker == 'IMOEX':
+                return FakeCall(None)
+            return FakeCall(panicker_pb2.CandleResponse(
+                candles=[panicker_pb2.Candle(ticker=request.ticker, close=c) for c in (1.0, 2.0)]
+            ))
+
+    class FakeMarketStub:
+        GetCandles = FakeGetCandles()
+
+    client = GrpcClient.__new__(GrpcClient)
+    client.market_stub = FakeMarketStub()
+
+    sber = client.get_candles_async('SBER', interval='hour', count=2)
+    imoex = client.get_candles_async('IMOEX', interval='hour', count=2)
+
+    assert [c['close'] for c in sber.result(timeout=5)] == [1.0, 2.0]
+    assert imoex.result(timeout=5) == []
+
+
+@pytest.mark.skipif(not HAS_GRPC_CLIENT, reason="gRPC клиент не настроен")
+def test_get_signal_history_async_passes_limit():
+    """История запрашивается future-вызовом gRPC с переданным лимитом"""
+    from grpc_service.grpc_client import panicker_pb2
+
+    requests = []
+
+    class FakeCall:
+        def result(self):
+            return panicker_pb2.SignalHistory()
+
+        def add_done_callback(self, callback):
+            callback(self)
+
+    class FakeGetSignalHistory:
+        def future(self, request):
+            requests.append(request)
+            return FakeCall()
+
+    class FakePanickerStub:
+        GetSignalHistory = FakeGetSignalHistory()
+
+    client = GrpcClient.__new__(GrpcClient)
+    client.panicker_stub = FakePanickerStub()
+
+    assert client.get_signal_history_async('SBER', limit=5).result(timeout=5) == []
+    assert requests[0].ticker == 'SBER' and requests[0].limit == 5
+
+
 if __name__ == '__main__':
     # Для запуска напрямую
     import pytest
@@ -17,6 +17,17 @@ except ImportError as e:
 
 import pytest
 import grpc
+import threading
+
+try:
+    # Сервер завершает процесс через sys.exit, если не хватает зависимостей
+    from grpc_service.grpc_server import PanickerServiceServicer
+    from grpc_service import grpc_server
+
+    HAS_GRPC_SERVER = True
+except (ImportError, SystemExit) as e:
+    print(f"✅ gRPC сервер недоступен, пропускаем тесты ScanStream: {e}")
+    HAS_GRPC_SERVER = False
 
 
 def test_grpc_import():
@@ -65,6 +76,36 @@ def test_grpc_message_types():
     assert PanicSignal.Level.STRONG == 0
 
 
+@pytest.mark.skipif(not HAS_GRPC_SERVER, reason="gRPC сервер недоступен")
+def test_scan_stream_runs_requests_concurrently():
+    """Долгий скан не задерживает быстрый: ответы идут по готовности с request_id"""
+    release = threading.Event()
+
+    def fake_scan(request, context):
+        if request.request_id == 'slow':
+            release.wait(5)
+        if request.request_id == 'broken':
+            raise RuntimeError("scan failed")
+        return grpc_server.panicker_pb2.ScanResponse(total_scanned=len(request.tickers))
+
+    servicer = PanickerServiceServicer.__new__(PanickerServiceServicer)
+    servicer.ScanTickers = fake_scan
+
+    requests = [
+        grpc_server.panicker_pb2.ScanRequest(request_id='slow'),
+        grpc_server.panicker_pb2.ScanRequest(request_id='fast'),
+        grpc_server.panicker_pb2.ScanRequest(request_id='broken'),
+    ]
+    responses = servicer.ScanStream(iter(requests), context=None)
+
+    first_two = {next(responses).request_id, next(responses).request_id}
+    assert first_two == {'fast', 'broken'}
+
+    release.set()
+    rest = list(responses)
+    assert [r.request_id for r in rest] == ['slow']
+
+
 if __name__ == '__main__':
     # Для запуска напрямую
     test_grpc_import()
@@ -0,0 +1,228 @@
+# panicker3000/tests/test_message_batcher.py
+"""
+Тесты для объединения исходящих сообщений Telegram-бота.
+"""
+
+# ============================================================================
+# ИМПОРТЫ
+# ============================================================================
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+try:
+    from bot.telegram_panicker import MessageBatcher, MessageOutbox, PRIORITY_LOW
+    HAS_BOT = True
+except ImportError:
+    HAS_BOT = False
+
+
+def _make_batcher(**kwargs):
+    sent = []
+    batcher = MessageBatcher(lambda **kw: sent.append(kw), flush_interval=60, **kwargs)
+    return batcher, sent
+
+
+# ============================================================================
+# ТЕСТ 1: БЫСТРЫЙ ПУТЬ
+# ============================================================================
+@pytest.mark.skipif(not HAS_BOT, reason="Модуль бота недоступен")
+def test_short_message_sent_immediately():
+    """Одиночное короткое сообщение уходит без ожидания"""
+    print("🧪 Тест 1: Быстрый путь")
+
+    batcher, sent = _make_batcher()
+    batcher.enqueue(42, "🚨 SBER", reply_markup="kb")
+
+    assert len(sent) == 1
+    assert sent[0]['chat_id'] == 42
+    assert sent[0]['reply_markup'] == "kb"
+    assert not batcher.pending
+
+    print("✅ Короткое сообщение отправлено сразу")
+
+
+# ============================================================================
+# ТЕСТ 2: ОБЪЕДИНЕНИЕ ВСПЛЕСКА
+# ============================================================================
+@pytest.mark.skipif(not HAS_BOT, reason="Модуль бота недоступен")
+def test_burst_is_coalesced():
+    """Несколько длинных сообщений без клавиатур склеиваются в одно"""
+    print("\n🧪 Тест 2: Объединение всплеска")
+
+    batcher, sent = _make_batcher()
+    for ticker in ("SBER", "GAZP", "LKOH"):
+        batcher.enqueue(42, ticker * 100)
+
+    assert not sent
+    batcher.flush()
+
+    assert len(sent) == 1
+    assert sent[0]['text'].count(MessageBatcher.SEPARATOR) == 2
+    assert sent[0]['reply_markup'] is None
+
+    print("✅ Всплеск отправлен одним сообщением")
+
+
+# ============================================================================
+# ТЕСТ 2А: КЛАВИАТУРЫ В ПАЧКЕ
+# ============================================================================
+@pytest.mark.skipif(not HAS_BOT, reason="Модуль бота недоступен")
+def test_burst_keeps_keyboards():
+    """Сообщения с клавиатурой уходят отдельно, со своими кнопками и по порядку"""
+    print("\n🧪 Тест 2а: Клавиатуры в пачке")
+
+    batcher, sent = _make_batcher()
+    batcher.enqueue(42, "a" * 400)
+    batcher.enqueue(42, "b" * 400)
+    batcher.enqueue(42, "SBER" * 100, reply_markup="kb-SBER")
+    batcher.enqueue(42, "GAZP" * 100, reply_markup="kb-GAZP")
+    batcher.flush(42)
+
+    assert [message['reply_markup'] for message in sent] == [None, "kb-SBER", "kb-GAZP"]
+    assert sent[0]['text'].count(MessageBatcher.SEPARATOR) == 1
+    assert sent[1]['text'].startswith("SBER")
+
+    print("✅ Кнопки каждого оповещения сохранены")
+
+
+# ============================================================================
+# ТЕСТ 3: РАЗБИЕНИЕ ПО ЛИМИТУ
+# ============================================================================
+@pytest.mark.skipif(not HAS_BOT, reason="Модуль бота недоступен")
+def test_long_batch_is_split():
+    """Склеенный текст длиннее лимита делится по абзацам"""
+    print("\n🧪 Тест 3: Разбиение по лимиту")
+
+    batcher, sent = _make_batcher(max_buffer_size=1000)
+    for _ in range(3):
+        batcher.enqueue(42, "x" * 600)
+    batcher.flush(42)
+
+    assert len(sent) == 3
+    assert all(len(message['text']) <= 1000 for message in sent)
+
+    print(f"✅ Текст разбит на {len(sent)} сообщения")
+
+
+# ============================================================================
+# ТЕСТ 3А: ДЛИННЫЙ АБЗАЦ НЕ РЕЖЕТСЯ ВНУТРИ РАЗМЕТКИ
+# ============================================================================
+@pytest.mark.skipif(not HAS_BOT, reason="Модуль бота недоступен")
+def test_long_paragraph_split_at_safe_boundary():
+    """Абзац длиннее лимита делится по строкам, жирный текст не разрывается"""
+    print("\n🧪 Тест 3а: Безопасное разбиение абзаца")
+
+    batcher, sent = _make_batcher(max_buffer_size=100)
+    lines = [f"*{ticker}* уровень {i}" for i, ticker in enumerate(["SBER", "GAZP", "LKOH"] * 5)]
+    batcher.enqueue(42, "\n".join(lines), reply_markup="kb")
+    batcher.flush(42)
+
+    assert len(sent) > 1
+    assert all(len(message['text']) <= 100 for message in sent)
+    assert all(message['text'].count('*') % 2 == 0 for message in sent)
+    assert "\n".join(message['text'] for message in sent) == "\n".join(lines)
+    assert [message['reply_markup'] for message in sent][-1] == "kb"
+    assert all(message['reply_markup'] is None for message in sent[:-1])
+
+    print(f"✅ Абзац разбит на {len(sent)} части по строкам")
+
+
+# ============================================================================
+# ТЕСТ 4: ОЧЕРЕДЬ ОТПРАВКИ - ИНТЕРВАЛ ДЛЯ ЧАТА
+# ============================================================================
+@pytest.mark.skipif(not HAS_BOT, reason="Модуль бота недоступен")
+def test_outbox_paces_each_chat():
+    """Сообщения в один чат разнесены по времени, другие чаты не ждут"""
+    print("\n🧪 Тест 4: Интервал отправки для чата")
+
+    sent = []
+    outbox = MessageOutbox(
+        lambda **kw: sent.append((kw['chat_id'], kw['text'], time.monotonic())),
+        max_per_second=1000,
+        chat_interval=0.2
+    )
+    outbox.put(1, "a1")
+    outbox.put(1, "a2")
+    outbox.put(2, "b1")
+    outbox.start()
+    outbox.stop(timeout=2.0)
+
+    assert [text for _, text, _ in sent] == ["a1", "b1", "a2"]
+    chat_times = [at for chat_id, _, at in sent if chat_id == 1]
+    assert chat_times[1] - chat_times[0] >= 0.19
+
+    print("✅ Лимит на чат соблюдён, порядок сохранён")
+
+
+# ============================================================================
+# ТЕСТ 5: ОЧЕРЕДЬ ОТПРАВКИ - ПЕРЕПОЛНЕНИЕ
+# ============================================================================
+@pytest.mark.skipif(not HAS_BOT, reason="Модуль бота недоступен")
+def test_outbox_drops_low_priority_first():
+    """При переполнении вытесняется самое старое сообщение с низким приоритетом"""
+    print("\n🧪 Тест 5: Переполнение очереди")
+
+    outbox = MessageOutbox(lambda **kw: None, max_size=2)
+    outbox.put(1, "reply")
+    outbox.put(1, "alert", priority=PRIORITY_LOW)
+    outbox.put(1, "reply2")
+
+    assert [item[1] for item in outbox.queue] == ["reply", "reply2"]
+    assert outbox.dropped == 1
+
+    print("✅ Вытеснено оповещение, ответы сохранены")
+
+
+# ============================================================================
+# ТЕСТ 6: ОТВЕТЫ НА КНОПКИ ЧЕРЕЗ БАТЧЕР И ОЧЕРЕДЬ
+# ============================================================================
+@pytest.mark.skipif(not HAS_BOT, reason="Модуль бота недоступен")
+def test_callback_replies_coalesced():
+    """Ответы на кнопки в один чат склеиваются и ставятся в очередь с высоким приоритетом"""
+    print("\n🧪 Тест 6: Ответы на кнопки")
+
+    from bot.telegram_panicker import TelegramPanickerBot, PRIORITY_HIGH
+
+    bot = TelegramPanickerBot.__new__(TelegramPanickerBot)
+    bot.outbox = MessageOutbox(lambda **kw: None)
+    bot.reply_batcher = MessageBatcher(bot._enqueue_reply, flush_interval=60)
+
+    bot._send(7, "📊 " + "x" * 400)
+    bot._send(7, "🤔 объяснение")
+    bot.reply_batcher.flush()
+
+    assert len(bot.outbox.queue) == 1
+    chat_id, text, priority, _ = bot.outbox.queue[0]
+    assert chat_id == 7 and priority == PRIORITY_HIGH
+    assert text.endswith("🤔 объяснение")
+
+    print("✅ Ответы объединены в одно сообщение")
+
+
+# ============================================================================
+# ТЕСТ 7: ОТВЕТ С КЛАВИАТУРОЙ НЕ ЖДЁТ
+# ============================================================================
+@pytest.mark.skipif(not HAS_BOT, reason="Модуль бота недоступен")
+def test_callback_reply_with_keyboard_bypasses_batch():
+    """Ответ с клавиатурой уходит сразу, со своими кнопками, после накопленного"""
+    print("\n🧪 Тест 7: Ответ с клавиатурой")
+
+    from bot.telegram_panicker import TelegramPanickerBot
+
+    bot = TelegramPanickerBot.__new__(TelegramPanickerBot)
+    bot.outbox = MessageOutbox(lambda **kw: None)
+    bot.reply_batcher = MessageBatcher(bot._enqueue_reply, flush_interval=60)
+
+    bot._send(7, "📊 " + "x" * 400)
+    bot._send(7, "🔥 Выберите тикер", reply_markup="kb")
+
+    assert not bot.reply_batcher.pending
+    queued = [(item[1], item[3].get('reply_markup')) for item in bot.outbox.queue]
+    assert queued == [("📊 " + "x" * 400, None), ("🔥 Выберите тикер", "kb")]
+
+    print("✅ Клавиатура сохранена, порядок ответов не нарушен")
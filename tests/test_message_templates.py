@@ -0,0 +1,214 @@
+# panicker3000/tests/test_message_templates.py
+"""
+Тесты для шаблонов сообщений Telegram-бота.
+"""
+
+# ============================================================================
+# ИМПОРТЫ
+# ============================================================================
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bot import message_templates
+
+
+# ============================================================================
+# ТЕСТ 1: ГЛАВНОЕ МЕНЮ И СПРАВКА
+# ============================================================================
+def test_main_menu_and_help_templates():
+    """Тест подстановки значений в главное меню и статичной справки"""
+    print("🧪 Тест 1: Главное меню и справка")
+
+    text = message_templates.get_main_menu_template(
+        user_name="user",
+        bot_status="🟢 АКТИВЕН",
+        exchange_status="🟢 ОТКРЫТА",
+        last_check="10:05",
+        alerts_enabled=False,
+        last_panic_time="10:00",
+        last_panic_ticker="SBER",
+        signals_today=3
+    )
+
+    assert "Статус: 🟢 АКТИВЕН" in text
+    assert "Биржа: 🟢 ОТКРЫТА" in text
+    assert "🔔 Автооповещения: 🔴 ВЫКЛ" in text
+    assert "🚨 Последняя паника: 10:00 (SBER)" in text
+    assert "📅 Сигналов сегодня: 3" in text
+
+    help_text = message_templates.get_help_template()
+    assert "/overheat [ТИКЕР]" in help_text
+    assert help_text is message_templates.get_help_template()
+
+    print("✅ Шаблоны меню и справки корректны")
+
+
+# ============================================================================
+# ТЕСТ 2: СИГНАЛЫ ЗА СЕГОДНЯ И ТОП СИГНАЛОВ
+# ============================================================================
+def test_today_and_extreme_templates():
+    """Тест построчного форматирования сигналов"""
+    print("\n🧪 Тест 2: Сигналы за сегодня и топ сигналов")
+
+    signals = [
+        {'time': '10:15', 'level': '🔴 СИЛЬНЫЙ', 'ticker': 'SBER', 'rsi': 21.5, 'volume_ratio': '2.4'},
+        {'time': '11:40', 'level': '🟡 ХОРОШИЙ', 'ticker': 'GAZP', 'rsi': 28.0, 'volume_ratio': '1.7'},
+    ]
+
+    today = message_templates.get_today_template(signals)
+    assert "10:15 🔴 СИЛЬНЫЙ SBER - RSI=21.5, Объём=2.4×" in today
+    assert "ИТОГО: 2 сигналов" in today
+    assert "🔴 Сильных: 1" in today
+    assert "🟡 Умеренных: 1" in today
+
+    extreme = message_templates.get_extreme_template(signals)
+    assert "ТОП-2" in extreme
+    assert "🥇 10:15 🔴 СИЛЬНЫЙ SBER\n   RSI: 21.5 | Объём: 2.4×" in extreme
+    assert "🥈 11:40 🟡 ХОРОШИЙ GAZP" in extreme
+
+    assert "ПОКА НЕТ" in message_templates.get_today_template([])
+
+    print("✅ Шаблоны сигналов корректны")
+
+
+# ============================================================================
+# ТЕСТ 3: СТАТИСТИКА И СТАТУС
+# ============================================================================
+def test_stats_and_status_templates():
+    """Тест значений по умолчанию в статистике и статусе"""
+    print("\n🧪 Тест 3: Статистика и статус")
+
+    stats = message_templates.get_stats_template({'total_signals': 5, 'most_active_ticker': 'LKOH'})
+    assert "Всего сигналов: 5" in stats
+    assert "🏆 САМАЯ АКТИВНАЯ: LKOH (0)" in stats
+    assert "📊 ОБЩАЯ НАПРЯЖЁННОСТЬ: НЕТ ДАННЫХ" in stats
+
+    status = message_templates.get_status_template({'grpc_status': '🟢'})
+    assert "• gRPC сервер: 🟢" in status
+    assert "🤖 БОТ: НЕТ ДАННЫХ" in status
+
+    print("✅ Шаблоны статистики и статуса корректны")
+
+
+# ============================================================================
+# ТЕСТ 4: СИГНАЛЫ ЗА СЕГОДНЯ ИЗ PanicSignal
+# ============================================================================
+def test_today_template_with_panic_signals():
+    """Тест шаблона сегодняшних сигналов для PanicSignal моделей"""
+    print("\n🧪 Тест 4: Сигналы за сегодня из PanicSignal")
+
+    from datetime import datetime
+    from utils.schemas import PanicSignal
+
+    signal = PanicSignal(
+        ticker="SBER",
+        timestamp=datetime(2024, 1, 15, 14, 30),
+        signal_type="panic",
+        rsi_14=22.0,
+        volume_ratio=2.34,
+        base_level="strong",
+        final_level="red",
+        interpretation="Сильная паника",
+        recommendation="Наблюдать",
+        risk_level="Высокий"
+    )
+
+    text = message_templates.get_today_template([signal, signal])
+    assert "14:30 red SBER - RSI=22.0, Объём=2.3×" in text
+    assert "ИТОГО: 2 сигналов" in text
+    assert "🔴 Сильных: 2" in text
+
+    print("✅ PanicSignal модели обрабатываются корректно")
+
+
+# ============================================================================
+# ТЕСТ 5: АВТООПОВЕЩЕНИЕ
+# ============================================================================
+def test_panic_signal_alert():
+    """Тест форматирования автооповещения с пройденными фильтрами"""
+    print("\n🧪 Тест 5: Автооповещение")
+
+    from utils.schemas import PanicSignal
+
+    signal = PanicSignal(
+        ticker="GAZP",
+        signal_type="panic",
+        rsi_14=24.0,
+        volume_ratio=2.1,
+        base_level="strong",
+        final_level="red",
+        passed_filters=["time", "custom"],
+        interpretation="Сильная паника",
+        recommendation="Наблюдать",
+        risk_level="Высокий"
+    )
+
+    text = message_templates.format_panic_signal_alert(signal)
+    # Эмодзи уровня не должен перетираться эмодзи фильтров
+    assert text.startswith("\nℹ️ БЕЛЫЙ УРОВЕНЬ! В GAZP ОБНАРУЖЕНА ПАНИКА!")
+    assert "⏰ Время (в активной зоне)\n✓ custom" in text
+    assert "Подтверждение: 2/4 фильтра" in text
+
+    assert message_templates.format_panic_signal_alert(None) == "⚠️ Система временно недоступна"
+
+    print("✅ Автооповещение сформировано корректно")
+
+
+# ============================================================================
+# ТЕСТ 6: ШКАЛА ИНДЕКСА ПЕРЕГРЕВА
+# ============================================================================
+def test_health_bar():
+    """Тест ASCII-шкалы индекса перегрева на границах"""
+    print("\n🧪 Тест 6: Шкала индекса перегрева")
+
+    assert message_templates._get_health_bar(0) == "[░░░░░░░░░░]"
+    assert message_templates._get_health_bar(9.9) == "[░░░░░░░░░░]"
+    assert message_templates._get_health_bar(45.5) == "[████░░░░░░]"
+    assert message_templates._get_health_bar(100) == "[██████████]"
+    assert message_templates._get_health_bar(250) == "[██████████]"
+    assert message_templates._get_health_bar(-5) == "[░░░░░░░░░░]"
+    assert message_templates._get_health_bar(None) == "[░░░░░░░░░░]"
+
+    print("✅ Шкала индекса перегрева корректна")
+
+
+# ============================================================================
+# ТЕСТ 7: ИНТЕРПРЕТАЦИЯ ИНДЕКСА ПЕРЕГРЕВА
+# ============================================================================
+def test_health_interpretation():
+    """Тест границ диапазонов интерпретации"""
+    print("\n🧪 Тест 7: Интерпретация индекса перегрева")
+
+    interpret = message_templates._get_health_interpretation
+    assert interpret(0).startswith("🟢")
+    assert interpret(29.9).startswith("🟢")
+    assert interpret(30).startswith("🟡")
+    assert interpret(59).startswith("🟡")
+    assert interpret(60).startswith("🟠")
+    assert interpret(80).startswith("🔴")
+    assert interpret(100).startswith("🔴")
+
+    print("✅ Интерпретация корректна на границах")
+
+
+# ============================================================================
+# ТЕСТ 8: КАРТА ПАНИКИ
+# ============================================================================
+def test_panic_map_template():
+    """Тест ASCII карты паники"""
+    print("\n🧪 Тест 8: Карта паники")
+
+    text = message_templates.get_panic_map_template({
+        'SBER': {'10': '🔴', '14': '🟡'},
+        'MOEX': {},
+    })
+    lines = text.split("\n")
+
+    assert lines[2] == "    10  12  14  16  18"
+    assert lines[3] == "SBER 🔴  ⚪  🟡  ⚪  ⚪"
+    assert lines[4] == "MOEX ⚪  ⚪  ⚪  ⚪  ⚪"
+    assert lines[-1] == "Срочные сигналы не показываются на карте"
+
+    print("✅ Карта паники построена корректно")
@@ -0,0 +1,154 @@
+# panicker3000/tests/test_overheat_formatting.py
+"""
+Тесты для форматирования ответа команды /overheat.
+"""
+
+# ============================================================================
+# ИМПОРТЫ
+# ============================================================================
+import sys
+import os
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from utils.schemas import PanicSignal
+
+try:
+    from bot.telegram_panicker import TelegramPanickerBot
+    HAS_BOT = True
+except ImportError:
+    HAS_BOT = False
+
+
+def _make_bot():
+    # Форматирование не использует токен, gRPC и сеть
+    bot = TelegramPanickerBot.__new__(TelegramPanickerBot)
+    bot._verbose_overheat = True
+    return bot
+
+
+def _make_signal(**overrides):
+    fields = dict(
+        ticker="SBER",
+        timestamp=datetime(2024, 1, 15, 14, 30),
+        signal_type="panic",
+        rsi_14=22.0,
+        volume_ratio=2.3,
+        base_level="strong",
+        final_level="red",
+        risk_metric=75.0,
+        volume_clusters=[
+            {'price_level': 100.0, 'volume_percentage': 30.0, 'role': 'support'},
+            {'price_level': 110.0, 'volume_percentage': 40.0, 'role': 'resistance'},
+        ],
+        interpretation="Сильная паника",
+        recommendation="Наблюдать",
+        risk_level="Высокий"
+    )
+    fields.update(overrides)
+    return PanicSignal(**fields)
+
+
+# ============================================================================
+# ТЕСТ 1: ПЕРЕГРЕВ ИЗ PanicSignal
+# ============================================================================
+@pytest.mark.skipif(not HAS_BOT, reason="Модуль бота недоступен")
+def test_overheat_from_signal():
+    """Полное сообщение строится из PanicSignal без перехода в fallback"""
+    print("🧪 Тест 1: Перегрев из PanicSignal")
+
+    text = _make_bot()._format_overheat_from_signal("SBER", _make_signal())
+
+    assert "Текущее состояние: [🟩🟩🟩⬜⬜] 64%" in text
+    assert "• Время обнаружения: 15.01.2024 14:30" in text
+    assert "• Уровень: 🔴 ВЫСОКИЙ" in text
+    assert "1. 🔴 110.00₽ (40.0% объёма)\n2. 🟢 100.00₽ (30.0% объёма)" in text
+    assert text.endswith("🔥 Самые сильные: /extreme")
+
+    print("✅ Сообщение из PanicSignal корректно")
+
+
+# ============================================================================
+# ТЕСТ 2: ПЕРЕГРЕВ ИЗ СЛОВАРЯ СКАНЕРА
+# ============================================================================
+@pytest.mark.skipif(not HAS_BOT, reason="Модуль бота недоступен")
+def test_overheat_message_with_raw_signal():
+    """Риск и кластеры берутся из уже полученного сигнала сканера"""
+    print("\n🧪 Тест 2: Перегрев из словаря сканера")
+
+    bot = _make_bot()
+    data = {
+        'overheat_percent': 40.0,
+        'overheat_bar': bot._create_overheat_bar(40.0),
+        'current_rsi': 35.0,
+        'volume_ratio': 1.5,
+        'last_signal_time': '10:00',
+        'last_signal_level': 'НЕТ'
+    }
+    raw_signal = {
+        'risk_metric': 45.0,
+        'volume_clusters': [{'price_level': 250.5, 'volume_percentage': 12.0, 'role': 'neutral'}]
+    }
+
+    text = bot._format_overheat_message("GAZP", data, raw_signal)
+    assert "Текущее состояние: [🟩🟩⬜⬜⬜] 40%" in text
+    assert "• Уровень: 🟡 СРЕДНИЙ" in text
+    assert "1. ⚪ 250.50₽ (12.0% объёма)" in text
+
+    assert "РИСК-АНАЛИЗ" not in bot._format_overheat_message("GAZP", data)
+
+    print("✅ Детали сигнала сканера добавлены без повторного запроса")
+
+
+# ============================================================================
+# ТЕСТ 3: КРАТКИЙ РЕЖИМ
+# ============================================================================
+@pytest.mark.skipif(not HAS_BOT, reason="Модуль бота недоступен")
+def test_overheat_compact_mode():
+    """Без подробного режима риск и кластеры не выводятся"""
+    print("\n🧪 Тест 3: Краткий режим /overheat")
+
+    bot = _make_bot()
+    bot._verbose_overheat = False
+
+    text = bot._format_overheat_from_signal("SBER", _make_signal())
+    assert "Текущее состояние: [🟩🟩🟩⬜⬜] 64%" in text
+    assert "РИСК-АНАЛИЗ" not in text
+    assert "КЛЮЧЕВЫЕ УРОВНИ ОБЪЁМА" not in text
+    assert text.endswith("🔥 Самые сильные: /extreme")
+
+    print("✅ Краткий режим без риск-анализа и кластеров")
+
+
+# ============================================================================
+# ТЕСТ 4: /SETTINGS VERBOSE МЕНЯЕТ РЕЖИМ ТОЛЬКО СВОЕГО ЧАТА
+# ============================================================================
+@pytest.mark.skipif(not HAS_BOT, reason="Модуль бота недоступен")
+def test_settings_verbose_is_per_chat(tmp_path):
+    """/settings verbose off в одном чате не меняет /overheat в другом"""
+    print("\n🧪 Тест 4: /settings verbose по чатам")
+
+    from types import SimpleNamespace
+    from bot.telegram_panicker import MessageOutbox
+    from data.alert_settings import AlertSettingsStore
+
+    bot = _make_bot()
+    bot.outbox = MessageOutbox(lambda **kw: None)
+    bot.alert_settings = AlertSettingsStore(str(tmp_path / "settings.db"), flush_interval=60)
+
+    first_chat = SimpleNamespace(chat=SimpleNamespace(id=1), message_id=1)
+    bot.command_settings(first_chat, args=['verbose', 'off'])
+
+    assert bot._verbose_for(1) is False
+    assert bot._verbose_for(2) is True
+    assert bot._verbose_overheat is True
+    assert "НАСТРОЙКИ ЭТОГО ЧАТА" in bot.outbox.queue[-1][1]
+
+    text = bot._format_overheat_from_signal("SBER", _make_signal(), bot._verbose_for(2))
+    assert "РИСК-АНАЛИЗ" in text
+    bot.alert_settings.close()
+
+    print("✅ Режим изменён только в своём чате")
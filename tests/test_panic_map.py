@@ -0,0 +1,71 @@
+# panicker3000/tests/test_panic_map.py
+"""
+Тесты для данных карты паники в Telegram-боте.
+"""
+
+# ============================================================================
+# ИМПОРТЫ
+# ============================================================================
+import sys
+import os
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+try:
+    from bot.telegram_panicker import TelegramPanickerBot
+    HAS_BOT = True
+except ImportError:
+    HAS_BOT = False
+
+
+def _signal(ticker, detected_at, level='⚪ СРОЧНЫЙ', signal_type='НЕЙТРАЛЬНО'):
+    return {'ticker': ticker, 'detected_at': detected_at, 'level': level, 'signal_type': signal_type}
+
+
+# ============================================================================
+# ТЕСТ 1: КЛЕТКИ КАРТЫ ПАНИКИ
+# ============================================================================
+@pytest.mark.skipif(not HAS_BOT, reason="Модуль бота недоступен")
+def test_heatmap_cells():
+    """Час сигнала попадает в ближайший столбец, в клетке - самый сильный сигнал"""
+    print("🧪 Тест 1: Клетки карты паники")
+
+    bot = TelegramPanickerBot.__new__(TelegramPanickerBot)
+    data = bot._create_real_heatmap_data([
+        _signal('SBER', '2024-01-15T10:05:00', '🟡 ХОРОШИЙ'),
+        _signal('SBER', '10:40', signal_type='ПАНИКА'),
+        _signal('GAZP', '2024-01-15 14:10:00', signal_type='ЖАДНОСТЬ'),
+        _signal('GAZP', '11:00', '🟡 ХОРОШИЙ'),
+        _signal('LKOH', 'нет времени', '🔴 СИЛЬНЫЙ'),
+        _signal('', '12:00', '🔴 СИЛЬНЫЙ'),
+    ])
+
+    assert data['tickers'] == ['GAZP', 'LKOH', 'SBER']
+    assert data['heatmap']['SBER'] == {10: '🔴', 12: '⚪', 14: '⚪', 16: '⚪', 18: '⚪'}
+    assert data['heatmap']['GAZP'] == {10: '🟡', 12: '⚪', 14: '🟠', 16: '⚪', 18: '⚪'}
+    assert set(data['heatmap']['LKOH'].values()) == {'⚪'}
+
+    print("✅ Клетки карты паники заполнены корректно")
+
+
+# ============================================================================
+# ТЕСТ 2: ВРЕМЯ СИГНАЛА В СПИСКАХ
+# ============================================================================
+@pytest.mark.skipif(not HAS_BOT, reason="Модуль бота недоступен")
+def test_signal_time():
+    """Из ISO и 'YYYY-MM-DD HH:MM:SS' берётся время, короткое 'HH:MM' остаётся как есть"""
+    print("🧪 Тест 2: Время сигнала")
+
+    from bot.telegram_panicker import _signal_time
+
+    assert _signal_time('2024-01-15T10:05:00') == '10:05'
+    assert _signal_time('2024-01-15T10:05:00Z') == '10:05'
+    assert _signal_time('2024-01-15 14:10:00') == '14:10'
+    assert _signal_time('11:55') == '11:55'
+    assert _signal_time('') == '--:--'
+    assert _signal_time(datetime(2024, 1, 15, 9, 7)) == '09:07'
+
+    print("✅ Время сигнала форматируется корректно")
@@ -0,0 +1,253 @@
+# panicker3000/tests/test_ttl_cache.py
+"""
+Тесты для кеша ответов gRPC в Telegram-боте.
+"""
+
+# ============================================================================
+# ИМПОРТЫ
+# ============================================================================
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+try:
+    from bot.telegram_panicker import TTLCache
+    HAS_BOT = True
+except ImportError:
+    HAS_BOT = False
+
+
+# ============================================================================
+# ТЕСТ 1: ПОВТОРНЫЙ ЗАПРОС БЕРЁТСЯ ИЗ КЕША
+# ============================================================================
+@pytest.mark.skipif(not HAS_BOT, reason="Модуль бота недоступен")
+def test_repeated_key_hits_cache():
+    """Повторный запрос того же тикера не вызывает loader"""
+    print("🧪 Тест 1: Попадание в кеш")
+
+    calls = []
+    cache = TTLCache(ttl=60)
+
+    def loader():
+        calls.append(1)
+        return ["SBER"]
+
+    assert cache.get_or_call(('scan_tickers', 'SBER'), loader) == ["SBER"]
+    assert cache.get_or_call(('scan_tickers', 'SBER'), loader) == ["SBER"]
+    assert len(calls) == 1
+
+    print("✅ Второй запрос обслужен из кеша")
+
+
+# ============================================================================
+# ТЕСТ 2: ИСТЕЧЕНИЕ СРОКА И ВЫТЕСНЕНИЕ
+# ============================================================================
+@pytest.mark.skipif(not HAS_BOT, reason="Модуль бота недоступен")
+def test_expiry_and_eviction():
+    """Просроченные записи перезапрашиваются, старые вытесняются по размеру"""
+    print("\n🧪 Тест 2: Истечение срока и вытеснение")
+
+    calls = []
+    expired = TTLCache(ttl=0)
+    for _ in range(2):
+        expired.get_or_call('SBER', lambda: calls.append(1))
+    assert len(calls) == 2
+
+    small = TTLCache(ttl=60, max_size=2)
+    for ticker in ("SBER", "GAZP", "LKOH"):
+        small.get_or_call(ticker, lambda: ticker)
+    assert list(small._data) == ["GAZP", "LKOH"]
+
+    print("✅ Срок жизни и размер кеша соблюдаются")
+
+
+# ============================================================================
+# ТЕСТ 3: ЗАПОЛНЕНИЕ КЕША ПАКЕТНЫМ СКАНИРОВАНИЕМ
+# ============================================================================
+@pytest.mark.skipif(not HAS_BOT, reason="Модуль бота недоступен")
+def test_batch_scan_seeds_per_ticker_cache():
+    """Один пакетный запрос заполняет кеш для каждого тикера"""
+    print("\n🧪 Тест 3: Пакетное сканирование")
+
+    from bot.telegram_panicker import TelegramPanickerBot
+
+    requests = []
+
+    class FakeClient:
+        def scan_tickers(self, tickers, raise_on_error=False):
+            requests.append(list(tickers))
+            return [{'ticker': 'GAZP', 'rsi_14': 25.0}]
+
+    bot = TelegramPanickerBot.__new__(TelegramPanickerBot)
+    bot.grpc_client = FakeClient()
+    bot.grpc_cache = TTLCache(ttl=60)
+
+    bot._scan_tickers_batch(['SBER', 'GAZP'])
+    _, gazp = bot._get_panic_signal_via_grpc('GAZP')
+    panic_signal, sber = bot._get_panic_signal_via_grpc('SBER')
+
+    assert requests == [['SBER', 'GAZP']]
+    assert gazp == {'ticker': 'GAZP', 'rsi_14': 25.0}
+    assert panic_signal is None and sber is None
+
+    print("✅ Кеш заполнен одним запросом")
+
+
+# ============================================================================
+# ТЕСТ 3А: ОШИБКА GRPC НЕ ПОПАДАЕТ В КЕШ
+# ============================================================================
+@pytest.mark.skipif(not HAS_BOT, reason="Модуль бота недоступен")
+def test_scan_error_not_cached():
+    """Сбой сканирования не кешируется как "сигнала нет" и не заполняет кеш"""
+    print("\n🧪 Тест 3а: Ошибка сканирования")
+
+    from bot.telegram_panicker import TelegramPanickerBot
+
+    class FlakyClient:
+        fail = True
+
+        def scan_tickers(self, tickers, raise_on_error=False):
+            if self.fail:
+                raise RuntimeError("UNAVAILABLE")
+            return [{'ticker': tickers[0], 'rsi_14': 25.0}]
+
+    bot = TelegramPanickerBot.__new__(TelegramPanickerBot)
+    bot.grpc_client = FlakyClient()
+    bot.grpc_cache = TTLCache(ttl=60)
+
+    with pytest.raises(RuntimeError):
+        bot._scan_tickers_batch(['SBER', 'GAZP'])
+    assert bot._get_panic_signal_via_grpc('SBER') == (None, None)
+
+    bot.grpc_client.fail = False
+    _, sber = bot._get_panic_signal_via_grpc('SBER')
+    assert sber == {'ticker': 'SBER', 'rsi_14': 25.0}
+
+    print("✅ После сбоя следующий запрос идёт на сервер")
+
+
+# ============================================================================
+# ТЕСТ 4: ОБЩИЙ ЗАПРОС СИГНАЛОВ ЗА СЕГОДНЯ
+# ============================================================================
+@pytest.mark.skipif(not HAS_BOT, reason="Модуль бота недоступен")
+def test_today_signals_shared_between_commands():
+    """Команды берут сигналы за сегодня из одного запроса, очистка кеша даёт новый"""
+    print("\n🧪 Тест 4: Общий запрос сигналов за сегодня")
+
+    from concurrent.futures import Future
+    from bot.telegram_panicker import TelegramPanickerBot, TODAY_SIGNALS_LIMIT
+
+    requests = []
+
+    class FakeClient:
+        def get_top_signals_async(self, period='today', limit=5):
+            requests.append((period, limit))
+            future = Future()
+            future.set_result([])
+            return future
+
+    bot = TelegramPanickerBot.__new__(TelegramPanickerBot)
+    bot.grpc_client = FakeClient()
+    bot.signals_cache = TTLCache(ttl=60)
+
+    assert bot._today_signals_future() is bot._today_signals_future()
+    bot.signals_cache.clear()
+    bot._today_signals_future()
+
+    assert requests == [('today', TODAY_SIGNALS_LIMIT)] * 2
+
+    print("✅ Сигналы за сегодня запрашиваются один раз на окно кеша")
+
+
+# ============================================================================
+# ТЕСТ 5: КЕШ СТАТУСА БИРЖИ
+# ============================================================================
+@pytest.mark.skipif(not HAS_BOT, reason="Модуль бота недоступен")
+def test_market_status_cached():
+    """Статус биржи запрашивается у календаря один раз на окно кеша, ошибки не кешируются"""
+    print("\n🧪 Тест 5: Кеш статуса биржи")
+
+    from bot.telegram_panicker import TelegramPanickerBot
+
+    calls = []
+
+    class FakeCalendar:
+        def is_market_open_now(self):
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError("calendar unavailable")
+            return True, "Основная сессия"
+
+    bot = TelegramPanickerBot.__new__(TelegramPanickerBot)
+    bot.market_calendar = FakeCalendar()
+    bot.market_status_cache = TTLCache(ttl=60, max_size=1)
+
+    assert bot._is_market_open_for_scanning()[0] is False
+    assert bot._is_market_open_for_scanning()[0] is True
+    assert bot._is_market_open_for_scanning()[0] is True
+    assert len(calls) == 2
+
+    print("✅ Статус биржи кешируется")
+
+
+# ============================================================================
+# ТЕСТ 6: КЕШ СВЕЧЕЙ ДЛЯ КНОПОК
+# ============================================================================
+@pytest.mark.skipif(not HAS_BOT, reason="Модуль бота недоступен")
+def test_candles_cached_unless_empty():
+    """Свечи IMOEX запрашиваются один раз, пустой ответ не остаётся в кеше"""
+    print("\n🧪 Тест 6: Кеш свечей")
+
+    from concurrent.futures import Future
+    from bot.telegram_panicker import TelegramPanickerBot
+
+    requests = []
+
+    class CountingFuture(Future):
+        """Future, считающий подписки на завершение"""
+
+        def __init__(self):
+            super().__init__()
+            self.callbacks = 0
+
+        def add_done_callback(self, fn):
+            self.callbacks += 1
+            super().add_done_callback(fn)
+
+    class FakeClient:
+        def __init__(self):
+            self.slow = CountingFuture()
+
+        def get_candles_async(self, ticker, interval='min5', count=100):
+            requests.append(ticker)
+            if ticker == 'SLOW':
+                return self.slow
+            future = CountingFuture()
+            if ticker == 'FAIL':
+                future.set_exception(RuntimeError("gRPC error"))
+            else:
+                future.set_result([] if ticker == 'YNDX' else [{'close': 1.0}])
+            return future
+
+    bot = TelegramPanickerBot.__new__(TelegramPanickerBot)
+    bot.grpc_client = FakeClient()
+    bot.candles_cache = TTLCache(ttl=60)
+
+    for _ in range(3):
+        bot._candles_future('IMOEX', 'hour', 24)
+        bot._candles_future('YNDX', 'hour', 24)
+        bot._candles_future('FAIL', 'hour', 24)
+        bot._candles_future('SLOW', 'hour', 24)
+
+    assert requests.count('IMOEX') == 1
+    assert requests.count('YNDX') == 3
+    assert requests.count('FAIL') == 3
+
+    # Попадания в кеш не добавляют подписок на ожидающий Future
+    assert requests.count('SLOW') == 1
+    assert bot.grpc_client.slow.callbacks == 1
+
+    print("✅ Свечи кешируются, ошибки - нет")